@@ -63,6 +63,10 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "trip.renderers.FastJSONRenderer",  # orjson이 있으면 사용
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],  # 선택
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
@@ -70,6 +74,10 @@ REST_FRAMEWORK = {
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # 응답 본문을 다루는 미들웨어보다 앞에 (JSON/HTML, COMPRESSION_MIN_SIZE 이상만)
+    "trip.middleware.CompressionMiddleware",
+    # 요청별 SQL 수/시간/N+1 (DEBUG: X-SQL-* 헤더, 운영: trip.sql 로그)
+    "trip.middleware.QueryStatsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -109,9 +117,39 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # 요청마다 새로 접속하지 않도록 연결 유지 (초), 재사용 전에 연결 상태 확인
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true',
+        'OPTIONS': {},
     }
 }
 
+# DB_POOL=true: psycopg 3 연결 풀 (psycopg[pool] 필요). 풀은 영구 연결과 함께 쓸 수 없다
+if os.getenv('DB_POOL', 'false').lower() == 'true':
+    DATABASES["default"]['CONN_MAX_AGE'] = 0
+    DATABASES["default"]['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),  # 빈 연결을 기다리는 최대 시간
+    }
+
+# DB_ENGINE=sqlite: PostgreSQL 없이 로컬 SQLite로 실행 (테스트/개발용)
+if os.getenv('DB_ENGINE') == 'sqlite':
+    DATABASES = {
+        "default": {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': DATABASES["default"]['CONN_MAX_AGE'],
+            'CONN_HEALTH_CHECKS': DATABASES["default"]['CONN_HEALTH_CHECKS'],
+            # 동시 요청(부하 테스트 등)이 쓰기 잠금을 만나면 바로 실패하지 않고 기다리도록,
+            # 트랜잭션은 시작할 때 쓰기 잠금을 잡아 읽기 -> 쓰기 승격 중 교착을 피한다
+            'OPTIONS': {
+                'timeout': 20,
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -151,6 +189,21 @@ STATIC_URL = "static/"
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# 운영: collectstatic이 해시 파일명 + .gz/.br 파일을 만든다 (만료 없이 캐시 가능)
+# 개발(DEBUG)에서는 collectstatic 없이 원래 파일명으로 제공
+if not DEBUG:
+    STORAGES = {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "trip.storage.CompressedManifestStaticFilesStorage"},
+    }
+
+# 이보다 작은 응답은 압축하지 않는다 (bytes)
+COMPRESSION_MIN_SIZE = 1024
+
+# 같은 모양의 SQL이 한 요청에서 이 횟수 이상 반복되면 N+1 경고
+SQL_N_PLUS_ONE_THRESHOLD = 5
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -160,3 +213,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Kakao API Key
 KAKAO_JAVASCRIPT_KEY = os.getenv('KAKAO_JAVASCRIPT_KEY')
+
+# 서버에서 호출하는 카카오 로컬 API (장소 검색 프록시)
+KAKAO_REST_API_KEY = os.getenv('KAKAO_REST_API_KEY')
+KAKAO_LOCAL_API_URL = os.getenv('KAKAO_LOCAL_API_URL', 'https://dapi.kakao.com')
+KAKAO_API_TIMEOUT = float(os.getenv('KAKAO_API_TIMEOUT', '3'))
+KAKAO_API_POOL_SIZE = int(os.getenv('KAKAO_API_POOL_SIZE', '10'))
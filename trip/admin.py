@@ -1,5 +1,6 @@
 # trip/admin.py
 from django.contrib import admin
+from django.db.models import Count
 from .models import (
     TravelGroup,
     GroupMember,
@@ -39,6 +40,7 @@ class PlaceGroupLinkInline(admin.TabularInline):
 @admin.register(TravelGroup)
 class TravelGroupAdmin(admin.ModelAdmin):
     list_display = ['id', 'name', 'created_by', 'member_count', 'created_at']
+    list_select_related = ['created_by']
     search_fields = ['name', 'description']
     autocomplete_fields = ['created_by']
     inlines = [GroupMembershipInline, TravelGroupPlaceInline]
@@ -55,10 +57,13 @@ class PlaceAdmin(admin.ModelAdmin):
     )
     inlines = [PlaceGroupLinkInline]
 
+    def get_queryset(self, request):
+        # 목록에서 행마다 COUNT 쿼리가 나가지 않도록 한 번에 집계
+        return super().get_queryset(request).annotate(groups_count=Count('travel_group_links'))
+
+    @admin.display(description='Groups', ordering='groups_count')
     def groups_count(self, obj):
-        # TravelGroup.places 의 related_name='travel_groups' 기준
-        return obj.travel_groups.count()
-    groups_count.short_description = 'Groups'
+        return obj.groups_count
 
 
 @admin.register(TravelGroupPlace)
@@ -1,15 +1,70 @@
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.views.decorators.http import require_GET, require_POST
-from django.db import transaction
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET, require_POST
+from django.views.decorators.vary import vary_on_headers
+from django.db import connections, transaction
 from django.urls import reverse
 import json
+from functools import wraps
+from decimal import Decimal, InvalidOperation
 
+from . import membership
+from .clustering import cluster_places, MIN_MAP_LEVEL, MAX_MAP_LEVEL
+from .dayplan import MAX_DAYS, plan_group_days
+from .dbpool import pool_stats
+from .geo import encode_polyline, geocell, parse_viewport
+from .kakao_maps_api import KakaoApiError, search_places
 from .models import TravelGroup, Place, TravelGroupPlace
+from .nearby import MAX_K, nearest_group_places
+from .pagination import keyset_paginate
+from .renderers import FastJsonResponse, dumps
+from .routing import DEFAULT_TIME_BUDGET, MAX_TIME_BUDGET, plan_group_route
+from .search import autocomplete_places
+from .services import (
+    copy_recommendations_count, group_place_added, group_places_changed, insert_ignore, set_recommendation,
+)
 from .utils import is_group_member
 
 
+def _place_type(value) -> str:
+    # 드롭다운 값(소문자)도 받는다. 값이 없으면 기타
+    value = value or TravelGroupPlace.PlaceType.OTHER
+    if not isinstance(value, str):
+        raise ValueError("알 수 없는 장소 타입입니다.")
+    place_type = value.upper()
+    if place_type not in TravelGroupPlace.PlaceType.values:
+        raise ValueError("알 수 없는 장소 타입입니다.")
+    return place_type
+
+
+def _new_place(place_id, place_data):
+    # bulk_create / insert_ignore는 save()를 거치지 않으므로 geocell도 여기서 채운다
+    name, address = place_data.get("name"), place_data.get("address")
+    lat, lng = place_data.get("lat"), place_data.get("lng")
+    if not name or not address or lat is None or lng is None:
+        raise ValueError("장소 정보가 부족합니다.")
+    try:
+        lat, lng = Decimal(str(lat)), Decimal(str(lng))
+        valid = -90 <= lat <= 90 and -180 <= lng <= 180
+    except InvalidOperation:  # NaN 비교 포함
+        valid = False
+    if not valid:
+        raise ValueError("좌표 형식이 잘못되었습니다.")
+
+    return Place(
+        id=place_id,
+        name=name,
+        address=address,
+        lat=lat,
+        lng=lng,
+        phone=place_data.get("phone") or "",
+        url=place_data.get("url") or "",
+        geocell=geocell(lat, lng),
+    )
+
+
 @login_required
 @require_POST
 @transaction.atomic
@@ -17,60 +72,197 @@ def group_place_create_api(request, group_pk: int):
     try:
         payload = json.loads(request.body)
     except json.JSONDecodeError:
-        return JsonResponse({"success": False, "error": "잘못된 JSON 형식입니다."}, status=400)
+        return FastJsonResponse({"success": False, "error": "잘못된 JSON 형식입니다."}, status=400)
 
     group = get_object_or_404(TravelGroup, pk=group_pk)
+    if not membership.is_member(request.user, group.pk, request):
+        return FastJsonResponse({"success": False, "error": "그룹 멤버만 장소를 추가할 수 있습니다."}, status=403)
 
     place_data = payload.get("place")
     if not place_data:
-        return JsonResponse({"success": False, "error": "선택된 장소 정보를 받지 못했습니다."}, status=400)
-
-    place_id = place_data.get("id")
-    try:    # DB에 이미 존재하는 장소인지 검색
-        place = Place.objects.get(pk=place_id)
-
-        if TravelGroupPlace.objects.filter(travel_group=group, place=place).exists():
-            return JsonResponse({"success": False, "error": "이미 이 그룹에 같은 장소가 저장되어 있습니다."}, status=400)
-
-
-    except Place.DoesNotExist:  # 존재하지 않을 경우 새로 생성
-        place_name = place_data.get("name")
-        place_address = place_data.get("address")
-        place_lat = place_data.get("lat")
-        place_lng = place_data.get("lng")
+        return FastJsonResponse({"success": False, "error": "선택된 장소 정보를 받지 못했습니다."}, status=400)
 
-        if not place_name or not place_address or place_lat is None or place_lng is None:
-            return JsonResponse({"success": False, "error": "장소 정보가 부족합니다."}, status=400)
+    try:
+        place_id = int(place_data.get("id"))
+    except (TypeError, ValueError):
+        return FastJsonResponse({"success": False, "error": "장소 정보가 부족합니다."}, status=400)
 
-        place = Place.objects.create(
-            id=place_id,
-            name=place_name,
-            address=place_address,
-            lat=place_lat,
-            lng=place_lng,
-            phone=place_data.get("phone"),
-            url=place_data.get("url")
-        )
+    try:
+        place_type = _place_type(payload.get("place_type"))  # 장소 타입 dropdown 값
+    except ValueError as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+    description = payload.get("description") or ""  # 텍스트
 
-    place_type = payload.get("place_type")  # 장소 타입 dropdown 값
-    description = payload.get("description")  # 텍스트
+    # 미리 조회하지 않고 INSERT ... ON CONFLICT DO NOTHING 으로 저장
+    # (동시에 같은 장소를 추가해도 IntegrityError가 나지 않는다)
+    try:
+        place = _new_place(place_id, place_data)
+    except ValueError:
+        place = None
+    if place is not None:
+        place_created = insert_ignore(place, ["id"])
+    elif Place.objects.filter(pk=place_id).exists():
+        # 장소 정보가 부족한 경우에만 기존 장소인지 확인
+        place_created = False
+    else:
+        return FastJsonResponse({"success": False, "error": "장소 정보가 부족합니다."}, status=400)
 
-    # TravelGroupPlace 생성
-    TravelGroupPlace.objects.create(
+    # TravelGroupPlace 생성, 충돌하면 이미 저장된 장소
+    link = TravelGroupPlace(
         travel_group=group,
-        place=place,
-        nickname=place_data.get("name"),
+        place_id=place_id,
+        nickname=place_data.get("name") or "",
         place_type=place_type,
         description=description,
         created_by=request.user,
     )
+    if not insert_ignore(link, ["travel_group", "place"]):
+        return FastJsonResponse({"success": False, "error": "이미 이 그룹에 같은 장소가 저장되어 있습니다."}, status=400)
+
+    # 직접 INSERT 했으므로 시그널 대신 순위 점수와 그룹 요약/버전을 갱신 (요약은 증분으로)
+    if not place_created:
+        copy_recommendations_count(TravelGroupPlace.objects.filter(travel_group=group, place_id=place_id))
+    if not place_created:
+        # 기존 장소면 요청의 좌표가 아니라 저장된 좌표로 요약을 넓힌다
+        place = Place.objects.only("lat", "lng").get(pk=place_id)
+    group_place_added(group.pk, place.lat, place.lng)
 
-    return JsonResponse({
+    return FastJsonResponse({
         "success": True,
         "redirect_url": f"/groups/{group_pk}/",
     })
 
 
+MAX_IMPORT_ITEMS = 10000
+IMPORT_BATCH_SIZE = 1000
+
+
+def _read_import_items(request):
+    """
+        JSON 배열(또는 {"places": [...]}) / NDJSON 본문을 항목 리스트로 변환
+        형식이 잘못되었으면 ValueError
+    """
+    if request.content_type == "application/x-ndjson":
+        # 한 줄씩 읽어 본문 전체를 한 번에 파싱하지 않는다
+        # (스트림은 DATA_UPLOAD_MAX_MEMORY_SIZE를 거치지 않으므로 한도를 넘으면 더 읽지 않는다)
+        items = []
+        for line in request:
+            if line.strip():
+                items.append(json.loads(line))
+                if len(items) > MAX_IMPORT_ITEMS:
+                    break
+        return items
+
+    payload = json.loads(request.body)
+    if isinstance(payload, dict):
+        payload = payload.get("places")
+    if not isinstance(payload, list):
+        raise ValueError("expected a list of places")
+    return payload
+
+
+def _import_item(item):
+    """
+        가져오기 항목 하나를 (place_id, place_data, place_type, description)으로 정리
+        장소 생성 API와 같은 {"place": {...}, "place_type", "description"} 형식과
+        장소 정보만 있는 평평한 형식을 모두 받는다. 잘못된 항목이면 ValueError
+    """
+    if not isinstance(item, dict):
+        raise ValueError("항목 형식이 잘못되었습니다.")
+    place_data = item.get("place", item)
+    if not isinstance(place_data, dict):
+        raise ValueError("항목 형식이 잘못되었습니다.")
+
+    try:
+        place_id = int(place_data.get("id"))
+    except (TypeError, ValueError):
+        raise ValueError("장소 id가 없습니다.")
+
+    return place_id, place_data, _place_type(item.get("place_type")), item.get("description") or ""
+
+
+@login_required
+@require_POST
+@transaction.atomic
+def group_place_import_api(request, group_pk: int):
+    group = get_object_or_404(TravelGroup, pk=group_pk)
+    if not membership.is_member(request.user, group.pk, request):
+        return FastJsonResponse({"success": False, "error": "그룹 멤버만 장소를 가져올 수 있습니다."}, status=403)
+
+    try:
+        items = _read_import_items(request)
+    except ValueError:  # JSONDecodeError 포함
+        return FastJsonResponse({"success": False, "error": "잘못된 JSON 형식입니다."}, status=400)
+    if len(items) > MAX_IMPORT_ITEMS:
+        return FastJsonResponse(
+            {"success": False, "error": f"한 번에 최대 {MAX_IMPORT_ITEMS}개까지 가져올 수 있습니다."},
+            status=400,
+        )
+
+    results = [{"index": i} for i in range(len(items))]
+    parsed = {}  # place_id -> (index, place_data, place_type, description)
+    for i, item in enumerate(items):
+        try:
+            place_id, place_data, place_type, description = _import_item(item)
+        except ValueError as e:
+            results[i].update(status="error", error=str(e))
+            continue
+        results[i]["place_id"] = place_id
+        if place_id in parsed:
+            results[i].update(status="duplicate")
+            continue
+        parsed[place_id] = (i, place_data, place_type, description)
+
+    # 이미 있는 장소 / 이미 이 그룹에 저장된 장소를 한 번씩만 조회
+    existing_places = set(Place.objects.filter(id__in=parsed).values_list("id", flat=True))
+    saved_places = set(
+        TravelGroupPlace.objects
+        .filter(travel_group=group, place_id__in=parsed)
+        .values_list("place_id", flat=True)
+    )
+
+    new_places, new_links = [], []
+    for place_id, (i, place_data, place_type, description) in parsed.items():
+        if place_id in saved_places:
+            results[i]["status"] = "already_saved"
+            continue
+        if place_id not in existing_places:
+            try:
+                new_places.append(_new_place(place_id, place_data))
+            except ValueError as e:
+                results[i].update(status="error", error=str(e))
+                continue
+        new_links.append(TravelGroupPlace(
+            travel_group=group,
+            place_id=place_id,
+            nickname=place_data.get("name") or "",
+            place_type=place_type,
+            description=description,
+            created_by=request.user,
+        ))
+        results[i]["status"] = "created"
+
+    # 동시에 같은 장소가 들어와도 충돌은 무시 (INSERT ... ON CONFLICT DO NOTHING)
+    Place.objects.bulk_create(new_places, batch_size=IMPORT_BATCH_SIZE, ignore_conflicts=True)
+    TravelGroupPlace.objects.bulk_create(new_links, batch_size=IMPORT_BATCH_SIZE, ignore_conflicts=True)
+
+    # bulk_create는 시그널을 보내지 않으므로 순위 점수와 그룹 요약/버전을 직접 갱신
+    # (새로 만든 장소는 추천이 없으므로 기존 장소를 연결한 경우만)
+    linked_existing = [link.place_id for link in new_links if link.place_id in existing_places]
+    if linked_existing:
+        copy_recommendations_count(
+            TravelGroupPlace.objects.filter(travel_group=group, place_id__in=linked_existing)
+        )
+    if new_links:
+        group_places_changed(group.pk)
+
+    return FastJsonResponse({
+        "success": True,
+        "created": len(new_links),
+        "results": results,
+    })
+
+
 @login_required
 @require_POST
 @transaction.atomic
@@ -78,9 +270,11 @@ def group_place_update_api(request, place_link_pk: int):
     try:
         payload = json.loads(request.body)
     except json.JSONDecodeError:
-        return JsonResponse({"success": False, "error": "잘못된 JSON 형식입니다."}, status=400)
+        return FastJsonResponse({"success": False, "error": "잘못된 JSON 형식입니다."}, status=400)
 
     place_link = get_object_or_404(TravelGroupPlace, pk=place_link_pk)
+    if not membership.is_member(request.user, place_link.travel_group_id, request):
+        return FastJsonResponse({"success": False, "error": "그룹 멤버만 장소를 수정할 수 있습니다."}, status=403)
 
     nickname = payload.get("nickname")
     place_type = payload.get("place_type")
@@ -91,31 +285,512 @@ def group_place_update_api(request, place_link_pk: int):
     place_link.description = description
     place_link.save()
 
-    return JsonResponse({
+    return FastJsonResponse({
         "success": True,
         "redirect_url": reverse("trip:group_place_list", kwargs={"pk": place_link.travel_group.pk}),
     })
 
 
+def _group_places_state(request, group_pk):
+    # ETag/Last-Modified 계산은 그룹 행 하나만 읽는다 (요청당 한 번)
+    if not hasattr(request, "_group_places_state"):
+        request._group_places_state = (
+            TravelGroup.objects
+            .filter(pk=group_pk)
+            .values_list("places_version", "places_modified_at")
+            .first()
+        )
+    return request._group_places_state
+
+
+def _group_places_etag(request, group_pk):
+    state = _group_places_state(request, group_pk)
+    return f"{group_pk}-{state[0]}" if state else None
+
+
+def _group_places_last_modified(request, group_pk):
+    state = _group_places_state(request, group_pk)
+    return state[1] if state else None
+
+
+def _viewport_from_request(request):
+    """
+        ?sw=lat,lng&ne=lat,lng 파라미터를 읽어 (south, west, north, east) 반환
+        파라미터가 없으면 None, 형식이 잘못되었으면 ValueError
+    """
+    sw, ne = request.GET.get("sw"), request.GET.get("ne")
+    if not sw and not ne:
+        return None
+    return parse_viewport(sw or "", ne or "")
+
+
+# group_places_json에서 실제로 읽는 컬럼만 (모델 인스턴스를 만들지 않음)
+PLACE_JSON_COLUMNS = (
+    "id", "nickname", "place_type", "description",
+    "place_id", "place__name", "place__address", "place__lat", "place__lng", "day",
+)
+STREAM_CHUNK_SIZE = 2000
+PLACES_PAGE_SIZE = 100
+MAX_TOP_K = 100
+MAX_PLACES_PAGE_SIZE = 1000
+
+
+def _place_json_rows(rows):
+    # rows: links.values_list(*PLACE_JSON_COLUMNS)
+    for link_id, nickname, place_type, description, place_id, name, address, lat, lng, day in rows:
+        yield {
+            "link_id": link_id,
+            "place_id": place_id,
+            "name": nickname or name,
+            "address": address,
+            "lat": lat,
+            "lng": lng,
+            "place_type": place_type,
+            "description": description,
+            "day": day,
+        }
+
+
+# 압축 열(column) 형식: ?format=columnar 또는 Accept 헤더로 요청
+COLUMNAR_MEDIA_TYPE = "application/vnd.plantogether.columnar+json"
+
+
+def _wants_columnar(request) -> bool:
+    return (
+        request.GET.get("format") == "columnar"
+        or COLUMNAR_MEDIA_TYPE in request.headers.get("Accept", "")
+    )
+
+
+def _columnar_places(rows):
+    """
+        장소 목록을 열 단위로: 키 반복 없이 필드별 배열,
+        place_type은 사전(values) + 코드 배열, 좌표는 마이크로도 델타 polyline 문자열
+    """
+    columns = {key: [] for key in ("link_id", "place_id", "name", "address", "description", "day")}
+    type_codes, types, coords = {}, [], []
+    for link_id, nickname, place_type, description, place_id, name, address, lat, lng, day in rows:
+        columns["link_id"].append(link_id)
+        columns["place_id"].append(place_id)
+        columns["name"].append(nickname or name)
+        columns["address"].append(address)
+        columns["description"].append(description)
+        columns["day"].append(day)
+        types.append(type_codes.setdefault(place_type, len(type_codes)))
+        coords.append((lat, lng))
+
+    return {
+        "format": "columnar",
+        "count": len(types),
+        **columns,
+        "place_type": {"values": list(type_codes), "codes": types},
+        "coords": encode_polyline(coords),
+    }
+
+
+def _group_places_json_etag(request, group_pk):
+    # 형식마다 본문이 다르므로 ETag도 달라야 한다 (Vary: Accept)
+    etag = _group_places_etag(request, group_pk)
+    if etag and _wants_columnar(request):
+        etag += "-columnar"
+    return etag
+
+
+def _places_response(request, rows, **extra):
+    if _wants_columnar(request):
+        return FastJsonResponse({**_columnar_places(rows), **extra}, content_type=COLUMNAR_MEDIA_TYPE)
+    return FastJsonResponse({"places": list(_place_json_rows(rows)), **extra})
+
+
+def _stream_places_json(links):
+    # {"places": [...]} 를 한 행씩 써서 그룹 크기와 상관없이 메모리를 일정하게 유지
+    yield b'{"places":['
+    # PostgreSQL에서는 서버 사이드 커서로 STREAM_CHUNK_SIZE씩 가져온다
+    rows = links.values_list(*PLACE_JSON_COLUMNS).iterator(chunk_size=STREAM_CHUNK_SIZE)
+    for i, row in enumerate(_place_json_rows(rows)):
+        yield (b"," if i else b"") + dumps(row)
+    yield b"]}"
+
+
+def _group_members_only(view):
+    """
+        그룹 멤버가 아니면 403
+        ETag/Last-Modified 계산(condition)보다 먼저 검사해 304로도 그룹 상태가 드러나지 않게 한다.
+    """
+    @wraps(view)
+    def wrapped(request, group_pk, *args, **kwargs):
+        if not membership.is_member(request.user, group_pk, request):
+            return FastJsonResponse({"success": False, "error": "그룹 멤버만 볼 수 있습니다."}, status=403)
+        return view(request, group_pk, *args, **kwargs)
+    return wrapped
+
+
+# 그룹 장소가 바뀌지 않았으면 장소 테이블을 읽지 않고 304로 응답
+# (no-cache: 브라우저가 캐시를 쓰기 전에 항상 재검증)
+@login_required
+@_group_members_only
+@vary_on_headers("Accept")
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_group_places_json_etag, last_modified_func=_group_places_last_modified)
 def group_places_json(request, group_pk):
-    links = (
+    links = TravelGroupPlace.objects.filter(travel_group_id=group_pk)
+
+    # 지도 범위가 주어지면 화면 안의 장소만
+    try:
+        viewport = _viewport_from_request(request)
+    except ValueError:
+        return FastJsonResponse({"success": False, "error": "잘못된 지도 범위입니다."}, status=400)
+    if viewport:
+        links = links.in_viewport(*viewport)
+
+    # ?stream=1: 큰 그룹용 스트리밍 응답 (행 단위 JSON 형식만)
+    if request.GET.get("stream") == "1":
+        return StreamingHttpResponse(_stream_places_json(links), content_type="application/json")
+
+    # ?cursor=...&limit=N: 키셋 페이지네이션 (id 순서, next/prev 커서)
+    if "cursor" in request.GET or "limit" in request.GET:
+        try:
+            limit = min(int(request.GET.get("limit", PLACES_PAGE_SIZE)), MAX_PLACES_PAGE_SIZE)
+            if limit < 1:
+                raise ValueError
+            page = keyset_paginate(
+                links.values_list(*PLACE_JSON_COLUMNS),
+                request.GET.get("cursor"),
+                limit,
+                key_func=lambda row: row[0],
+            )
+        except ValueError:
+            return FastJsonResponse({"success": False, "error": "잘못된 페이지 요청입니다."}, status=400)
+
+        return _places_response(request, page.object_list, next=page.next_cursor, prev=page.prev_cursor)
+
+    return _places_response(request, links.values_list(*PLACE_JSON_COLUMNS))
+
+
+@login_required
+@require_GET
+@_group_members_only
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_group_places_etag, last_modified_func=_group_places_last_modified)
+def group_place_clusters_json(request, group_pk):
+    try:
+        level = int(request.GET.get("level", ""))
+    except ValueError:
+        level = None
+    if level is None or not MIN_MAP_LEVEL <= level <= MAX_MAP_LEVEL:
+        return FastJsonResponse({"success": False, "error": "잘못된 지도 레벨입니다."}, status=400)
+
+    try:
+        viewport = _viewport_from_request(request)
+    except ValueError:
+        return FastJsonResponse({"success": False, "error": "잘못된 지도 범위입니다."}, status=400)
+
+    links = TravelGroupPlace.objects.filter(travel_group_id=group_pk)
+    if viewport:
+        links = links.in_viewport(*viewport)
+
+    return FastJsonResponse({"level": level, "clusters": cluster_places(links, level)})
+
+
+@login_required
+@require_GET
+@_group_members_only
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_group_places_etag, last_modified_func=_group_places_last_modified)
+def group_place_summary_json(request, group_pk):
+    group = get_object_or_404(
+        TravelGroup.objects.only("place_count", "bbox_south", "bbox_west", "bbox_north", "bbox_east"),
+        pk=group_pk,
+    )
+
+    bounds = center = None
+    if group.place_count:
+        bounds = {
+            "south": group.bbox_south,
+            "west": group.bbox_west,
+            "north": group.bbox_north,
+            "east": group.bbox_east,
+        }
+        center = {
+            "lat": (group.bbox_south + group.bbox_north) / 2,
+            "lng": (group.bbox_west + group.bbox_east) / 2,
+        }
+
+    return FastJsonResponse({"count": group.place_count, "bounds": bounds, "center": center})
+
+
+@login_required
+@require_GET
+@_group_members_only
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_group_places_etag, last_modified_func=_group_places_last_modified)
+def group_places_nearby_json(request, group_pk):
+    """
+        ?lat=&lng= 또는 ?link=<TravelGroupPlace id> 기준으로 가까운 그룹 장소 k개 (&k=, 기본 5)
+    """
+    try:
+        k = min(max(int(request.GET.get("k", 5)), 1), MAX_K)
+        link_id = request.GET.get("link")
+        if link_id:
+            origin = get_object_or_404(
+                TravelGroupPlace.objects.select_related("place").only("place__lat", "place__lng"),
+                pk=int(link_id),
+                travel_group_id=group_pk,
+            ).place
+            lat, lng = origin.lat, origin.lng
+        else:
+            lat, lng = float(request.GET["lat"]), float(request.GET["lng"])
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                raise ValueError
+    except (KeyError, ValueError):
+        return FastJsonResponse({"success": False, "error": "기준 좌표가 잘못되었습니다."}, status=400)
+
+    nearest = nearest_group_places(group_pk, lat, lng, k, exclude_link_id=int(link_id) if link_id else None)
+
+    return FastJsonResponse({
+        "origin": {"lat": lat, "lng": lng},
+        "places": [
+            {
+                "link_id": link_id,
+                "place_id": place_id,
+                "name": nickname or name,
+                "address": address,
+                "lat": place_lat,
+                "lng": place_lng,
+                "place_type": place_type,
+                "distance_m": round(distance * 1000),
+            }
+            for distance, (link_id, nickname, place_type, place_id, name, address, place_lat, place_lng) in nearest
+        ],
+    })
+
+
+@login_required
+@require_GET
+@_group_members_only
+@cache_control(private=True, no_cache=True)
+def group_place_top_json(request, group_pk):
+    """
+        그룹에서 추천을 많이 받은 장소 k개 (&k=, 기본 10)
+        (travel_group, -recommendations_count, id) 인덱스를 앞에서부터 k개만 읽는다.
+    """
+    try:
+        k = min(max(int(request.GET.get("k", 10)), 1), MAX_TOP_K)
+    except ValueError:
+        return FastJsonResponse({"success": False, "error": "잘못된 요청입니다."}, status=400)
+
+    rows = (
         TravelGroupPlace.objects
-        .select_related('place')
         .filter(travel_group_id=group_pk)
+        .order_by("-recommendations_count", "id")
+        .values_list("id", "nickname", "place_type", "place_id", "place__name", "recommendations_count")[:k]
     )
+    return FastJsonResponse({
+        "places": [
+            {
+                "link_id": link_id,
+                "place_id": place_id,
+                "name": nickname or name,
+                "place_type": place_type,
+                "recommendations": count,
+            }
+            for link_id, nickname, place_type, place_id, name, count in rows
+        ],
+    })
+
+
+@login_required
+@require_POST
+@transaction.atomic
+def group_place_day_plan_api(request, group_pk: int):
+    """
+        그룹 장소를 N일로 나눠 저장 {"days": N, "pin_accommodation": true, "seed": 0}
+    """
+    group = get_object_or_404(TravelGroup, pk=group_pk)
+    if not membership.is_member(request.user, group.pk, request):
+        return FastJsonResponse({"success": False, "error": "그룹 멤버만 일정을 나눌 수 있습니다."}, status=403)
+
+    try:
+        data = json.loads(request.body)
+        days = int(data.get("days"))
+        seed = int(data.get("seed", 0))
+        if not 1 <= days <= MAX_DAYS:
+            raise ValueError
+    except (TypeError, ValueError):  # JSONDecodeError 포함
+        return FastJsonResponse({"success": False, "error": f"일수는 1~{MAX_DAYS} 사이여야 합니다."}, status=400)
+
+    plan, changed = plan_group_days(group.pk, days, bool(data.get("pin_accommodation", True)), seed)
+    return FastJsonResponse({
+        "success": True,
+        "days": [{"day": day, "link_ids": link_ids} for day, link_ids in sorted(plan.items())],
+        "changed": changed,
+    })
+
+
+@login_required
+@require_GET
+def group_place_route_json(request, group_pk):
+    """
+        그룹 장소 방문 순서 최적화
+        ?links=1,2,3 또는 ?place_type=CAFE (없으면 전체), &start=lat,lng, &budget_ms=
+    """
+    if not membership.is_member(request.user, group_pk, request):
+        return FastJsonResponse({"success": False, "error": "그룹 멤버만 경로를 계산할 수 있습니다."}, status=403)
+
+    try:
+        link_ids = None
+        if request.GET.get("links"):
+            link_ids = [int(v) for v in request.GET["links"].split(",")]
+        place_type = _place_type(request.GET["place_type"]) if request.GET.get("place_type") else None
 
-    data = []
-    for link in links:
-        p = link.place
-        data.append({
-            "link_id": link.id,
-            "place_id": p.id,
-            "name": link.nickname or p.name,
-            "address": p.address,
-            "lat": p.lat,
-            "lng": p.lng,
-            "place_type": link.place_type,
-            "description": link.description,
-        })
-
-    return JsonResponse({"places": data})
\ No newline at end of file
+        start = None
+        if request.GET.get("start"):
+            start = tuple(float(v) for v in request.GET["start"].split(","))
+            if len(start) != 2 or not (-90 <= start[0] <= 90 and -180 <= start[1] <= 180):
+                raise ValueError
+        budget = min(max(int(request.GET.get("budget_ms", DEFAULT_TIME_BUDGET * 1000)), 0), MAX_TIME_BUDGET * 1000)
+    except ValueError:
+        return FastJsonResponse({"success": False, "error": "잘못된 경로 요청입니다."}, status=400)
+
+    try:
+        route = plan_group_route(group_pk, link_ids, place_type, start, budget / 1000)
+    except ValueError as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+    if route is None:
+        return FastJsonResponse({"success": False, "error": "그룹을 찾을 수 없습니다."}, status=404)
+    stops, total = route
+
+    return FastJsonResponse({
+        "start": {"lat": start[0], "lng": start[1]} if start else None,
+        "total_distance_m": round(total * 1000),
+        "stops": [
+            {
+                "link_id": link_id,
+                "place_id": place_id,
+                "name": nickname or name,
+                "lat": lat,
+                "lng": lng,
+                "place_type": place_type,
+                "leg_m": round(leg * 1000),
+            }
+            for leg, (link_id, nickname, place_type, place_id, name, lat, lng) in stops
+        ],
+    })
+
+
+@login_required
+@require_GET
+def place_search_api(request):
+    query = request.GET.get("q", "").strip()
+    if not query:
+        return FastJsonResponse({"success": False, "error": "검색어를 입력하세요."}, status=400)
+    try:
+        page = int(request.GET.get("page", 1))
+        size = int(request.GET.get("size", 15))
+    except ValueError:
+        return FastJsonResponse({"success": False, "error": "잘못된 페이지 요청입니다."}, status=400)
+
+    try:
+        result = search_places(query, page=page, size=size)
+    except KakaoApiError as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=502)
+
+    # 이미 DB에 있는 장소 표시 (pk 조회 한 번, 캐시된 결과는 건드리지 않는다)
+    ids = [int(d["id"]) for d in result["documents"] if str(d.get("id", "")).isdigit()]
+    existing = set(Place.objects.filter(id__in=ids).values_list("id", flat=True))
+    documents = [
+        {**d, "existing": str(d.get("id", "")).isdigit() and int(d["id"]) in existing}
+        for d in result["documents"]
+    ]
+
+    return FastJsonResponse({"success": True, "documents": documents, "meta": result["meta"]})
+
+
+@login_required
+@require_GET
+def place_autocomplete_api(request):
+    try:
+        limit = min(max(int(request.GET.get("limit", 10)), 1), 50)
+    except ValueError:
+        return FastJsonResponse({"success": False, "error": "잘못된 요청입니다."}, status=400)
+    return FastJsonResponse({"results": autocomplete_places(request.GET.get("q", ""), limit)})
+
+
+MAX_RECOMMENDATION_SYNC = 200
+
+
+def _recommended_flag(value) -> bool:
+    if not isinstance(value, bool):
+        raise ValueError("recommended는 true/false 여야 합니다.")
+    return value
+
+
+@login_required
+@require_POST
+@transaction.atomic
+def place_recommend_api(request, place_pk: int):
+    """
+        추천/추천 취소 {"recommended": true|false}
+        토글이 아니라 원하는 상태를 보내므로 같은 요청을 여러 번 보내도 결과가 같다.
+    """
+    try:
+        recommended = _recommended_flag(json.loads(request.body).get("recommended"))
+    except (AttributeError, ValueError):  # JSONDecodeError 포함
+        return FastJsonResponse({"success": False, "error": "잘못된 요청입니다."}, status=400)
+
+    if not Place.objects.filter(pk=place_pk).exists():
+        return FastJsonResponse({"success": False, "error": "장소를 찾을 수 없습니다."}, status=404)
+
+    changed = set_recommendation(place_pk, request.user.pk, recommended)
+    count = Place.objects.filter(pk=place_pk).values_list("recommendations_count", flat=True).first()
+    return FastJsonResponse({"success": True, "recommended": recommended, "changed": changed, "count": count})
+
+
+@login_required
+@require_POST
+@transaction.atomic
+def recommendation_sync_api(request):
+    """
+        여러 장소의 추천 상태를 한 번에 맞춘다 [{"place_id": 1, "recommended": true}, ...]
+        같은 장소가 여러 번 오면 마지막 값을 쓴다.
+    """
+    try:
+        items = json.loads(request.body)
+        if not isinstance(items, list):
+            raise ValueError
+        wanted = {}
+        for item in items:
+            wanted[int(item["place_id"])] = _recommended_flag(item.get("recommended"))
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return FastJsonResponse({"success": False, "error": "잘못된 요청입니다."}, status=400)
+    if len(wanted) > MAX_RECOMMENDATION_SYNC:
+        return FastJsonResponse(
+            {"success": False, "error": f"한 번에 최대 {MAX_RECOMMENDATION_SYNC}개까지 보낼 수 있습니다."},
+            status=400,
+        )
+
+    existing = set(Place.objects.filter(pk__in=wanted).values_list("id", flat=True))
+
+    # 장소 카운터 행 잠금 순서를 고정해 동시 동기화끼리 교착되지 않게 한다
+    results = []
+    for place_id in sorted(wanted):
+        if place_id not in existing:
+            results.append({"place_id": place_id, "status": "not_found"})
+            continue
+        changed = set_recommendation(place_id, request.user.pk, wanted[place_id])
+        results.append({"place_id": place_id, "status": "changed" if changed else "unchanged"})
+
+    counts = dict(Place.objects.filter(pk__in=existing).values_list("id", "recommendations_count"))
+    for result in results:
+        if result["place_id"] in counts:
+            result["count"] = counts[result["place_id"]]
+    return FastJsonResponse({"success": True, "results": results})
+
+
+@login_required
+@require_GET
+def db_pool_stats_api(request):
+    # 운영 확인용: 스태프만
+    if not request.user.is_staff:
+        return FastJsonResponse({"success": False, "error": "권한이 없습니다."}, status=403)
+    return FastJsonResponse({"databases": [pool_stats(alias) for alias in connections]})
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TripConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "trip"
+
+    def ready(self):
+        from . import dbpool, signals  # noqa: F401
@@ -0,0 +1,61 @@
+import math
+
+
+def percentile(sorted_values, q: float) -> float:
+    # 최근접 순위(nearest-rank) 백분위. sorted_values는 정렬된 리스트
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(timings_ms) -> dict:
+    """
+        측정값(ms) 목록의 요약: 개수, 평균, p50/p95/p99, 최소/최대
+    """
+    values = sorted(timings_ms)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "min": round(values[0], 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def local_host() -> str:
+    # Client/루프백 요청에 쓸 Host 헤더 (ALLOWED_HOSTS가 비어 있으면 DEBUG에서 허용되는 localhost)
+    from django.conf import settings
+
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*" and not host.startswith("."):
+            return host
+    return "localhost"
+
+
+def environment() -> dict:
+    """
+        결과 파일에 함께 남길 실행 환경: 커밋, 파이썬/Django 버전, DB 종류
+    """
+    import platform
+    import subprocess
+
+    import django
+    from django.db import connection
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+    }
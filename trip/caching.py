@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class LRUTTLCache:
+    """
+        프로세스 내 LRU + TTL 캐시 (스레드 안전)
+        maxsize를 넘으면 가장 오래 안 쓴 항목부터, ttl(초)이 지나면 조회 시점에 버린다.
+        weigh(value)와 maxweight를 주면 항목 무게(예: 바이트) 합계로도 제한한다.
+        maxweight보다 무거운 항목은 저장하지 않는다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, maxweight=None, weigh=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxweight = maxweight
+        self.weigh = weigh or (lambda value: 0)
+        self.weight = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pop(self, key) -> None:
+        # _lock 안에서만 호출
+        _, weight, _ = self._data.pop(key)
+        self.weight -= weight
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            item = self._data.get(key, MISSING)
+            if item is MISSING:
+                return default
+            expires_at, _, value = item
+            if expires_at < time.monotonic():
+                self._pop(key)
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        weight = self.weigh(value)
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            if self.maxweight is not None and weight > self.maxweight:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, weight, value)
+            self.weight += weight
+            while len(self._data) > self.maxsize or (self.maxweight is not None and self.weight > self.maxweight):
+                self._pop(next(iter(self._data)))
+
+    def delete(self, key) -> None:
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
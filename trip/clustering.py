@@ -0,0 +1,60 @@
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.db.models import Avg, Count, DecimalField, F, IntegerField, Value
+from django.db.models.functions import Cast, Floor
+
+# 카카오맵 레벨(1~14)별 클러스터 격자 크기: 1레벨에서 0.0005°, 한 레벨마다 2배
+MIN_MAP_LEVEL = 1
+MAX_MAP_LEVEL = 14
+BASE_CLUSTER_SIZE = Decimal("0.0005")
+
+
+def cluster_size(level: int) -> Decimal:
+    return BASE_CLUSTER_SIZE * (2 ** (level - MIN_MAP_LEVEL))
+
+
+def cluster_places(links, level: int):
+    """
+        장소 링크 queryset을 지도 레벨에 맞는 격자로 묶어 클러스터 목록을 반환
+        집계는 DB에서 (셀, place_type) 단위로 한 번에 하고, 셀 단위 병합만 파이썬에서 한다.
+    """
+    size = Value(cluster_size(level), output_field=DecimalField(max_digits=12, decimal_places=6))
+    rows = (
+        links
+        .annotate(
+            cell_y=Cast(Floor(F("place__lat") / size), IntegerField()),
+            cell_x=Cast(Floor(F("place__lng") / size), IntegerField()),
+        )
+        .values("cell_y", "cell_x", "place_type")
+        .annotate(
+            count=Count("id"),
+            lat=Avg("place__lat"),
+            lng=Avg("place__lng"),
+        )
+        .order_by()
+    )
+
+    counts = defaultdict(int)
+    lat_sums = defaultdict(float)
+    lng_sums = defaultdict(float)
+    type_counts = defaultdict(Counter)
+    for row in rows:
+        key = (row["cell_y"], row["cell_x"])
+        counts[key] += row["count"]
+        lat_sums[key] += float(row["lat"]) * row["count"]
+        lng_sums[key] += float(row["lng"]) * row["count"]
+        type_counts[key][row["place_type"]] += row["count"]
+
+    clusters = []
+    for key in sorted(counts):
+        count = counts[key]
+        # 개수가 같으면 이름순으로 골라 결과가 매번 같도록
+        place_type = min(type_counts[key].items(), key=lambda item: (-item[1], item[0]))[0]
+        clusters.append({
+            "lat": round(lat_sums[key] / count, 6),
+            "lng": round(lng_sums[key] / count, 6),
+            "count": count,
+            "place_type": place_type,
+        })
+    return clusters
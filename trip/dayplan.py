@@ -0,0 +1,156 @@
+import math
+import random
+
+from .geo import KM_PER_DEGREE_LAT
+from .models import TravelGroupPlace
+from .services import bump_places_version
+
+MAX_DAYS = 30
+MAX_ITERATIONS = 15
+# 중심 이동이 이보다 작으면(km) 수렴한 것으로 본다. 정원 제약 때문에 라벨이 조금씩 오갈 수 있다
+CENTER_TOLERANCE_KM = 0.01
+DEFAULT_SEED = 0
+
+
+def _project(coords):
+    # 여행 범위 정도에서는 등장방형(equirectangular) 평면(km)으로 충분하다
+    mean_lat = sum(lat for lat, _ in coords) / len(coords)
+    kx = KM_PER_DEGREE_LAT * math.cos(math.radians(mean_lat))
+    return [(lng * kx, lat * KM_PER_DEGREE_LAT) for lat, lng in coords]
+
+
+def _kmeans_pp(points, centers, k, rng):
+    # k-means++: 이미 있는 중심(숙소)에서 먼 점일수록 다음 중심으로 뽑힐 확률이 크다
+    centers = list(centers)
+    if not centers:
+        centers.append(points[rng.randrange(len(points))])
+    while len(centers) < k:
+        weights = [min((x - cx) ** 2 + (y - cy) ** 2 for cx, cy in centers) for x, y in points]
+        total = sum(weights)
+        if total == 0:
+            centers.append(points[rng.randrange(len(points))])
+            continue
+        target, acc = rng.random() * total, 0.0
+        for point, w in zip(points, weights):
+            acc += w
+            if acc >= target:
+                centers.append(point)
+                break
+        else:
+            centers.append(points[-1])
+    return centers
+
+
+def _balanced_assign(points, centers, capacity, pinned):
+    """
+        정원(capacity)이 있는 배정: 가장 가까운 중심과 두 번째 중심의 차이(regret)가
+        큰 점부터 남은 자리 중 가장 가까운 중심에 넣는다. O(n·k log k)
+        pinned: {점 인덱스: 중심 인덱스} (숙소 고정)
+    """
+    labels = [None] * len(points)
+    sizes = [0] * len(centers)
+    for i, c in pinned.items():
+        labels[i] = c
+        sizes[c] += 1
+
+    preferences = []
+    for i, (x, y) in enumerate(points):
+        if labels[i] is not None:
+            continue
+        ranked = sorted(((x - cx) ** 2 + (y - cy) ** 2, c) for c, (cx, cy) in enumerate(centers))
+        regret = ranked[1][0] - ranked[0][0] if len(ranked) > 1 else 0.0
+        preferences.append((-regret, i, ranked))
+
+    for _, i, ranked in sorted(preferences, key=lambda item: (item[0], item[1])):
+        for _, c in ranked:
+            if sizes[c] < capacity:
+                labels[i] = c
+                sizes[c] += 1
+                break
+    return labels
+
+
+def balanced_kmeans(coords, k, anchors=(), seed=DEFAULT_SEED):
+    """
+        [(lat, lng), ...]를 크기가 고른 k개 묶음으로 나눈 라벨 리스트
+        anchors: 묶음 중심으로 고정할 점의 인덱스(최대 k개). 같은 입력과 seed면 결과도 같다.
+    """
+    n = len(coords)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    points = _project([(float(lat), float(lng)) for lat, lng in coords])
+    anchors = list(anchors)[:k]
+    pinned = {i: c for c, i in enumerate(anchors)}
+    capacity = math.ceil(n / k)
+
+    rng = random.Random(seed)
+    centers = _kmeans_pp(points, [points[i] for i in anchors], k, rng)
+
+    labels = None
+    for _ in range(MAX_ITERATIONS):
+        new_labels = _balanced_assign(points, centers, capacity, pinned)
+        if new_labels == labels:
+            break
+        labels = new_labels
+
+        # 숙소가 고정된 묶음은 중심도 숙소에 둔다
+        sums = [[0.0, 0.0, 0] for _ in range(k)]
+        for (x, y), c in zip(points, labels):
+            sums[c][0] += x
+            sums[c][1] += y
+            sums[c][2] += 1
+        new_centers = [
+            centers[c] if c < len(anchors) or not sums[c][2]
+            else (sums[c][0] / sums[c][2], sums[c][1] / sums[c][2])
+            for c in range(k)
+        ]
+        shift = max(math.dist(a, b) for a, b in zip(centers, new_centers))
+        centers = new_centers
+        if shift < CENTER_TOLERANCE_KM:
+            break
+    return labels
+
+
+def plan_group_days(group_id: int, days: int, pin_accommodation: bool = True, seed: int = DEFAULT_SEED):
+    """
+        그룹 장소를 days일로 나눠 TravelGroupPlace.day(1부터)에 저장
+        숙소(ACCOMMODATION)는 id 순으로 하루에 하나씩 묶음 중심으로 고정한다.
+        반환: ({day: [link id, ...]}, 실제로 바뀐 장소 수)
+    """
+    links = list(
+        TravelGroupPlace.objects
+        .filter(travel_group_id=group_id)
+        .select_related("place")
+        .only("id", "day", "place_type", "place__lat", "place__lng")
+        .order_by("id")
+    )
+    anchors = []
+    if pin_accommodation:
+        anchors = [
+            i for i, link in enumerate(links)
+            if link.place_type == TravelGroupPlace.PlaceType.ACCOMMODATION
+        ]
+    labels = balanced_kmeans([(link.place.lat, link.place.lng) for link in links], days, anchors, seed)
+
+    # 묶음 번호는 가장 작은 link id 순으로 1일차부터 (고정 숙소의 순서와 무관하게 안정적)
+    first_index = {}
+    for i, c in enumerate(labels):
+        first_index.setdefault(c, i)
+    day_of = {c: day for day, c in enumerate(sorted(first_index, key=first_index.get), start=1)}
+
+    plan, changed = {}, []
+    for link, c in zip(links, labels):
+        day = day_of[c]
+        plan.setdefault(day, []).append(link.id)
+        if link.day != day:
+            link.day = day
+            changed.append(link)
+
+    # 결과가 같으면 쓰지 않는다 (places_version이 그대로라 지도 캐시도 유지)
+    if changed:
+        TravelGroupPlace.objects.bulk_update(changed, ["day"], batch_size=500)
+        # 좌표는 그대로라 요약은 다시 집계하지 않고 버전만 올린다
+        bump_places_version(group_id)
+    return plan, len(changed)
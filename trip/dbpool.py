@@ -0,0 +1,52 @@
+import threading
+from collections import Counter
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# 프로세스에서 새로 연 DB 연결 수 (alias별). 영구 연결/풀이 동작하면 거의 늘지 않는다
+_opened = Counter()
+_lock = threading.Lock()
+
+
+@receiver(connection_created)
+def _count_new_connection(sender, connection, **kwargs):
+    with _lock:
+        _opened[connection.alias] += 1
+
+
+def pool_stats(alias: str = "default") -> dict:
+    """
+        DB 연결 방식과 통계 (이 프로세스 기준)
+        psycopg 풀을 쓰면 풀의 사용 중/유휴 연결 수, 대기 시간, 실패한 대여 수를 함께 반환
+    """
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    conn_max_age = settings_dict.get("CONN_MAX_AGE") or 0
+    stats = {
+        "alias": alias,
+        "vendor": connection.vendor,
+        "mode": "persistent" if conn_max_age else "per_request",
+        "conn_max_age": conn_max_age,
+        "health_checks": settings_dict.get("CONN_HEALTH_CHECKS", False),
+        "connections_opened": _opened[alias],
+    }
+
+    pool = getattr(connection, "pool", None)  # PostgreSQL 백엔드에만 있음
+    if pool is not None:
+        raw = pool.get_stats()
+        size, available = raw.get("pool_size", 0), raw.get("pool_available", 0)
+        stats.update(
+            mode="pool",
+            min_size=raw.get("pool_min"),
+            max_size=raw.get("pool_max"),
+            in_use=size - available,
+            idle=available,
+            waiting=raw.get("requests_waiting", 0),
+            checkouts=raw.get("requests_num", 0),
+            wait_ms=raw.get("requests_wait_ms", 0),
+            checkout_failures=raw.get("requests_errors", 0),
+            connection_errors=raw.get("connections_errors", 0),
+        )
+    return stats
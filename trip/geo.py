@@ -0,0 +1,134 @@
+import math
+
+# 위경도 격자 셀 크기(도). 0.01° ≈ 위도 방향 1.1km
+GEOCELL_SIZE = 0.01
+GEOCELL_COLUMNS = int(round(360 / GEOCELL_SIZE))
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+# 뷰포트가 이 행 수보다 크면 행별 범위 대신 하나의 큰 범위로 합친다
+MAX_GEOCELL_RANGES = 32
+
+
+def _geocell_row(lat) -> int:
+    return int(math.floor((float(lat) + 90) / GEOCELL_SIZE))
+
+
+def _geocell_col(lng) -> int:
+    col = int(math.floor((float(lng) + 180) / GEOCELL_SIZE))
+    return min(max(col, 0), GEOCELL_COLUMNS - 1)
+
+
+def geocell(lat, lng) -> int:
+    """
+        위경도를 행 우선(row-major) 격자 셀 번호로 변환
+        같은 행의 셀은 번호가 연속이므로 뷰포트는 행 수만큼의 범위 조건이 된다.
+    """
+    return _geocell_row(lat) * GEOCELL_COLUMNS + _geocell_col(lng)
+
+
+def geocell_ranges(south, west, north, east):
+    """
+        뷰포트(남서/북동)를 덮는 (시작 셀, 끝 셀) 범위 목록
+        실제 위경도 비교는 호출하는 쪽에서 한 번 더 해야 한다.
+    """
+    row_start, row_end = _geocell_row(south), _geocell_row(north)
+    col_start, col_end = _geocell_col(west), _geocell_col(east)
+
+    if row_end - row_start + 1 > MAX_GEOCELL_RANGES:
+        return [(
+            row_start * GEOCELL_COLUMNS + col_start,
+            row_end * GEOCELL_COLUMNS + col_end,
+        )]
+
+    return [
+        (row * GEOCELL_COLUMNS + col_start, row * GEOCELL_COLUMNS + col_end)
+        for row in range(row_start, row_end + 1)
+    ]
+
+
+def parse_viewport(sw: str, ne: str):
+    """
+        "lat,lng" 형식의 남서/북동 좌표를 (south, west, north, east)로 변환
+        형식이 잘못되었으면 ValueError
+    """
+    south, west = (float(v) for v in sw.split(","))
+    north, east = (float(v) for v in ne.split(","))
+
+    if not (-90 <= south <= north <= 90) or not (-180 <= west <= east <= 180):
+        raise ValueError("invalid viewport")
+    return south, west, north, east
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> float:
+    """
+        두 좌표 사이의 대원 거리(km)
+    """
+    lat1, lng1, lat2, lng2 = map(math.radians, (float(lat1), float(lng1), float(lat2), float(lng2)))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bbox_around(lat, lng, radius_km):
+    """
+        (lat, lng)에서 radius_km 안의 모든 점을 포함하는 (south, west, north, east)
+        극지방이나 날짜변경선에 걸리면 경도 범위를 전체로 넓힌다.
+    """
+    lat, lng = float(lat), float(lng)
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+
+    if north >= 90 or south <= -90:
+        return south, -180.0, north, 180.0
+    x = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))
+    if radius_km / EARTH_RADIUS_KM >= math.pi / 2 or x >= 1:
+        return south, -180.0, north, 180.0
+    dlng = math.degrees(math.asin(x))
+    if lng - dlng < -180 or lng + dlng > 180:
+        return south, -180.0, north, 180.0
+    return south, lng - dlng, north, lng + dlng
+
+
+POLYLINE_PRECISION = 6  # 마이크로도(1e-6°) 단위 정수
+
+
+def _polyline_value(value: int, out: list) -> None:
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+def encode_polyline(coords, precision: int = POLYLINE_PRECISION) -> str:
+    """
+        [(lat, lng), ...]를 Google polyline 형식 문자열로 (이전 점과의 차이만 기록)
+        좌표는 10^precision 배 정수로 반올림한다. Decimal도 그대로 받는다.
+    """
+    factor = 10 ** precision
+    out, prev_lat, prev_lng = [], 0, 0
+    for lat, lng in coords:
+        lat, lng = int(round(lat * factor)), int(round(lng * factor))
+        _polyline_value(lat - prev_lat, out)
+        _polyline_value(lng - prev_lng, out)
+        prev_lat, prev_lng = lat, lng
+    return "".join(out)
+
+
+def decode_polyline(encoded: str, precision: int = POLYLINE_PRECISION):
+    # encode_polyline의 역변환 (테스트/디버깅용)
+    factor = 10 ** precision
+    coords, values, shift, result = [], [], 0, 0
+    for ch in encoded:
+        b = ord(ch) - 63
+        result |= (b & 0x1F) << shift
+        shift += 5
+        if b < 0x20:
+            values.append(~(result >> 1) if result & 1 else result >> 1)
+            shift, result = 0, 0
+    lat = lng = 0
+    for dlat, dlng in zip(values[::2], values[1::2]):
+        lat, lng = lat + dlat, lng + dlng
+        coords.append((lat / factor, lng / factor))
+    return coords
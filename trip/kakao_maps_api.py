@@ -1,2 +1,144 @@
-def search_places(query):
-    pass
\ No newline at end of file
+import http.client
+import json
+import queue
+import threading
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+
+from .caching import LRUTTLCache, MISSING
+
+KEYWORD_SEARCH_PATH = "/v2/local/search/keyword.json"
+MAX_PAGE_SIZE = 15
+MAX_PAGE = 45
+
+# 정규화한 검색어 -> 카카오 응답 (인기 검색어는 API를 다시 부르지 않는다)
+_search_cache = LRUTTLCache(maxsize=2048, ttl=300)
+
+
+class KakaoApiError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+        같은 호스트로의 keep-alive 연결을 재사용하는 작은 HTTP 연결 풀
+        빌려간 연결은 응답을 다 읽은 뒤 반납하고, 풀이 가득 차면 닫는다.
+    """
+
+    def __init__(self, base_url: str, maxsize: int = 10, timeout: float = 3.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path_prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=maxsize)
+
+    def _new_connection(self):
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def get(self, path: str, headers=None):
+        """
+            GET 요청을 보내고 (status, body bytes)를 반환
+            재사용한 연결이 서버 쪽에서 끊겨 있으면 새 연결로 한 번 더 시도한다.
+        """
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request("GET", self.path_prefix + path, headers=headers or {})
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            except OSError:
+                conn.close()
+                raise
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return resp.status, body
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    # 설정된 API 주소마다 풀 하나를 프로세스 전체에서 공유
+    base_url = settings.KAKAO_LOCAL_API_URL
+    with _pools_lock:
+        if base_url not in _pools:
+            _pools[base_url] = ConnectionPool(
+                base_url,
+                maxsize=settings.KAKAO_API_POOL_SIZE,
+                timeout=settings.KAKAO_API_TIMEOUT,
+            )
+        return _pools[base_url]
+
+
+def normalize_query(query: str) -> str:
+    # 공백/대소문자 차이는 같은 검색어로 본다
+    return " ".join(query.split()).casefold()
+
+
+def search_places(query, page: int = 1, size: int = MAX_PAGE_SIZE):
+    """
+        카카오 로컬 키워드 검색 결과({"documents": [...], "meta": {...}})를 반환
+        같은 (검색어, 페이지, 크기)는 캐시에서 돌려준다. 실패하면 KakaoApiError
+    """
+    query = normalize_query(query)
+    page = min(max(page, 1), MAX_PAGE)
+    size = min(max(size, 1), MAX_PAGE_SIZE)
+
+    key = (query, page, size)
+    result = _search_cache.get(key)
+    if result is not MISSING:
+        return result
+
+    path = KEYWORD_SEARCH_PATH + "?" + urlencode({"query": query, "page": page, "size": size})
+    headers = {"Authorization": f"KakaoAK {settings.KAKAO_REST_API_KEY}"}
+    try:
+        status, body = get_pool().get(path, headers)
+    except (OSError, http.client.HTTPException) as e:
+        raise KakaoApiError(f"카카오 API에 연결할 수 없습니다: {e}") from e
+    if status != 200:
+        raise KakaoApiError(f"카카오 API 오류 (HTTP {status})")
+
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise KakaoApiError("카카오 API 응답 형식이 잘못되었습니다.") from e
+
+    result = {"documents": data.get("documents", []), "meta": data.get("meta", {})}
+    _search_cache.set(key, result)
+    return result
+
+
+def clear_search_cache() -> None:
+    _search_cache.clear()
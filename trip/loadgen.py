@@ -0,0 +1,343 @@
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from .benchmarking import local_host, summarize
+from .models import GroupMember, Place, TravelGroupPlace
+from .synthetic import GROUP_PREFIX, PASSWORD, PLACE_ID_BASE
+
+# 새로 추가하는 장소 id 범위 (합성 장소 뒤쪽, --flush로 같이 지워진다)
+NEW_PLACE_ID_BASE = PLACE_ID_BASE + 500_000_000
+# 그룹마다 멤버들이 동시에 추가하려고 다투는 장소 수 (중복 추가 경합)
+HOT_PLACES_PER_GROUP = 20
+
+# 세션 한 단계에서 고르는 동작과 비중: 지도 폴링이 대부분, 나머지는 추가/수정
+ACTION_WEIGHTS = {"poll": 6, "create": 2, "update": 2}
+PLACE_TYPES = [choice for choice, _ in TravelGroupPlace.PlaceType.choices]
+
+DUPLICATE_MESSAGE = "이미 이 그룹에 같은 장소가 저장되어 있습니다."
+# DEBUG 500 응답의 첫 줄/제목: "OperationalError at /api/..."
+_EXCEPTION_AT = re.compile(rb"(\w+(?:Error|Exception))\s+at /")
+
+
+class ClientTransport:
+    """
+        django.test.Client로 프로세스 안에서 요청 (CSRF 검사는 실제 서버처럼 켠다)
+    """
+
+    def __init__(self):
+        self.client = Client(enforce_csrf_checks=True, raise_request_exception=False, HTTP_HOST=local_host())
+
+    def request(self, method, path, data=None, content_type=None, headers=None):
+        headers = {f"HTTP_{k.upper().replace('-', '_')}": v for k, v in (headers or {}).items()}
+        if method == "GET":
+            response = self.client.get(path, **headers)
+        elif content_type is None:
+            response = self.client.post(path, data, **headers)  # 폼 전송
+        else:
+            response = self.client.post(path, data, content_type=content_type, **headers)
+        body = b"".join(response) if response.streaming else response.content
+        exc_info = getattr(response, "exc_info", None)
+        return response.status_code, dict(response.items()), body, exc_info[1] if exc_info else None
+
+    def cookie(self, name):
+        morsel = self.client.cookies.get(name)
+        return morsel.value if morsel else None
+
+    def close(self):
+        # 스레드마다 열린 DB 연결을 정리
+        connections.close_all()
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpTransport:
+    """
+        urllib로 루프백 서버(runserver, gunicorn 또는 serve_local()로 띄운 서버)에 요청
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.cookies = CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect)
+
+    def request(self, method, path, data=None, content_type=None, headers=None):
+        headers = dict(headers or {})
+        if data is not None:
+            if content_type is None:
+                data = urllib.parse.urlencode(data)
+                content_type = "application/x-www-form-urlencoded"
+            headers["Content-Type"] = content_type
+            data = data.encode("utf-8")
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers)
+        try:
+            with self.opener.open(req, timeout=30) as response:
+                return response.status, dict(response.headers.items()), response.read(), None
+        except urllib.error.HTTPError as e:
+            # 3xx/4xx/5xx도 응답으로 기록 (304, 로그인 302, 중복 400 등)
+            return e.code, dict(e.headers.items()), e.read(), None
+
+    def cookie(self, name):
+        return next((c.value for c in self.cookies if c.name == name), None)
+
+    def close(self):
+        pass
+
+
+def serve_local():
+    """
+        현재 설정으로 127.0.0.1의 빈 포트에 스레드 WSGI 서버를 띄운다. 반환: (base_url, server)
+        끝나면 server.shutdown()
+    """
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler, allow_reuse_address=False)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+class Metrics:
+    """
+        엔드포인트별 응답 시간과 결과(ok / duplicate / 오류 종류)를 스레드 안전하게 모은다
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = defaultdict(list)
+        self.outcomes = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint, ms, outcome):
+        with self.lock:
+            self.timings[endpoint].append(ms)
+            self.outcomes[endpoint][outcome] += 1
+
+    def report(self, elapsed):
+        endpoints = {}
+        for endpoint in sorted(self.timings):
+            outcomes = dict(self.outcomes[endpoint])
+            count = len(self.timings[endpoint])
+            errors = sum(n for outcome, n in outcomes.items() if outcome not in ("ok", "duplicate"))
+            endpoints[endpoint] = {
+                **summarize(self.timings[endpoint]),
+                "throughput": round(count / elapsed, 2) if elapsed else 0.0,
+                "error_rate": round(errors / count, 4),
+                "outcomes": outcomes,
+            }
+        total = sum(len(v) for v in self.timings.values())
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "requests": total,
+            "throughput": round(total / elapsed, 2) if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def classify(status, body, exc=None):
+    """
+        응답 결과 분류: ok, duplicate(중복 추가 거절), IntegrityError 등 예외 이름, http_<status>
+    """
+    if exc is not None:
+        return type(exc).__name__
+    if status < 400:
+        return "ok"
+    if status == 400 and DUPLICATE_MESSAGE.encode("utf-8") in body:
+        return "duplicate"
+    # 루프백 서버의 500은 DEBUG 오류 페이지에서 예외 이름을 읽는다 (운영 설정이면 http_500)
+    if status >= 500:
+        match = _EXCEPTION_AT.search(body[:2000])
+        if match:
+            return match.group(1).decode()
+    return f"http_{status}"
+
+
+class PlanningSession:
+    """
+        한 사용자의 여행 계획 세션: 로그인 -> 그룹 목록/지도 -> 지도 폴링과 장소 추가/수정 반복
+    """
+
+    def __init__(self, transport, metrics, username, group_id, hot_places, rng, think_ms):
+        self.transport = transport
+        self.metrics = metrics
+        self.username = username
+        self.group_id = group_id
+        self.hot_places = hot_places
+        self.rng = rng
+        self.think_ms = think_ms
+        self.etag = None
+        self.link_ids = []
+        self.center = (37.5665, 126.9780)
+
+    def _call(self, endpoint, method, path, data=None, content_type=None, headers=None):
+        start = time.perf_counter()
+        try:
+            status, response_headers, body, exc = self.transport.request(method, path, data, content_type, headers)
+        except Exception as e:  # 연결 실패/타임아웃도 오류로 기록하고 세션은 계속
+            self.metrics.record(endpoint, (time.perf_counter() - start) * 1000, type(e).__name__)
+            return None, {}, b""
+        self.metrics.record(endpoint, (time.perf_counter() - start) * 1000, classify(status, body, exc))
+        return status, response_headers, body
+
+    def _post_json(self, endpoint, path, payload):
+        headers = {"X-CSRFToken": self.transport.cookie("csrftoken") or ""}
+        return self._call(endpoint, "POST", path, json.dumps(payload), "application/json", headers)
+
+    def login(self):
+        path = reverse("accounts:login")
+        self._call("login_page", "GET", path)
+        status, _, _ = self._call("login", "POST", path, {
+            "username": self.username,
+            "password": PASSWORD,
+            "csrfmiddlewaretoken": self.transport.cookie("csrftoken") or "",
+        })
+        return status == 302
+
+    def open_group(self):
+        self._call("group_place_list", "GET", reverse("trip:group_place_list", kwargs={"pk": self.group_id}))
+        self._call("group_map", "GET", reverse("trip:group_map", kwargs={"pk": self.group_id}))
+        self.poll()
+
+    def poll(self):
+        # 지도 화면처럼 ETag로 재검증 (바뀌지 않았으면 304)
+        headers = {"If-None-Match": self.etag} if self.etag else None
+        status, response_headers, body = self._call(
+            "group_places_json", "GET", reverse("trip:group_places_json", kwargs={"group_pk": self.group_id}),
+            headers=headers,
+        )
+        if status == 200:
+            self.etag = response_headers.get("ETag")
+            places = json.loads(body)["places"]
+            self.link_ids = [p["link_id"] for p in places]
+            if places:
+                self.center = (float(places[0]["lat"]), float(places[0]["lng"]))
+
+    def create(self):
+        # 절반은 멤버끼리 겹치는 인기 장소(중복 경합), 절반은 새 장소
+        rng = self.rng
+        if self.hot_places and rng.random() < 0.5:
+            place = dict(rng.choice(self.hot_places))
+        else:
+            place_id = NEW_PLACE_ID_BASE + rng.randrange(100_000_000)
+            place = {
+                "id": place_id,
+                "name": f"새 장소 {place_id}",
+                "address": "부하 테스트로 1",
+                "lat": round(self.center[0] + rng.gauss(0, 0.01), 6),
+                "lng": round(self.center[1] + rng.gauss(0, 0.01), 6),
+            }
+        self._post_json("place_create_api", reverse("trip:place_create_api", kwargs={"group_pk": self.group_id}), {
+            "place": place,
+            "place_type": rng.choice(PLACE_TYPES),
+            "description": "부하 테스트",
+        })
+
+    def update(self):
+        if not self.link_ids:
+            return self.poll()
+        rng = self.rng
+        link_id = rng.choice(self.link_ids)
+        self._post_json("place_link_update_api", reverse("trip:place_link_update_api", kwargs={"place_link_pk": link_id}), {
+            "nickname": f"수정 {rng.randrange(1000)}",
+            "place_type": rng.choice(PLACE_TYPES),
+            "description": "부하 테스트 수정",
+        })
+
+    def run(self, duration, iterations):
+        actions = list(ACTION_WEIGHTS)
+        weights = list(ACTION_WEIGHTS.values())
+        try:
+            if not self.login():
+                return
+            self.open_group()
+            # 로그인(비밀번호 해시)은 세션 시작에 한 번뿐이라 duration은 그 뒤부터 잰다
+            deadline = time.monotonic() + duration
+            done = 0
+            while time.monotonic() < deadline and (iterations is None or done < iterations):
+                getattr(self, self.rng.choices(actions, weights)[0])()
+                done += 1
+                if self.think_ms:
+                    time.sleep(self.rng.expovariate(1000 / self.think_ms))
+        finally:
+            self.transport.close()
+
+
+def session_targets(users: int):
+    """
+        (username, group_id) 목록: 장소가 많은 합성 그룹의 멤버부터 users명
+        같은 그룹 멤버가 여럿 들어가야 동시 추가/수정 경합이 생긴다.
+    """
+    return list(
+        GroupMember.objects
+        .filter(group__name__startswith=GROUP_PREFIX)
+        .order_by("-group__place_count", "group_id", "user_id")
+        .values_list("user__username", "group_id")[:users]
+    )
+
+
+def hot_places(group_ids):
+    # 그룹마다 아직 그룹에 없는 합성 장소 몇 개 (같은 그룹 멤버들이 같은 목록을 쓴다)
+    result = {}
+    for group_id in group_ids:
+        result[group_id] = list(
+            Place.objects
+            .filter(pk__gte=PLACE_ID_BASE, pk__lt=NEW_PLACE_ID_BASE)
+            .exclude(travel_group_links__travel_group_id=group_id)
+            .order_by("pk")
+            .values("id", "name", "address", "lat", "lng")[:HOT_PLACES_PER_GROUP]
+        )
+        for place in result[group_id]:
+            place["lat"], place["lng"] = float(place["lat"]), float(place["lng"])
+    return result
+
+
+def run_load(users: int, duration: float, iterations=None, think_ms: float = 0, base_url=None, seed: int = 0,
+             workers=None):
+    """
+        users명의 세션을 동시에 돌리고 엔드포인트별 처리량/지연 백분위/오류 비율을 반환
+        base_url이 없으면 프로세스 안 Client, 있으면 그 주소로 HTTP 요청
+        workers: 동시에 돌릴 세션 수 (기본: 전부, 1이면 한 세션씩 차례로)
+    """
+    targets = session_targets(users)
+    hot = hot_places({group_id for _, group_id in targets})
+    metrics = Metrics()
+    rng = random.Random(seed)
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, workers or len(targets))) as executor:
+        futures = [
+            executor.submit(
+                PlanningSession(
+                    HttpTransport(base_url) if base_url else ClientTransport(),
+                    metrics, username, group_id, hot[group_id], random.Random(rng.random()), think_ms,
+                ).run,
+                duration, iterations,
+            )
+            for username, group_id in targets
+        ]
+        for future in futures:
+            future.result()
+
+    report = metrics.report(time.monotonic() - start)
+    report["sessions"] = len(targets)
+    report["groups"] = len(hot)
+    return report
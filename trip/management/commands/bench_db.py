@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from trip import dbpool
+from trip.benchmarking import summarize
+
+
+class Command(BaseCommand):
+    help = "요청 한 번의 DB 비용(연결 정리 + SELECT 1)을 현재 설정과 요청마다 새로 접속하는 경우로 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--database", default="default")
+
+    def _run(self, connection, count):
+        # request_started/finished 시그널이 Django의 연결 정리(close_old_connections)를 실행한다
+        opened = dbpool.pool_stats(connection.alias)["connections_opened"]
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            request_started.send(sender=self.__class__)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            request_finished.send(sender=self.__class__)
+            timings.append((time.perf_counter() - start) * 1000)
+        result = summarize(timings)
+        result["connections_opened"] = dbpool.pool_stats(connection.alias)["connections_opened"] - opened
+        return result
+
+    def _report(self, name, result):
+        self.stdout.write(
+            f"{name:<14} mean {result['mean']:7.3f} ms  p50 {result['p50']:7.3f}  "
+            f"p95 {result['p95']:7.3f}  p99 {result['p99']:7.3f}  new connections {result['connections_opened']}"
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        count = options["requests"]
+        mode = dbpool.pool_stats(connection.alias)["mode"]
+
+        self._report(mode, self._run(connection, count))
+
+        # 풀이 아닌 영구 연결이면 CONN_MAX_AGE=0(요청마다 접속)과 비교
+        if mode == "persistent":
+            conn_max_age = connection.settings_dict["CONN_MAX_AGE"]
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = 0
+            try:
+                self._report("per_request", self._run(connection, count))
+            finally:
+                connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+                connection.close()
+
+        if mode == "pool":
+            stats = dbpool.pool_stats(connection.alias)
+            self.stdout.write(
+                f"pool in_use {stats['in_use']} idle {stats['idle']} wait {stats['wait_ms']} ms "
+                f"checkout failures {stats['checkout_failures']}"
+            )
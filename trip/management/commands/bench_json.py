@@ -0,0 +1,61 @@
+import json
+import random
+import timeit
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from trip import renderers
+from trip.api import _columnar_places
+
+
+def _payload(count: int, seed: int = 0):
+    # group_places_json과 같은 모양의 장소 목록 (위경도는 DB처럼 Decimal)
+    rng = random.Random(seed)
+    return {
+        "places": [
+            {
+                "link_id": i,
+                "place_id": 10_000_000 + i,
+                "name": f"장소 {i}",
+                "address": f"서울 중구 세종대로 {i}",
+                "lat": Decimal(f"{37.4 + rng.random() * 0.3:.6f}"),
+                "lng": Decimal(f"{126.8 + rng.random() * 0.4:.6f}"),
+                "place_type": rng.choice(["CAFE", "RESTAURANT", "PARK", "OTHER"]),
+                "description": "",
+                "day": None,
+            }
+            for i in range(count)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "장소 JSON 직렬화 속도/크기를 비교합니다 (DjangoJSONEncoder vs trip.renderers.dumps vs 열 형식)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--places", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        payload = _payload(options["places"])
+        repeat = options["repeat"]
+        # values_list(*PLACE_JSON_COLUMNS)와 같은 순서의 행
+        rows = [
+            (p["link_id"], "", p["place_type"], p["description"], p["place_id"],
+             p["name"], p["address"], p["lat"], p["lng"], p["day"])
+            for p in payload["places"]
+        ]
+
+        cases = [
+            ("DjangoJSONEncoder", lambda: json.dumps(payload, cls=DjangoJSONEncoder).encode("utf-8")),
+            (f"dumps ({'orjson' if renderers.orjson else 'stdlib'})", lambda: renderers.dumps(payload)),
+            ("columnar + dumps", lambda: renderers.dumps(_columnar_places(rows))),
+        ]
+        baseline = None
+        for name, func in cases:
+            size = len(func())
+            best = min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+            baseline = baseline or best
+            self.stdout.write(f"{name:<24} {best:8.2f} ms  {size / 1024:8.1f} KiB  x{baseline / best:.1f}")
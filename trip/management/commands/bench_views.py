@@ -0,0 +1,125 @@
+import json
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from trip import membership, synthetic
+from trip.benchmarking import environment, local_host, summarize
+from trip.models import Place, Recommendation, TravelGroup, TravelGroupPlace
+from trip.sqlstats import record_queries
+
+
+def _cases(group, link_ids):
+    """
+        (이름, URL) 목록. 큰 합성 그룹 하나를 대상으로 화면/JSON/DRF API를 고루 잰다
+    """
+    pk = group.pk
+    city = group.name[len(synthetic.GROUP_PREFIX):].split()[0]
+    lat = (group.bbox_south + group.bbox_north) / 2
+    lng = (group.bbox_west + group.bbox_east) / 2
+    places_json = reverse("trip:group_places_json", kwargs={"group_pk": pk})
+    # 그룹 범위의 가운데 1/4 정도를 지도 화면으로
+    sw = f"{(group.bbox_south + lat) / 2},{(group.bbox_west + lng) / 2}"
+    ne = f"{(group.bbox_north + lat) / 2},{(group.bbox_east + lng) / 2}"
+    return [
+        ("group_place_list", reverse("trip:group_place_list", kwargs={"pk": pk})),
+        ("group_map", reverse("trip:group_map", kwargs={"pk": pk})),
+        ("group_places_json", places_json),
+        ("group_places_json_columnar", f"{places_json}?format=columnar"),
+        ("group_places_json_viewport", f"{places_json}?sw={sw}&ne={ne}"),
+        ("group_places_json_page", f"{places_json}?limit=100"),
+        ("group_place_clusters_json", reverse("trip:group_place_clusters_json", kwargs={"group_pk": pk}) + "?level=7"),
+        ("group_place_summary_json", reverse("trip:group_place_summary_json", kwargs={"group_pk": pk})),
+        ("group_places_nearby_json", reverse("trip:group_places_nearby_json", kwargs={"group_pk": pk}) + f"?lat={lat}&lng={lng}&k=10"),
+        ("group_place_top_json", reverse("trip:group_place_top_json", kwargs={"group_pk": pk}) + "?k=20"),
+        ("group_place_route_json", reverse("trip:group_place_route_json", kwargs={"group_pk": pk})
+         + "?links=" + ",".join(map(str, link_ids)) + "&budget_ms=50"),
+        ("place_autocomplete_api", reverse("trip:place_autocomplete_api") + "?" + urlencode({"q": f"{city} 장소"})),
+        ("api_group_list", reverse("trip:api-group-list")),
+        ("api_group_place_list", reverse("trip:api-group-place-list", kwargs={"group_pk": pk})),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "합성 데이터(generate_data)로 주요 화면/API 응답 시간을 재고 결과를 JSON으로 남깁니다. "
+        "요청은 테스트 Client로 프로세스 안에서 보내므로 네트워크를 쓰지 않습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--only", nargs="*", help="이 이름의 항목만 잰다")
+        parser.add_argument("--output", help="결과 JSON 파일 경로 (커밋 간 비교용)")
+        parser.add_argument("--compare", help="이전 결과 JSON과 p50을 비교")
+
+    def _measure(self, client, url, repeat, warmup):
+        for _ in range(warmup):
+            client.get(url)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with record_queries() as recorder:
+                response = client.get(url)
+                body = b"".join(response) if response.streaming else response.content
+            timings.append((time.perf_counter() - start) * 1000)
+        result = summarize(timings)
+        result.update(status=response.status_code, bytes=len(body), queries=recorder.count)
+        return result
+
+    def handle(self, *args, **options):
+        target = synthetic.benchmark_target()
+        if target is None:
+            raise CommandError("합성 데이터가 없습니다. 먼저 manage.py generate_data를 실행하세요.")
+        group, user = target
+
+        link_ids = list(
+            TravelGroupPlace.objects.filter(travel_group=group).order_by("id").values_list("id", flat=True)[:50]
+        )
+        client = Client(HTTP_HOST=local_host())
+        client.force_login(user)
+        membership.clear_cache()
+
+        results = {}
+        for name, url in _cases(group, link_ids):
+            if options["only"] and name not in options["only"]:
+                continue
+            result = results[name] = self._measure(client, url, options["repeat"], options["warmup"])
+            line = (
+                f"{name:<28} p50 {result['p50']:8.2f} ms  p95 {result['p95']:8.2f}  p99 {result['p99']:8.2f}  "
+                f"{result['queries']:3d} queries  {result['bytes'] / 1024:9.1f} KiB"
+            )
+            self.stdout.write(line if result["status"] == 200 else self.style.WARNING(f"{line}  HTTP {result['status']}"))
+
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "environment": environment(),
+            "dataset": {
+                "users": get_user_model().objects.count(),
+                "groups": TravelGroup.objects.count(),
+                "places": Place.objects.count(),
+                "group_places": TravelGroupPlace.objects.count(),
+                "recommendations": Recommendation.objects.count(),
+                "target_group_places": group.place_count,
+            },
+            "repeat": options["repeat"],
+            "results": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"results written to {options['output']}")
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as f:
+                previous = json.load(f)["results"]
+            self.stdout.write(f"p50 compared with {options['compare']} (ratio < 1 is faster)")
+            for name, result in results.items():
+                if name in previous and previous[name].get("p50"):
+                    before = previous[name]["p50"]
+                    self.stdout.write(f"{name:<28} {before:8.2f} -> {result['p50']:8.2f} ms  x{result['p50'] / before:.2f}")
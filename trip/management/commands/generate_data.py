@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from trip import synthetic
+
+
+class Command(BaseCommand):
+    help = "벤치마크용 합성 데이터(사용자/그룹/멤버십/장소/그룹 장소/추천)를 만듭니다. 네트워크를 쓰지 않습니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(synthetic.SCALES), default="small",
+                            help="기본 규모 (small 1천 / medium 10만 / large 100만 장소)")
+        for name in ("users", "groups", "places", "places-per-group", "members-per-group", "big-group"):
+            parser.add_argument(f"--{name}", type=int, help="규모 기본값 덮어쓰기")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=synthetic.DEFAULT_BATCH_SIZE)
+        parser.add_argument("--flush", action="store_true", help="이전에 만든 합성 데이터를 지우고 다시 만든다")
+
+    def handle(self, *args, **options):
+        params = dict(synthetic.SCALES[options["scale"]])
+        for key in params:
+            if options[key] is not None:
+                params[key] = options[key]
+        if min(params.values()) < 0:
+            raise CommandError("규모 값은 0 이상이어야 합니다.")
+
+        if synthetic.synthetic_data_exists():
+            if not options["flush"]:
+                raise CommandError("합성 데이터가 이미 있습니다. 다시 만들려면 --flush를 주세요.")
+            self.stdout.write("deleting previous synthetic data")
+            synthetic.delete_synthetic_data()
+
+        counts = synthetic.generate(
+            **params, seed=options["seed"], batch_size=options["batch_size"], log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            "Generated " + ", ".join(f"{count} {name}" for name, count in counts.items())
+        ))
@@ -0,0 +1,65 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trip import loadgen
+from trip.benchmarking import environment
+
+
+class Command(BaseCommand):
+    help = (
+        "합성 데이터(generate_data)의 그룹 멤버로 로그인한 가상 사용자들이 동시에 그룹 화면을 열고 "
+        "지도 JSON을 폴링하며 장소를 추가/수정합니다. 엔드포인트별 처리량, p50/p95/p99, 오류 비율을 출력합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20, help="동시 세션 수")
+        parser.add_argument("--duration", type=float, default=30, help="초")
+        parser.add_argument("--iterations", type=int, help="세션마다 최대 동작 수 (없으면 duration까지)")
+        parser.add_argument("--think-ms", type=float, default=200, help="동작 사이 평균 대기 시간 (지수분포)")
+        parser.add_argument("--seed", type=int, default=0)
+        target = parser.add_mutually_exclusive_group()
+        target.add_argument("--url", help="이미 떠 있는 서버 주소 (예: http://127.0.0.1:8000)")
+        target.add_argument("--serve", action="store_true", help="이 프로세스에서 루프백 WSGI 서버를 띄워 HTTP로 요청")
+        parser.add_argument("--output", help="결과 JSON 파일 경로")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["duration"] <= 0:
+            raise CommandError("--users와 --duration은 양수여야 합니다.")
+        if not loadgen.session_targets(1):
+            raise CommandError("합성 데이터가 없습니다. 먼저 manage.py generate_data를 실행하세요.")
+
+        server, base_url = None, options["url"]
+        if options["serve"]:
+            base_url, server = loadgen.serve_local()
+        self.stdout.write(f"target: {base_url or 'in-process client'}")
+        try:
+            report = loadgen.run_load(
+                options["users"], options["duration"], options["iterations"],
+                options["think_ms"], base_url, options["seed"],
+            )
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+        self.stdout.write(
+            f"{report['sessions']} sessions in {report['groups']} groups, {report['requests']} requests "
+            f"in {report['elapsed_s']:.1f} s ({report['throughput']:.1f} req/s)"
+        )
+        for name, stats in report["endpoints"].items():
+            errors = {k: v for k, v in stats["outcomes"].items() if k != "ok"}
+            line = (
+                f"{name:<22} {stats['count']:6d} req {stats['throughput']:7.1f}/s  p50 {stats['p50']:8.2f} ms  "
+                f"p95 {stats['p95']:8.2f}  p99 {stats['p99']:8.2f}  errors {stats['error_rate']:6.2%}"
+            )
+            if errors:
+                line += "  " + ", ".join(f"{k}={v}" for k, v in sorted(errors.items()))
+            self.stdout.write(line if not stats["error_rate"] else self.style.WARNING(line))
+
+        if options["output"]:
+            report["environment"] = environment()
+            report["options"] = {k: options[k] for k in ("users", "duration", "iterations", "think_ms", "seed")}
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"results written to {options['output']}")
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from trip.services import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "저장된 멤버 수 / 추천 수 카운터(그룹별 추천 순위 포함)를 실제 행 수와 다시 맞춥니다."
+
+    def handle(self, *args, **options):
+        for model_name, count in reconcile_counters().items():
+            self.stdout.write(f"{model_name}: {count} row(s) fixed")
+        self.stdout.write(self.style.SUCCESS("Counters reconciled."))
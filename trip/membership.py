@@ -0,0 +1,99 @@
+import threading
+
+from django.db import transaction
+
+from .caching import LRUTTLCache, MISSING
+from .models import GroupMember
+
+ADMIN = "admin"
+MEMBER = "member"
+
+# (user_id, group_id) -> ADMIN / MEMBER / None(멤버 아님)
+# 같은 프로세스 안에서는 GroupMember 시그널로 바로(그리고 커밋 후 한 번 더) 무효화되고,
+# 다른 프로세스의 변경은 TTL이 지나면 반영된다.
+_role_cache = LRUTTLCache(maxsize=10000, ttl=60)
+
+# 무효화할 때마다 오른다. 조회 중에 무효화가 끼어들면 읽은 (옛) 역할을 캐시에 넣지 않는다
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _request_memo(request):
+    if request is None:
+        return None
+    if not hasattr(request, "_group_roles"):
+        request._group_roles = {}
+    return request._group_roles
+
+
+def role_from_is_admin(is_admin):
+    # GroupMember.is_admin 값(행이 없으면 None) -> ADMIN / MEMBER / None
+    return None if is_admin is None else (ADMIN if is_admin else MEMBER)
+
+
+def get_role(user, group_id: int, request=None):
+    """
+        그룹에서 유저의 역할(ADMIN / MEMBER)을 반환, 멤버가 아니면 None
+        request를 넘기면 같은 요청 안에서는 다시 조회하지 않는다.
+    """
+    if not user.is_authenticated:
+        return None
+
+    key = (user.pk, group_id)
+    memo = _request_memo(request)
+    if memo is not None and key in memo:
+        return memo[key]
+
+    role = _role_cache.get(key)
+    if role is MISSING:
+        generation = _generation
+        is_admin = (
+            GroupMember.objects
+            .filter(group_id=group_id, user_id=user.pk)
+            .values_list("is_admin", flat=True)
+            .first()
+        )
+        role = role_from_is_admin(is_admin)
+        with _generation_lock:
+            if generation == _generation:
+                _role_cache.set(key, role)
+
+    if memo is not None:
+        memo[key] = role
+    return role
+
+
+def remember(user, group_id: int, role, request=None) -> None:
+    """
+        다른 쿼리에서 함께 읽은 역할을 요청 메모에 넣는다
+        이후 같은 요청의 get_role은 다시 조회하지 않는다. 프로세스 캐시에는 넣지 않는다
+        (읽은 뒤에 들어온 무효화를 옛 값으로 덮어쓰지 않도록).
+    """
+    memo = _request_memo(request)
+    if memo is not None and user.is_authenticated:
+        memo[(user.pk, group_id)] = role
+
+
+def is_member(user, group_id: int, request=None) -> bool:
+    return get_role(user, group_id, request) is not None
+
+
+def _forget(key) -> None:
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        _role_cache.delete(key)
+
+
+def invalidate(user_id: int, group_id: int) -> None:
+    """
+        역할 캐시에서 지운다. 쓰는 트랜잭션 안에서는 다른 요청이 아직 커밋 전의 옛 행을 읽어
+        다시 캐시할 수 있으므로 커밋 뒤에 한 번 더 지운다.
+    """
+    key = (user_id, group_id)
+    _forget(key)
+    transaction.on_commit(lambda: _forget(key))
+
+
+def clear_cache() -> None:
+    _role_cache.clear()
@@ -0,0 +1,130 @@
+import logging
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+from .sqlstats import record_queries
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip만
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+# 압축할 응답 타입 (이미지/폰트 등 이미 압축된 형식은 제외)
+COMPRESSIBLE_TYPES = {
+    "text/html", "text/plain", "text/css", "text/javascript",
+    "application/json", "application/javascript",
+}
+# brotli는 gzip처럼 BREACH 완화용 무작위 패딩(GZipMiddleware.max_random_bytes)을 넣을 자리가 없다.
+# CSRF 토큰이 실릴 수 있는 HTML/텍스트는 패딩이 들어가는 gzip으로만 보낸다.
+BROTLI_TYPES = {"application/json", "application/javascript", "text/javascript", "text/css"}
+DEFAULT_MIN_SIZE = 1024
+BROTLI_QUALITY = 5  # 동적 응답용: 압축률보다 속도 쪽
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = _media_type(content_type)
+    return media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+
+def _allows_brotli(content_type: str) -> bool:
+    media_type = _media_type(content_type)
+    return media_type in BROTLI_TYPES or media_type.endswith("+json")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+        JSON/HTML 응답을 압축: JSON/CSS/JS는 brotli(설치된 경우), 그 밖(HTML 등)은 무작위 패딩을 넣는 gzip
+        COMPRESSION_MIN_SIZE(기본 1KB)보다 작은 응답과 압축 대상이 아닌 타입은 그대로 둔다.
+        MIDDLEWARE에서 본문을 읽거나 바꾸는 미들웨어보다 앞(위)에 둔다.
+    """
+
+    def process_response(self, request, response):
+        if not _is_compressible(response.get("Content-Type", "")):
+            return response
+        min_size = getattr(settings, "COMPRESSION_MIN_SIZE", DEFAULT_MIN_SIZE)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if (
+            brotli is None
+            or response.streaming
+            or not _allows_brotli(response.get("Content-Type", ""))
+            or not re_accepts_brotli.search(accept_encoding)
+        ):
+            return super().process_response(request, response)
+
+        if response.has_header("Content-Encoding"):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+
+        # GZipMiddleware와 같이 강한 ETag는 약한 ETag로
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
+
+
+sql_logger = logging.getLogger("trip.sql")
+
+# 같은 모양의 쿼리가 한 요청에서 이 횟수 이상이면 N+1로 보고 경고
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+
+
+class QueryStatsMiddleware:
+    """
+        요청마다 SQL 쿼리 수, 총 시간, 반복된 쿼리 모양(N+1 후보)을 기록
+        DEBUG: X-SQL-Queries / X-SQL-Time-Ms / X-SQL-Repeated 응답 헤더
+        운영: trip.sql 로거에 구조화된 로그 (N+1이면 WARNING)
+        스트리밍 응답은 본문을 만들면서 실행되는 쿼리가 빠진다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        threshold = getattr(settings, "SQL_N_PLUS_ONE_THRESHOLD", DEFAULT_N_PLUS_ONE_THRESHOLD)
+        repeated = recorder.repeated(min_count=threshold)
+        time_ms = round(recorder.total_ms, 2)
+
+        if settings.DEBUG:
+            response.headers["X-SQL-Queries"] = str(recorder.count)
+            response.headers["X-SQL-Time-Ms"] = str(time_ms)
+            if repeated:
+                response.headers["X-SQL-Repeated"] = "; ".join(f"{count}x {shape[:120]}" for shape, count in repeated[:3])
+        else:
+            stats = {
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": recorder.count,
+                "time_ms": time_ms,
+                "repeated": [{"sql": shape, "count": count} for shape, count in repeated],
+            }
+            sql_logger.log(
+                logging.WARNING if repeated else logging.INFO,
+                "%s %s: %d queries, %.2f ms%s",
+                request.method, request.path, recorder.count, time_ms,
+                f", N+1 suspected ({repeated[0][1]}x)" if repeated else "",
+                extra={"sql_stats": stats},
+            )
+        return response
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+from trip.geo import geocell
+
+
+def fill_geocell(apps, schema_editor):
+    Place = apps.get_model("trip", "Place")
+    places = list(Place.objects.only("id", "lat", "lng"))
+    for place in places:
+        place.geocell = geocell(place.lat, place.lng)
+    Place.objects.bulk_update(places, ["geocell"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trip", "0002_remove_place_trip_place_name_dfec56_idx_place_phone_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="place",
+            name="geocell",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_geocell, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="place",
+            index=models.Index(
+                fields=["geocell", "lat", "lng"], name="trip_place_geocell_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:11
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def fill_place_summary(apps, schema_editor):
+    TravelGroup = apps.get_model("trip", "TravelGroup")
+    for group in TravelGroup.objects.all():
+        summary = group.place_links.aggregate(
+            place_count=Count("id"),
+            bbox_south=Min("place__lat"),
+            bbox_west=Min("place__lng"),
+            bbox_north=Max("place__lat"),
+            bbox_east=Max("place__lng"),
+        )
+        TravelGroup.objects.filter(pk=group.pk).update(**summary)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trip", "0003_place_geocell"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="travelgroup",
+            name="bbox_east",
+            field=models.DecimalField(decimal_places=6, editable=False, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name="travelgroup",
+            name="bbox_north",
+            field=models.DecimalField(decimal_places=6, editable=False, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name="travelgroup",
+            name="bbox_south",
+            field=models.DecimalField(decimal_places=6, editable=False, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name="travelgroup",
+            name="bbox_west",
+            field=models.DecimalField(decimal_places=6, editable=False, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name="travelgroup",
+            name="place_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_place_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trip", "0004_travelgroup_place_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="travelgroup",
+            name="places_modified_at",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="travelgroup",
+            name="places_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
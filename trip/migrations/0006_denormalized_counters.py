@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    TravelGroup = apps.get_model("trip", "TravelGroup")
+    GroupMember = apps.get_model("trip", "GroupMember")
+    Place = apps.get_model("trip", "Place")
+    Recommendation = apps.get_model("trip", "Recommendation")
+
+    members = (
+        GroupMember.objects.filter(group=OuterRef("pk"))
+        .order_by().values("group").annotate(c=Count("id")).values("c")
+    )
+    TravelGroup.objects.update(member_count=Coalesce(Subquery(members), 0))
+
+    recommendations = (
+        Recommendation.objects.filter(place=OuterRef("pk"))
+        .order_by().values("place").annotate(c=Count("id")).values("c")
+    )
+    Place.objects.update(recommendations_count=Coalesce(Subquery(recommendations), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trip", "0005_travelgroup_places_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="place",
+            name="recommendations_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="travelgroup",
+            name="member_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:20
+
+from django.db import migrations
+
+# PostgreSQL: pg_trgm GIN 인덱스. Django의 icontains는 UPPER(col) LIKE UPPER(%s)로
+# 컴파일되므로 같은 식(UPPER)에 인덱스를 건다.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS trip_place_name_trgm ON trip_place USING gin (UPPER(name::text) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS trip_place_address_trgm ON trip_place USING gin (UPPER(address::text) gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS trip_place_address_trgm",
+    "DROP INDEX IF EXISTS trip_place_name_trgm",
+]
+
+# SQLite: trip_place를 원본으로 하는 FTS5 trigram 테이블 + 동기화 트리거
+# (SQLite에서 trip_place를 재생성하는 마이그레이션 뒤에는 트리거를 다시 만들어야 한다)
+SQLITE_FORWARD = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS trip_place_fts USING fts5(
+        name, address, content='trip_place', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS trip_place_fts_ai AFTER INSERT ON trip_place BEGIN
+        INSERT INTO trip_place_fts(rowid, name, address) VALUES (new.id, new.name, new.address);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trip_place_fts_ad AFTER DELETE ON trip_place BEGIN
+        INSERT INTO trip_place_fts(trip_place_fts, rowid, name, address)
+        VALUES ('delete', old.id, old.name, old.address);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trip_place_fts_au AFTER UPDATE OF name, address ON trip_place BEGIN
+        INSERT INTO trip_place_fts(trip_place_fts, rowid, name, address)
+        VALUES ('delete', old.id, old.name, old.address);
+        INSERT INTO trip_place_fts(rowid, name, address) VALUES (new.id, new.name, new.address);
+    END""",
+    "INSERT INTO trip_place_fts(trip_place_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS trip_place_fts_au",
+    "DROP TRIGGER IF EXISTS trip_place_fts_ad",
+    "DROP TRIGGER IF EXISTS trip_place_fts_ai",
+    "DROP TABLE IF EXISTS trip_place_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trip", "0006_denormalized_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trip", "0007_place_text_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="travelgroupplace",
+            name="day",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:27
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_recommendations_count(apps, schema_editor):
+    Place = apps.get_model("trip", "Place")
+    TravelGroupPlace = apps.get_model("trip", "TravelGroupPlace")
+
+    place_count = Place.objects.filter(pk=OuterRef("place_id")).values("recommendations_count")
+    TravelGroupPlace.objects.update(recommendations_count=Subquery(place_count))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trip", "0008_travelgroupplace_day"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="travelgroupplace",
+            name="recommendations_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_recommendations_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="travelgroupplace",
+            index=models.Index(fields=["travel_group", "-recommendations_count", "id"], name="trip_group_place_top_idx"),
+        ),
+    ]
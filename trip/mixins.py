@@ -1,6 +1,8 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import Http404
 
+from . import membership
+
 class GroupMemberRequiredMixin(LoginRequiredMixin):
     group_lookup_kwarg = 'group_pk'  # 기본
     group_attr = 'group'             # 객체에서 group 찾는 필드 이름
@@ -16,6 +18,6 @@ class GroupMemberRequiredMixin(LoginRequiredMixin):
 
     def dispatch(self, request, *args, **kwargs):
         group = self.get_group()
-        if not group.members.filter(id=request.user.id).exists():
+        if not membership.is_member(request.user, group.pk, request):
             raise Http404("그룹 멤버만 접근할 수 있습니다.")
         return super().dispatch(request, *args, **kwargs)
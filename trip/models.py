@@ -1,5 +1,8 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
+
+from .geo import geocell, geocell_ranges
 
 
 class TravelGroup(models.Model):
@@ -34,13 +37,23 @@ class TravelGroup(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # GroupMember 생성/삭제 시 F()로 갱신되는 멤버 수 (trip.services 참고)
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # 지도 초기 화면용 장소 요약 (장소가 바뀔 때마다 trip.services에서 갱신)
+    place_count = models.PositiveIntegerField(default=0, editable=False)
+    bbox_south = models.DecimalField(max_digits=9, decimal_places=6, null=True, editable=False)
+    bbox_west = models.DecimalField(max_digits=9, decimal_places=6, null=True, editable=False)
+    bbox_north = models.DecimalField(max_digits=9, decimal_places=6, null=True, editable=False)
+    bbox_east = models.DecimalField(max_digits=9, decimal_places=6, null=True, editable=False)
+
+    # 장소 링크가 바뀔 때마다 1씩 증가 (ETag / Last-Modified 용)
+    places_version = models.PositiveBigIntegerField(default=0, editable=False)
+    places_modified_at = models.DateTimeField(null=True, editable=False)
+
     def __str__(self) -> str:
         return self.name
 
-    @property
-    def member_count(self) -> int:
-        return self.members.count()
-
 
 class GroupMember(models.Model):
     group = models.ForeignKey(
@@ -83,6 +96,12 @@ class Place(models.Model):
     phone = models.CharField(max_length=15, blank=True)
     url = models.URLField(blank=True)
 
+    # Recommendation 생성/삭제 시 F()로 갱신되는 추천 수 (trip.services 참고)
+    recommendations_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # 뷰포트 검색용 격자 셀 번호 (lat/lng에서 자동 계산, trip.geo 참고)
+    geocell = models.IntegerField(default=0, editable=False)
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -93,11 +112,28 @@ class Place(models.Model):
         indexes = [
             models.Index(fields=['name']),
             models.Index(fields=['id']),
+            models.Index(fields=['geocell', 'lat', 'lng'], name='trip_place_geocell_idx'),
         ]
 
-    @property
-    def recommendations_count(self) -> int:
-        return self.recommendations.count()
+    def save(self, *args, **kwargs):
+        self.geocell = geocell(self.lat, self.lng)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'lat', 'lng'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geocell'}
+        super().save(*args, **kwargs)
+
+
+class TravelGroupPlaceQuerySet(models.QuerySet):
+    def in_viewport(self, south, west, north, east):
+        # 격자 셀 인덱스로 후보를 좁힌 뒤 실제 위경도로 한 번 더 거른다
+        cells = Q()
+        for start, end in geocell_ranges(south, west, north, east):
+            cells |= Q(place__geocell__range=(start, end))
+        return self.filter(
+            cells,
+            place__lat__range=(south, north),
+            place__lng__range=(west, east),
+        )
 
 
 class TravelGroupPlace(models.Model):
@@ -142,6 +178,14 @@ class TravelGroupPlace(models.Model):
     nickname = models.CharField(max_length=100, blank=True)
     description = models.TextField(blank=True)
 
+    # 일정 자동 분배 결과 (1일차부터, 분배 전이면 NULL)
+    day = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    # place.recommendations_count 사본 (그룹별 추천 순위를 인덱스만으로 읽기 위해)
+    recommendations_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = TravelGroupPlaceQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -149,6 +193,19 @@ class TravelGroupPlace(models.Model):
                 name='uq_membership_group_place',
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=['travel_group', '-recommendations_count', 'id'],
+                name='trip_group_place_top_idx',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # 저장 시그널에서 그룹/장소가 바뀌었는지(이동) 알 수 있도록 읽어 온 값을 기억
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_keys = (instance.__dict__.get('travel_group_id'), instance.__dict__.get('place_id'))
+        return instance
 
     def __str__(self) -> str:
         return f'[{self.travel_group.name}] {self.place.name}'
@@ -0,0 +1,95 @@
+import heapq
+import math
+
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, Cos, Radians, Sin
+
+from .geo import KM_PER_DEGREE_LAT, bbox_around, haversine_km
+from .models import TravelGroup, TravelGroupPlace
+
+MIN_RADIUS_KM = 0.2
+RADIUS_GROWTH = 4
+# 반경을 이만큼 넓혀도 k개가 모이지 않으면 경계 없이 거리순으로 한 번에 읽는다
+MAX_RADIUS_STEPS = 3
+MAX_K = 100
+
+NEARBY_COLUMNS = (
+    "id", "nickname", "place_type", "place_id",
+    "place__name", "place__address", "place__lat", "place__lng",
+)
+
+
+def _initial_radius(summary, lat, lng, k) -> float:
+    """
+        저장된 그룹 요약(장소 수, bbox)으로 고른 첫 반경(km)
+        장소가 bbox에 고르게 퍼져 있다고 보고 k개가 들어올 원의 반지름에
+        기준점에서 bbox까지의 거리를 더한다.
+    """
+    count, south, west, north, east = (float(v) for v in summary)
+    height = (north - south) * KM_PER_DEGREE_LAT
+    width = (east - west) * KM_PER_DEGREE_LAT * math.cos(math.radians((north + south) / 2))
+    radius = math.sqrt(max(height * width, MIN_RADIUS_KM ** 2) * k / count / math.pi)
+    gap = haversine_km(lat, lng, min(max(float(lat), south), north), min(max(float(lng), west), east))
+    return max(radius, MIN_RADIUS_KM) + gap
+
+
+def _ordered_nearest(links, lat, lng, k):
+    # 구면 코사인 법칙의 내적(클수록 가깝다)은 haversine 거리와 순서가 같으므로 DB에서 정렬해 k개만 읽는다
+    lat_r, lng_r = math.radians(float(lat)), math.radians(float(lng))
+    place_lat = Radians(Cast("place__lat", FloatField()))
+    place_lng = Radians(Cast("place__lng", FloatField()))
+    closeness = Sin(place_lat) * math.sin(lat_r) + Cos(place_lat) * math.cos(lat_r) * Cos(place_lng - lng_r)
+    rows = (
+        links
+        .annotate(closeness=closeness)
+        .order_by(F("closeness").desc(), "id")
+        .values_list(*NEARBY_COLUMNS)[:k]
+    )
+    return sorted(
+        ((haversine_km(lat, lng, row[6], row[7]), row) for row in rows),
+        key=lambda item: (item[0], item[1][0]),
+    )
+
+
+def nearest_group_places(group_id: int, lat, lng, k: int, exclude_link_id=None):
+    """
+        그룹 장소 중 (lat, lng)에서 가까운 k개를 [(거리 km, row), ...]로 반환
+        그룹 요약으로 고른 반경의 경계 상자만 인덱스(geocell)로 읽어 정확한 거리로 정렬하고,
+        모자라면 반경을 넓힌다(최대 MAX_RADIUS_STEPS번). 그래도 모자라거나 그룹 전체가
+        필요하면 경계 없이 거리순 쿼리 한 번으로 끝낸다.
+    """
+    summary = (
+        TravelGroup.objects
+        .filter(pk=group_id)
+        .values_list("place_count", "bbox_south", "bbox_west", "bbox_north", "bbox_east")
+        .first()
+    )
+    if not summary or not summary[0]:
+        return []
+
+    links = TravelGroupPlace.objects.filter(travel_group_id=group_id)
+    available = summary[0]
+    if exclude_link_id is not None:
+        links = links.exclude(pk=exclude_link_id)
+        available -= 1
+    k = min(k, available)
+    if k <= 0:
+        return []
+
+    if k < available:
+        radius = _initial_radius(summary, lat, lng, k)
+        for _ in range(MAX_RADIUS_STEPS):
+            bbox = bbox_around(lat, lng, radius)
+            rows = links.in_viewport(*bbox).values_list(*NEARBY_COLUMNS)
+
+            # 경계 상자의 모서리 쪽은 반경 밖일 수 있으므로 원 안의 것만 확정
+            within = []
+            for row in rows:
+                distance = haversine_km(lat, lng, row[6], row[7])
+                if distance <= radius:
+                    within.append((distance, row))
+            if len(within) >= k:
+                return heapq.nsmallest(k, within, key=lambda item: (item[0], item[1][0]))
+            radius *= RADIUS_GROWTH
+
+    return _ordered_nearest(links, lat, lng, k)
@@ -0,0 +1,59 @@
+import base64
+from dataclasses import dataclass
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def encode_cursor(direction: str, key: int) -> str:
+    return base64.urlsafe_b64encode(f"{direction}:{key}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+        커서 문자열을 (방향, 기준 키)로 변환. 잘못된 커서면 ValueError
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        direction, key = raw.split(":")
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("invalid cursor")
+    if direction not in ("n", "p"):
+        raise ValueError("invalid cursor")
+    return direction, int(key)
+
+
+def keyset_paginate(queryset, cursor, page_size: int, key_func=lambda obj: obj.pk) -> KeysetPage:
+    """
+        pk 오름차순 기준 키셋(커서) 페이지네이션
+        OFFSET 없이 "pk > 기준" 조건으로 읽으므로 몇 번째 페이지든 비용이 같다.
+    """
+    direction, key = decode_cursor(cursor) if cursor else (None, None)
+
+    if direction == "n":
+        queryset = queryset.filter(pk__gt=key).order_by("pk")
+    elif direction == "p":
+        queryset = queryset.filter(pk__lt=key).order_by("-pk")
+    else:
+        queryset = queryset.order_by("pk")
+
+    # 한 개 더 읽어서 다음(이전) 페이지가 있는지 확인
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == "p":
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, direction == "n"
+
+    page = KeysetPage(rows)
+    if rows and has_next:
+        page.next_cursor = encode_cursor("n", key_func(rows[-1]))
+    if rows and has_prev:
+        page.prev_cursor = encode_cursor("p", key_func(rows[0]))
+    return page
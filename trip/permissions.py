@@ -1,23 +1,34 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
-from .models import TravelGroup, GroupMember, Place
+from . import membership
+from .models import Recommendation, TravelGroup, TravelGroupPlace
 
 class IsGroupMember(BasePermission):
     """
-    요청 유저가 해당 그룹의 멤버인지 검사.
-    - Place 객체는 place.group
+    요청 유저가 해당 그룹의 멤버인지 검사. (trip.membership 캐시 사용)
+    - TravelGroupPlace 객체는 travel_group_id
+    - GroupMember 등 group FK가 있는 객체는 group_id
     - Group 객체는 self
+    - Recommendation 객체는 추천한 장소가 담긴 그룹 중 하나라도
     - 신규 생성 시 group id는 request.data['group']에서 확인
+    - URL에 group_pk가 있는 뷰(그룹 하위 목록)는 목록 요청부터 검사
     """
     def has_object_permission(self, request, view, obj):
-        if isinstance(obj, Place):
-            group = obj.group
+        if isinstance(obj, TravelGroup):
+            group_id = obj.pk
+        elif isinstance(obj, Recommendation):
+            return TravelGroupPlace.objects.filter(
+                place_id=obj.place_id, travel_group__member_links__user=request.user,
+            ).exists()
         else:
-            group = obj if isinstance(obj, TravelGroup) else getattr(obj, 'group', None)
-        if group is None:
+            group_id = getattr(obj, 'travel_group_id', None) or getattr(obj, 'group_id', None)
+        if group_id is None:
             return False
-        return group.members.filter(id=request.user.id).exists()
+        return membership.is_member(request.user, group_id, request)
 
     def has_permission(self, request, view):
+        group_pk = view.kwargs.get('group_pk')
+        if group_pk is not None and not membership.is_member(request.user, int(group_pk), request):
+            return False
         # 생성 시에는 body에 group이 있어야 함
         if view.action == 'create' and hasattr(view, 'expects_group_on_create') and view.expects_group_on_create:
             group_id = request.data.get('group')
@@ -0,0 +1,60 @@
+import json
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json
+    orjson = None
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _default(obj):
+    # Decimal(위경도)은 문자열이 아니라 숫자로. 나머지(lazy 문자열, timedelta 등)는 Django 규칙
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return _django_encoder.default(obj)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(data) -> bytes:
+        """
+            JSON 직렬화 (orjson이 있으면 orjson, 없으면 표준 json). 결과는 UTF-8 bytes
+        """
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+else:
+    _stdlib_encoder = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(data) -> bytes:
+        """
+            JSON 직렬화 (orjson이 있으면 orjson, 없으면 표준 json). 결과는 UTF-8 bytes
+        """
+        return _stdlib_encoder.encode(data).encode("utf-8")
+
+
+class FastJsonResponse(HttpResponse):
+    """
+        JsonResponse와 같은 사용법, 직렬화만 dumps()로
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+class FastJSONRenderer(JSONRenderer):
+    # DRF 기본 JSONRenderer 대신 dumps() 사용 (indent 요청은 기본 렌더러로 넘긴다)
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
@@ -0,0 +1,219 @@
+import math
+import time
+from array import array
+
+from .caching import LRUTTLCache, MISSING
+from .geo import EARTH_RADIUS_KM, haversine_km
+from .models import TravelGroup, TravelGroupPlace
+
+DEFAULT_TIME_BUDGET = 0.5  # 초
+MAX_TIME_BUDGET = 2.0
+MAX_ROUTE_STOPS = 1000
+MAX_OR_OPT_SEGMENT = 3
+
+ROUTE_COLUMNS = ("id", "nickname", "place_type", "place_id", "place__name", "place__lat", "place__lng")
+
+# 거리 행렬 캐시의 전체 크기 상한 (1000곳 행렬 하나가 약 8 MB)
+MATRIX_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# (group_id, places_version, 장소 id 튜플) -> 거리 행렬
+# 그룹 버전이 바뀌면 키가 달라지므로 따로 무효화할 필요가 없다
+_matrix_cache = LRUTTLCache(
+    maxsize=1024,
+    ttl=600,
+    maxweight=MATRIX_CACHE_MAX_BYTES,
+    weigh=lambda matrix: len(matrix) * matrix.itemsize,
+)
+
+
+def distance_matrix(coords):
+    """
+        [(lat, lng), ...] 사이의 haversine 거리 행렬(km, 대칭)
+        n*n 크기의 평평한 array('d')로 반환한다 (i행 j열 = matrix[i * n + j]).
+        삼각함수 값은 점마다 한 번만 계산하고 위 삼각형만 구해 복사한다.
+    """
+    lats = [math.radians(float(lat)) for lat, _ in coords]
+    lngs = [math.radians(float(lng)) for _, lng in coords]
+    cos_lats = [math.cos(v) for v in lats]
+    n = len(coords)
+    diameter = 2 * EARTH_RADIUS_KM
+    sin, asin, sqrt = math.sin, math.asin, math.sqrt
+
+    matrix = array("d", bytes(8 * n * n))
+    for i in range(n):
+        lat_i, lng_i, cos_i, base = lats[i], lngs[i], cos_lats[i], i * n
+        for j in range(i + 1, n):
+            a = sin((lats[j] - lat_i) / 2) ** 2 + cos_i * cos_lats[j] * sin((lngs[j] - lng_i) / 2) ** 2
+            matrix[base + j] = matrix[j * n + i] = diameter * asin(min(1.0, sqrt(a)))
+    return matrix
+
+
+def cached_distance_matrix(cache_key, coords):
+    matrix = _matrix_cache.get(cache_key)
+    if matrix is MISSING:
+        matrix = distance_matrix(coords)
+        _matrix_cache.set(cache_key, matrix)
+    return matrix
+
+
+def _nearest_neighbour(dist, n):
+    # 0번(출발점)에서 시작해 가장 가까운 미방문 지점으로 이동
+    tour = [0]
+    unvisited = set(range(1, n))
+    while unvisited:
+        row = dist[tour[-1]]
+        nxt = min(unvisited, key=row.__getitem__)
+        unvisited.remove(nxt)
+        tour.append(nxt)
+    return tour
+
+
+def _two_opt(tour, dist, deadline):
+    """
+        열린 경로용 2-opt: tour[i+1..j] 구간을 뒤집어 짧아지면 적용
+        tour[0](출발점)은 고정한다.
+    """
+    n = len(tour)
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = False
+        for i in range(n - 2):
+            a, b = tour[i], tour[i + 1]
+            row_a, row_b = dist[a], dist[b]
+            d_ab = row_a[b]
+            for j in range(i + 2, n):
+                c = tour[j]
+                if j + 1 < n:
+                    d = tour[j + 1]
+                    delta = row_a[c] + row_b[d] - d_ab - dist[c][d]
+                else:
+                    delta = row_a[c] - d_ab
+                if delta < -1e-9:
+                    tour[i + 1:j + 1] = reversed(tour[i + 1:j + 1])
+                    improved = True
+                    a, b = tour[i], tour[i + 1]
+                    row_b, d_ab = dist[b], row_a[b]
+            if time.monotonic() >= deadline:
+                break
+    return tour
+
+
+def _or_opt(tour, dist, deadline):
+    """
+        길이 1~3 구간을 다른 위치로 옮겨 짧아지면 적용 (출발점 고정)
+    """
+    n = len(tour)
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = False
+        for length in range(1, MAX_OR_OPT_SEGMENT + 1):
+            i = 1
+            while i + length <= n:
+                prev, first, last = tour[i - 1], tour[i], tour[i + length - 1]
+                nxt = tour[i + length] if i + length < n else None
+
+                # 구간을 뺐을 때 줄어드는 거리
+                removed = dist[prev][first] + (dist[last][nxt] - dist[prev][nxt] if nxt is not None else 0)
+
+                best, best_j = 1e-9, None
+                for j in range(n):
+                    if i - 1 <= j < i + length:
+                        continue
+                    p = tour[j]
+                    q = tour[j + 1] if j + 1 < n else None
+                    added = dist[p][first] + (dist[last][q] - dist[p][q] if q is not None else 0)
+                    if removed - added > best:
+                        best, best_j = removed - added, j
+
+                if best_j is not None:
+                    segment = tour[i:i + length]
+                    del tour[i:i + length]
+                    j = best_j if best_j < i else best_j - length
+                    tour[j + 1:j + 1] = segment
+                    improved = True
+                i += 1
+                if time.monotonic() >= deadline:
+                    return tour
+    return tour
+
+
+def tour_length(tour, dist) -> float:
+    return sum(dist[a][b] for a, b in zip(tour, tour[1:]))
+
+
+def optimize_route(dist, time_budget: float = DEFAULT_TIME_BUDGET):
+    """
+        0번 지점에서 출발해 모든 지점을 한 번씩 들르는 열린 경로
+        nearest neighbour로 시작해 시간 예산 안에서 2-opt / Or-opt로 개선한다.
+        반환: (방문 순서 인덱스 리스트, 총 거리 km)
+    """
+    n = len(dist)
+    if n <= 1:
+        return list(range(n)), 0.0
+
+    deadline = time.monotonic() + time_budget
+    tour = _nearest_neighbour(dist, n)
+    while time.monotonic() < deadline:
+        before = tour_length(tour, dist)
+        _two_opt(tour, dist, deadline)
+        _or_opt(tour, dist, deadline)
+        if tour_length(tour, dist) >= before - 1e-9:
+            break
+    return tour, tour_length(tour, dist)
+
+
+def with_start(matrix, start_distances=None):
+    """
+        평평한 장소 행렬(distance_matrix) 앞에 출발점(0번) 행/열을 붙인 행 단위 행렬
+        출발점이 없으면 모든 장소와 거리 0인 가상 지점을 붙여 양 끝을 자유롭게 둔다.
+        최적화 중에만 쓰는 요청별 사본이고, 캐시에는 평평한 행렬만 남는다.
+    """
+    n = math.isqrt(len(matrix))
+    first = array("d", start_distances) if start_distances is not None else array("d", bytes(8 * n))
+    return [array("d", [0.0]) + first] + [
+        array("d", [first[i]]) + matrix[i * n:(i + 1) * n] for i in range(n)
+    ]
+
+
+def plan_group_route(group_id: int, link_ids=None, place_type=None, start=None,
+                     time_budget: float = DEFAULT_TIME_BUDGET):
+    """
+        그룹 장소(link_ids 또는 place_type으로 선택)를 도는 방문 순서
+        start=(lat, lng)가 있으면 거기서 출발한다.
+        반환: ([(출발점부터의 구간 거리 km, row), ...], 총 거리 km), 그룹이 없으면 None
+    """
+    version = TravelGroup.objects.filter(pk=group_id).values_list("places_version", flat=True).first()
+    if version is None:
+        return None
+
+    links = TravelGroupPlace.objects.filter(travel_group_id=group_id)
+    if link_ids is not None:
+        links = links.filter(pk__in=link_ids)
+    if place_type is not None:
+        links = links.filter(place_type=place_type)
+    rows = list(links.order_by("id").values_list(*ROUTE_COLUMNS)[:MAX_ROUTE_STOPS + 1])
+    if len(rows) > MAX_ROUTE_STOPS:
+        raise ValueError(f"경로는 최대 {MAX_ROUTE_STOPS}곳까지 계산할 수 있습니다.")
+
+    # 장소 좌표가 바뀌면 places_version도 오르므로 버전을 키에 넣으면 충분하다
+    matrix = cached_distance_matrix(
+        (group_id, version, tuple(row[0] for row in rows)),
+        [(row[5], row[6]) for row in rows],
+    )
+    start_distances = None
+    if start is not None:
+        start_distances = [haversine_km(start[0], start[1], row[5], row[6]) for row in rows]
+
+    tour, total = optimize_route(with_start(matrix, start_distances), time_budget)
+
+    # 0번(출발점)을 빼고 장소 인덱스로 되돌린다
+    stops, previous = [], None
+    for index in tour[1:]:
+        i = index - 1
+        if previous is None:
+            leg = start_distances[i] if start_distances is not None else 0.0
+        else:
+            leg = matrix[previous * len(rows) + i]
+        stops.append((leg, rows[i]))
+        previous = i
+    return stops, total
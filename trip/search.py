@@ -0,0 +1,84 @@
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from .models import Place
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_COLUMNS = ("id", "name", "address", "lat", "lng")
+
+# SQLite FTS5 trigram 토크나이저는 3글자 이상부터 인덱스를 쓴다
+MIN_TRIGRAM_LENGTH = 3
+
+
+def _postgres_matches(query, limit):
+    # pg_trgm GIN 인덱스(0007 마이그레이션)가 icontains를, 유사도가 순위를 담당
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    return list(
+        Place.objects
+        .only(*AUTOCOMPLETE_COLUMNS)
+        .filter(Q(name__icontains=query) | Q(address__icontains=query))
+        .annotate(rank=Greatest(TrigramSimilarity("name", query), TrigramSimilarity("address", query)))
+        .order_by("-rank", "name")[:limit]
+    )
+
+
+def _sqlite_matches(query, limit):
+    # trip_place_fts(FTS5 trigram)에서 부분 문자열 검색, 이름 일치에 가중치
+    phrase = '"' + query.replace('"', '""') + '"'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT rowid FROM trip_place_fts WHERE trip_place_fts MATCH %s "
+            "ORDER BY bm25(trip_place_fts, 2.0, 1.0) LIMIT %s",
+            [phrase, limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    places = Place.objects.only(*AUTOCOMPLETE_COLUMNS).in_bulk(ids)
+    return [places[pk] for pk in ids if pk in places]
+
+
+def _like_matches(query, limit):
+    # 인덱스를 쓸 수 없는 짧은 검색어: 이름 접두어 > 이름 포함 > 주소 포함 순
+    return list(
+        Place.objects
+        .only(*AUTOCOMPLETE_COLUMNS)
+        .filter(Q(name__icontains=query) | Q(address__icontains=query))
+        .annotate(rank=Case(
+            When(name__istartswith=query, then=Value(2)),
+            When(name__icontains=query, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+        .order_by("-rank", "name")[:limit]
+    )
+
+
+def autocomplete_places(query: str, limit: int = AUTOCOMPLETE_LIMIT):
+    """
+        DB에 이미 저장된 장소를 이름/주소로 검색해 순위대로 반환
+        PostgreSQL은 pg_trgm, SQLite는 FTS5 trigram 인덱스를 사용한다.
+    """
+    query = " ".join(query.split())
+    if not query:
+        return []
+
+    if connection.vendor == "postgresql":
+        places = _postgres_matches(query, limit)
+    elif connection.vendor == "sqlite" and len(query) >= MIN_TRIGRAM_LENGTH:
+        places = _sqlite_matches(query, limit)
+    else:
+        places = _like_matches(query, limit)
+
+    return [
+        {
+            "id": p.id,
+            "name": p.name,
+            "address": p.address,
+            "lat": p.lat,
+            "lng": p.lng,
+            "existing": True,
+        }
+        for p in places
+    ]
@@ -1,7 +1,6 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from .models import TravelGroup, GroupMember, Place, Recommendation
-from django.db.models import Count
+from .models import TravelGroup, GroupMember, Place, TravelGroupPlace, Recommendation
 
 User = get_user_model()
 
@@ -18,19 +17,24 @@ class GroupMembershipSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "is_admin", "joined_at"]
 
 class PlaceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Place
+        fields = ["id", "name", "address", "lat", "lng", "phone", "url", "recommendations_count"]
+        read_only_fields = ["recommendations_count"]
+
+class TravelGroupPlaceSerializer(serializers.ModelSerializer):
+    # 그룹 안의 장소 (그룹별 이름/타입/설명 + 장소 정보)
+    place = PlaceSerializer(read_only=True)
     created_by = UserMiniSerializer(read_only=True)
-    recommendations_count = serializers.IntegerField(read_only=True)
 
     class Meta:
-        model = Place
+        model = TravelGroupPlace
         fields = [
-            "id", "group", "created_by",
-            "name", "description",
-            "place_type",
-            "address", "lat", "lng", "url",
-            "created_at", "recommendations_count",
+            "id", "travel_group", "place", "created_by",
+            "nickname", "place_type", "description", "day",
+            "recommendations_count",
         ]
-        read_only_fields = ["created_by", "created_at", "recommendations_count"]
+        read_only_fields = ["travel_group", "created_by", "recommendations_count"]
 
 class TravelGroupSerializer(serializers.ModelSerializer):
     created_by = UserMiniSerializer(read_only=True)
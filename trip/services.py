@@ -0,0 +1,209 @@
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from .models import TravelGroup, GroupMember, Place, TravelGroupPlace, Recommendation
+
+# Place.lat / lng와 같은 자릿수
+_COORDINATE = DecimalField(max_digits=9, decimal_places=6)
+
+
+def insert_ignore(obj, conflict_fields) -> bool:
+    """
+        obj를 INSERT ... ON CONFLICT (conflict_fields) DO NOTHING 한 문장으로 저장
+        새로 들어갔으면 True, 이미 있던 행과 충돌했으면 False
+        save()를 거치지 않으므로 시그널이 발생하지 않고, 자동 증가 pk도 채워지지 않는다.
+    """
+    meta = obj._meta
+    fields = [f for f in meta.concrete_fields if f is not meta.auto_field]
+    params = [f.get_db_prep_save(f.pre_save(obj, True), connection) for f in fields]
+
+    qn = connection.ops.quote_name
+    sql = "INSERT INTO {table} ({columns}) VALUES ({values}) ON CONFLICT ({conflict}) DO NOTHING".format(
+        table=qn(meta.db_table),
+        columns=", ".join(qn(f.column) for f in fields),
+        values=", ".join(["%s"] * len(fields)),
+        conflict=", ".join(qn(meta.get_field(name).column) for name in conflict_fields),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount == 1
+
+
+def adjust_member_count(group_id: int, delta: int) -> None:
+    TravelGroup.objects.filter(pk=group_id).update(member_count=F("member_count") + delta)
+
+
+def adjust_recommendations_count(place_id: int, delta: int) -> None:
+    # 장소 카운터와 그 장소를 저장한 모든 그룹의 순위 점수를 같이 갱신
+    Place.objects.filter(pk=place_id).update(recommendations_count=F("recommendations_count") + delta)
+    TravelGroupPlace.objects.filter(place_id=place_id).update(recommendations_count=F("recommendations_count") + delta)
+
+
+def copy_recommendations_count(links) -> int:
+    """
+        새로 만든 장소 링크(queryset)의 순위 점수를 장소의 현재 추천 수로 채운다
+    """
+    place_count = Place.objects.filter(pk=OuterRef("place_id")).values("recommendations_count")
+    return links.update(recommendations_count=Subquery(place_count))
+
+
+def set_recommendation(place_id: int, user_id: int, recommended: bool) -> bool:
+    """
+        추천 추가/취소를 한 문장으로 기록하고 바뀐 경우에만 카운터를 조정
+        이미 그 상태였으면(더블 클릭, 동시 요청) 아무것도 하지 않고 False
+        시그널을 거치지 않으므로 카운터는 여기서 직접 맞춘다.
+    """
+    if recommended:
+        changed = insert_ignore(Recommendation(place_id=place_id, user_id=user_id), ["place", "user"])
+    else:
+        # QuerySet.delete()는 먼저 SELECT 해 둔 행마다 post_delete를 보내므로
+        # 동시에 취소하면 카운터가 두 번 줄 수 있다. 실제로 지운 행 수로 판단한다.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {table} WHERE place_id = %s AND user_id = %s".format(
+                    table=connection.ops.quote_name(Recommendation._meta.db_table),
+                ),
+                [place_id, user_id],
+            )
+            changed = cursor.rowcount == 1
+
+    if changed:
+        adjust_recommendations_count(place_id, 1 if recommended else -1)
+    return changed
+
+
+def bump_places_version(group_id: int, **fields) -> None:
+    # 장소 목록이 바뀌었음을 알린다 (ETag / Last-Modified). fields는 같은 UPDATE에 함께 저장
+    TravelGroup.objects.filter(pk=group_id).update(
+        places_version=F("places_version") + 1,
+        places_modified_at=timezone.now(),
+        **fields,
+    )
+
+
+def group_place_added(group_id: int, lat, lng) -> None:
+    """
+        장소 하나가 추가됐을 때: 전체를 다시 집계하지 않고 장소 수를 늘리고 경계 상자만 넓힌다
+        (UPDATE 한 번, 그룹 크기와 무관)
+    """
+    lat = Value(Decimal(str(lat)), output_field=_COORDINATE)
+    lng = Value(Decimal(str(lng)), output_field=_COORDINATE)
+    # 첫 장소면 bbox가 NULL (SQLite의 MIN/MAX 다중 인자는 NULL이 있으면 NULL)
+    bump_places_version(
+        group_id,
+        place_count=F("place_count") + 1,
+        bbox_south=Least(Coalesce("bbox_south", lat), lat),
+        bbox_west=Least(Coalesce("bbox_west", lng), lng),
+        bbox_north=Greatest(Coalesce("bbox_north", lat), lat),
+        bbox_east=Greatest(Coalesce("bbox_east", lng), lng),
+    )
+
+
+def group_places_changed(group_id: int) -> None:
+    """
+        그룹의 장소 버전을 올리고 장소 수와 경계 상자(bbox)를 다시 계산해 저장 (그룹 크기에 비례)
+        삭제/이동처럼 경계가 줄어들 수 있을 때와 bulk 작업 뒤에 쓴다.
+        추가는 group_place_added, 경계와 무관한 수정은 bump_places_version으로 충분하다.
+    """
+    summary = (
+        TravelGroupPlace.objects
+        .filter(travel_group_id=group_id)
+        .aggregate(
+            place_count=Count("id"),
+            bbox_south=Min("place__lat"),
+            bbox_west=Min("place__lng"),
+            bbox_north=Max("place__lat"),
+            bbox_east=Max("place__lng"),
+        )
+    )
+    bump_places_version(group_id, **summary)
+
+
+def _batch_on_commit(flush, item) -> None:
+    """
+        flush(items)를 트랜잭션 커밋 때 한 번만, 그 사이에 모인 item 집합으로 호출
+        (한 트랜잭션에서 행 여러 개를 지워도 집계는 한 번). 트랜잭션 밖이면 바로 실행
+    """
+    conn = transaction.get_connection()
+    if not conn.in_atomic_block:
+        flush({item})
+        return
+
+    # 롤백(세이브포인트 포함)되면 콜백이 사라지므로 아직 등록돼 있는지 확인하고 재사용
+    pending = conn.__dict__.setdefault("_trip_pending_on_commit", {})
+    entry = pending.get(flush)
+    if entry is not None and any(func is entry[0] for _, func, _ in conn.run_on_commit):
+        entry[1].add(item)
+        return
+
+    items = {item}
+
+    def run():
+        pending.pop(flush, None)
+        flush(items)
+
+    pending[flush] = (run, items)
+    transaction.on_commit(run)
+
+
+def _refresh_group_summaries(group_ids) -> None:
+    for group_id in sorted(group_ids):
+        group_places_changed(group_id)
+
+
+def group_places_changed_on_commit(group_id: int) -> None:
+    # 삭제/이동: 커밋 때 그룹당 한 번 group_places_changed
+    _batch_on_commit(_refresh_group_summaries, group_id)
+
+
+def recount_recommendations(place_ids) -> None:
+    # 장소 추천 수와 그룹별 순위 점수를 실제 행 수로 다시 센다 (UPDATE 두 번)
+    place_ids = list(place_ids)
+    Place.objects.filter(pk__in=place_ids).update(
+        recommendations_count=_row_count(Recommendation, "place", "pk"),
+    )
+    TravelGroupPlace.objects.filter(place_id__in=place_ids).update(
+        recommendations_count=_row_count(Recommendation, "place", "place_id"),
+    )
+
+
+def recount_recommendations_on_commit(place_id: int) -> None:
+    # 사용자 삭제처럼 추천이 한꺼번에 지워질 때: 행마다 UPDATE 대신 커밋 때 장소별로 한 번에
+    _batch_on_commit(recount_recommendations, place_id)
+
+
+def _row_count(model, fk: str, outer: str = "pk"):
+    # 바깥 쿼리의 outer 값을 참조하는 model 행 수 (없으면 0)
+    rows = (
+        model.objects
+        .filter(**{fk: OuterRef(outer)})
+        .order_by()
+        .values(fk)
+        .annotate(c=Count("id"))
+        .values("c")
+    )
+    return Coalesce(Subquery(rows), 0)
+
+
+def reconcile_counters() -> dict:
+    """
+        member_count / recommendations_count (그룹별 순위 점수 포함)를 실제 행 수와 맞춘다
+        어긋나 있던 행만 갱신하고, 모델별로 고친 행 수를 반환
+    """
+    fixed = {}
+    for model, field, related, fk, outer in (
+        (TravelGroup, "member_count", GroupMember, "group", "pk"),
+        (Place, "recommendations_count", Recommendation, "place", "pk"),
+        (TravelGroupPlace, "recommendations_count", Recommendation, "place", "place_id"),
+    ):
+        stale = model.objects.annotate(actual=_row_count(related, fk, outer)).exclude(**{field: F("actual")})
+        fixed[model.__name__] = (
+            model.objects
+            .filter(pk__in=stale.values("pk"))
+            .update(**{field: _row_count(related, fk, outer)})
+        )
+    return fixed
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import membership
+from .models import GroupMember, Place, Recommendation, TravelGroup, TravelGroupPlace
+from .services import (
+    adjust_member_count, adjust_recommendations_count, bump_places_version, copy_recommendations_count,
+    group_place_added, group_places_changed_on_commit, recount_recommendations_on_commit,
+)
+
+
+def _cascaded_from(origin, *models) -> bool:
+    # delete()를 시작한 객체(또는 QuerySet)가 models 중 하나인지: 같이 지워질 행의 카운터는 고칠 필요가 없다
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+@receiver(post_save, sender=TravelGroupPlace)
+def on_group_place_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        copy_recommendations_count(TravelGroupPlace.objects.filter(pk=instance.pk))
+        group_place_added(instance.travel_group_id, instance.place.lat, instance.place.lng)
+    else:
+        loaded = getattr(instance, '_loaded_keys', None)
+        moved = (
+            (update_fields is None or {'travel_group', 'place'} & set(update_fields))
+            and loaded != (instance.travel_group_id, instance.place_id)
+        )
+        if moved:
+            # 다른 장소/그룹으로 옮겨지면 경계 상자가 줄어들 수 있어 다시 집계
+            for group_id in {instance.travel_group_id, loaded[0] if loaded else None} - {None}:
+                group_places_changed_on_commit(group_id)
+        else:
+            bump_places_version(instance.travel_group_id)
+    instance._loaded_keys = (instance.travel_group_id, instance.place_id)
+
+
+@receiver(post_delete, sender=TravelGroupPlace)
+def on_group_place_delete(sender, instance, origin=None, **kwargs):
+    # 그룹 삭제에 딸려 지워지는 링크는 그룹 요약을 고칠 필요가 없다
+    if origin is not None and _cascaded_from(origin, TravelGroup):
+        return
+    group_places_changed_on_commit(instance.travel_group_id)
+
+
+@receiver(post_save, sender=Place)
+def on_place_move(sender, instance, created, update_fields=None, **kwargs):
+    # 새 장소는 아직 어느 그룹에도 연결되지 않았다
+    if created:
+        return
+    if update_fields is not None and not {"lat", "lng"} & set(update_fields):
+        return
+    group_ids = (
+        TravelGroupPlace.objects
+        .filter(place_id=instance.pk)
+        .values_list("travel_group_id", flat=True)
+    )
+    for group_id in group_ids:
+        group_places_changed_on_commit(group_id)
+
+
+@receiver(post_save, sender=GroupMember)
+def on_member_join(sender, instance, created, **kwargs):
+    # is_admin 변경도 역할 캐시를 무효화해야 한다
+    membership.invalidate(instance.user_id, instance.group_id)
+    if created:
+        adjust_member_count(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=GroupMember)
+def on_member_leave(sender, instance, **kwargs):
+    membership.invalidate(instance.user_id, instance.group_id)
+    adjust_member_count(instance.group_id, -1)
+
+
+@receiver(post_save, sender=Recommendation)
+def on_recommendation_add(sender, instance, created, **kwargs):
+    if created:
+        adjust_recommendations_count(instance.place_id, 1)
+
+
+@receiver(post_delete, sender=Recommendation)
+def on_recommendation_remove(sender, instance, origin=None, **kwargs):
+    if origin is not None:
+        # 장소(그룹 장소) 삭제에 딸려 지워지면 카운터를 가진 행도 같이 지워진다
+        if _cascaded_from(origin, Place, TravelGroupPlace):
+            return
+        # 사용자 삭제: 남는 장소의 카운터는 커밋 때 장소별로 한 번에 다시 센다
+        if _cascaded_from(origin, get_user_model()):
+            recount_recommendations_on_commit(instance.place_id)
+            return
+    adjust_recommendations_count(instance.place_id, -1)
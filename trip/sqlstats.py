@@ -0,0 +1,63 @@
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+# IN (%s, %s, ...) 처럼 개수만 다른 자리표시자 목록은 같은 모양으로 본다
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+# 테스트(DEBUG 캡처)에서는 값이 채워진 SQL이 오므로 숫자/문자열 상수도 지운다
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def query_shape(sql: str) -> str:
+    """
+        파라미터 값을 지운 SQL 모양. 같은 모양이 한 요청에서 반복되면 N+1 후보
+    """
+    sql = _LITERAL.sub("%s", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def repeated_shapes(sqls, min_count: int = 2):
+    # [(모양, 횟수), ...] 많이 반복된 순
+    counts = Counter(query_shape(sql) for sql in sqls)
+    return [(shape, count) for shape, count in counts.most_common() if count >= min_count]
+
+
+class QueryRecorder:
+    """
+        connection.execute_wrapper로 실행된 SQL과 걸린 시간을 기록 (DEBUG와 무관하게 동작)
+    """
+
+    def __init__(self):
+        self.queries = []  # [(sql, ms), ...]
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - start) * 1000))
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(ms for _, ms in self.queries)
+
+    def repeated(self, min_count: int = 2):
+        return repeated_shapes((sql for sql, _ in self.queries), min_count)
+
+
+@contextmanager
+def record_queries(aliases=None):
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for alias in aliases or connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
@@ -1,8 +1,76 @@
+// 이 레벨 이상(더 멀리 본 화면)에서는 개별 마커 대신 서버 클러스터를 그린다
+const CLUSTER_LEVEL = 7;
+
+// 일차(day)별 마커 색상. 일정이 분배되지 않은 장소는 기본 마커
+const DAY_COLORS = ["#e6194b", "#3cb44b", "#4363d8", "#f58231", "#911eb4", "#42d4f4", "#f032e6", "#9a6324"];
+const dayMarkerImages = {};
+
+// 서버의 압축 열 형식(?format=columnar) 해석
+// 좌표: 마이크로도(1e-6°) 델타를 Google polyline 문자열로 인코딩한 값
+function decodePolyline(encoded, precision = 6) {
+  const factor = Math.pow(10, precision);
+  const coords = [];
+  let index = 0, lat = 0, lng = 0;
+  while (index < encoded.length) {
+    const delta = [0, 0];
+    for (let k = 0; k < 2; k++) {
+      let result = 0, shift = 0, b;
+      do {
+        b = encoded.charCodeAt(index++) - 63;
+        result |= (b & 0x1f) << shift;
+        shift += 5;
+      } while (b >= 0x20);
+      delta[k] = result & 1 ? ~(result >> 1) : result >> 1;
+    }
+    lat += delta[0];
+    lng += delta[1];
+    coords.push([lat / factor, lng / factor]);
+  }
+  return coords;
+}
+
+function decodeColumnar(data) {
+  const coords = decodePolyline(data.coords);
+  const types = data.place_type;
+  const places = new Array(data.count);
+  for (let i = 0; i < data.count; i++) {
+    places[i] = {
+      link_id: data.link_id[i],
+      place_id: data.place_id[i],
+      name: data.name[i],
+      address: data.address[i],
+      description: data.description[i],
+      day: data.day[i],
+      place_type: types.values[types.codes[i]],
+      lat: coords[i][0],
+      lng: coords[i][1],
+    };
+  }
+  return places;
+}
+
+function dayMarkerImage(day) {
+  if (!day) return undefined;
+  if (!dayMarkerImages[day]) {
+    const color = DAY_COLORS[(day - 1) % DAY_COLORS.length];
+    const svg = `<svg xmlns="http://www.w3.org/2000/svg" width="28" height="36" viewBox="0 0 28 36">
+      <path d="M14 0C6.3 0 0 6.3 0 14c0 10.5 14 22 14 22s14-11.5 14-22C28 6.3 21.7 0 14 0z" fill="${color}"/>
+      <text x="14" y="19" font-size="12" font-family="sans-serif" fill="#fff" text-anchor="middle">${day}</text>
+    </svg>`;
+    dayMarkerImages[day] = new kakao.maps.MarkerImage(
+      "data:image/svg+xml;charset=utf-8," + encodeURIComponent(svg),
+      new kakao.maps.Size(28, 36),
+      { offset: new kakao.maps.Point(14, 36) },
+    );
+  }
+  return dayMarkerImages[day];
+}
+
 document.addEventListener("DOMContentLoaded", async function () {
   const container = document.getElementById("map");
   if (!container) return;
 
-  const placesUrl = container.dataset.placesUrl;
+  const { placesUrl, clustersUrl, summaryUrl } = container.dataset;
   if (!placesUrl) {
     console.error("placesUrl(data-places-url)이 설정되지 않았어요.");
     return;
@@ -13,36 +81,122 @@ document.addEventListener("DOMContentLoaded", async function () {
     level: 5,
   });
 
-  const resp = await fetch(placesUrl);
-  const data = await resp.json();
-  const places = data.places || [];
+  let overlays = [];
+
+  function viewportUrl(baseUrl, params = {}) {
+    const url = new URL(baseUrl, window.location.origin);
+    const bounds = map.getBounds();
+    const sw = bounds.getSouthWest();
+    const ne = bounds.getNorthEast();
+    url.searchParams.set("sw", `${sw.getLat()},${sw.getLng()}`);
+    url.searchParams.set("ne", `${ne.getLat()},${ne.getLng()}`);
+    Object.entries(params).forEach(([k, v]) => url.searchParams.set(k, v));
+    return url;
+  }
+
+  function clearOverlays() {
+    overlays.forEach(o => o.setMap(null));
+    overlays = [];
+  }
 
-  if (places.length === 0) return;
+  function drawMarkers(places) {
+    clearOverlays();
 
-  const bounds = new kakao.maps.LatLngBounds();
+    places.forEach(p => {
+      const pos = new kakao.maps.LatLng(p.lat, p.lng);
 
-  places.forEach(p => {
-    const pos = new kakao.maps.LatLng(p.lat, p.lng);
+      const marker = new kakao.maps.Marker({
+        position: pos,
+        map: map,
+        image: dayMarkerImage(p.day),
+      });
 
-    const marker = new kakao.maps.Marker({
-      position: pos,
-      map: map,
-    });
+      const iw = new kakao.maps.InfoWindow({
+        content: `
+          <div style="padding:5px;font-size:12px;">
+            <b>${p.day ? `[${p.day}일차] ` : ""}${p.name}</b><br/>
+            ${p.address || ""}
+          </div>`,
+      });
 
-    const iw = new kakao.maps.InfoWindow({
-      content: `
-        <div style="padding:5px;font-size:12px;">
-          <b>${p.name}</b><br/>
-          ${p.address || ""}
-        </div>`,
+      kakao.maps.event.addListener(marker, "click", () => {
+        iw.open(map, marker);
+      });
+
+      overlays.push(marker);
     });
+  }
+
+  function drawClusters(clusters) {
+    clearOverlays();
 
-    kakao.maps.event.addListener(marker, "click", () => {
-      iw.open(map, marker);
+    clusters.forEach(c => {
+      const pos = new kakao.maps.LatLng(c.lat, c.lng);
+      const size = Math.min(60, 24 + Math.log2(c.count) * 6);
+
+      const el = document.createElement("div");
+      el.className = "rounded-circle bg-primary text-white d-flex align-items-center justify-content-center";
+      el.style.cssText = `width:${size}px;height:${size}px;opacity:.85;font-size:12px;cursor:pointer;`;
+      el.title = c.place_type;
+      el.textContent = c.count;
+      el.addEventListener("click", () => map.setLevel(map.getLevel() - 2, { anchor: pos }));
+
+      overlays.push(new kakao.maps.CustomOverlay({ position: pos, content: el, map: map }));
     });
+  }
 
-    bounds.extend(pos);
+  async function refresh() {
+    const level = map.getLevel();
+    if (clustersUrl && level >= CLUSTER_LEVEL) {
+      const resp = await fetch(viewportUrl(clustersUrl, { level }));
+      return () => resp.json().then(data => drawClusters(data.clusters || []));
+    }
+    const resp = await fetch(viewportUrl(placesUrl, { format: "columnar" }));
+    return () => resp.json().then(data => drawMarkers(data.count ? decodeColumnar(data) : []));
+  }
+
+  // 이동/확대가 끝날 때마다 화면 안의 장소(또는 클러스터)만 받아온다
+  let requestSeq = 0;
+  kakao.maps.event.addListener(map, "idle", async () => {
+    const seq = ++requestSeq;
+    const draw = await refresh();
+    if (seq === requestSeq) await draw();
   });
 
-  map.setBounds(bounds);
+  // 일차 분배: 저장 후 현재 화면을 다시 그린다 (분배 결과가 마커 색으로 보인다)
+  const dayPlanForm = document.getElementById("day-plan-form");
+  if (dayPlanForm) {
+    dayPlanForm.addEventListener("submit", async (e) => {
+      e.preventDefault();
+      const resp = await fetch(dayPlanForm.dataset.url, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          "X-CSRFToken": dayPlanForm.querySelector('input[name="csrfmiddlewaretoken"]').value,
+        },
+        body: JSON.stringify({ days: Number(dayPlanForm.elements.days.value) }),
+      });
+      const data = await resp.json();
+      if (!data.success) {
+        alert(data.error || "일정을 나누지 못했어요.");
+        return;
+      }
+      kakao.maps.event.trigger(map, "idle");
+    });
+  }
+
+  // 초기 화면은 그룹 요약(경계 상자)으로 잡는다
+  if (summaryUrl) {
+    const resp = await fetch(summaryUrl);
+    const summary = await resp.json();
+    if (summary.bounds) {
+      const { south, west, north, east } = summary.bounds;
+      map.setBounds(new kakao.maps.LatLngBounds(
+        new kakao.maps.LatLng(south, west),
+        new kakao.maps.LatLng(north, east),
+      ));
+      return;
+    }
+  }
+  kakao.maps.event.trigger(map, "idle");
 });
@@ -1,5 +1,5 @@
 // ===== 전역 상태 =====
-let map, ps, geocoder, infowindow;
+let map, geocoder, infowindow;
 let markers = [];
 let currentPlace = null;
 
@@ -12,7 +12,6 @@ function initMap() {
   map = new kakao.maps.Map(container, { center, level: 3 });
 
   // 서비스 객체
-  ps = new kakao.maps.services.Places({ map });
   geocoder = new kakao.maps.services.Geocoder();
   infowindow = new kakao.maps.InfoWindow({ zIndex: 1 });
 }
@@ -48,9 +47,12 @@ function openInfo(marker, title) {
   infowindow.open(map, marker);
 }
 
-// ===== 검색 (브라우저에서 Kakao 호출) =====
-async function searchPlace() {
-  const q = document.getElementById("place-query").value.trim();
+// ===== 검색 (서버 검색 API 경유, 결과는 서버에서 캐시) =====
+const SEARCH_PAGE_SIZE = 5;
+let lastQuery = "";
+
+async function searchPlace(page = 1) {
+  const q = page === 1 ? document.getElementById("place-query").value.trim() : lastQuery;
   const resultDiv = document.getElementById("search-result");
 
   clearListAndMarkers();
@@ -61,19 +63,67 @@ async function searchPlace() {
   }
 
   currentPlace = null;
+  lastQuery = q;
+
+  const url = new URL(searchUrl, window.location.origin);
+  url.searchParams.set("q", q);
+  url.searchParams.set("page", page);
+  url.searchParams.set("size", SEARCH_PAGE_SIZE);
+
+  try {
+    const resp = await fetch(url);
+    const data = await resp.json();
 
-  // 이름 검색: Places.keywordSearch
-  ps.keywordSearch(q, (data, status, pagination) => {
-    if (status === kakao.maps.services.Status.OK) {
-      renderPlaceResults(data, pagination);
-    } else if (status === kakao.maps.services.Status.ZERO_RESULT) {
+    if (!resp.ok || !data.success) {
+      resultDiv.textContent = data.error || "검색 중 오류가 발생했습니다.";
+      return;
+    }
+    if (data.documents.length === 0) {
       resultDiv.textContent = "검색 결과가 존재하지 않습니다.";
-    } else {
-      resultDiv.textContent = "검색 중 오류가 발생했습니다.";
+      return;
+    }
+
+    // 카카오 SDK pagination과 같은 모양으로 맞춘다
+    const pageable = Math.min(data.meta.pageable_count || 0, 45 * SEARCH_PAGE_SIZE);
+    renderPlaceResults(data.documents, {
+      current: page,
+      last: Math.max(1, Math.ceil(pageable / SEARCH_PAGE_SIZE)),
+      gotoPage: (p) => searchPlace(p),
+    });
+  } catch (e) {
+    resultDiv.textContent = "검색 중 오류가 발생했습니다.";
+  }
+}
+
+// ===== 자동완성 (이미 저장된 장소, 외부 API 호출 없음) =====
+let autocompleteTimer = null;
+
+function autocompletePlace() {
+  clearTimeout(autocompleteTimer);
+  autocompleteTimer = setTimeout(async () => {
+    const q = document.getElementById("place-query").value.trim();
+    const list = document.getElementById("place-suggestions");
+    if (q.length < 2) {
+      list.innerHTML = "";
+      return;
     }
-  },
-  { size: 5 }
-  );
+
+    const url = new URL(autocompleteUrl, window.location.origin);
+    url.searchParams.set("q", q);
+    try {
+      const resp = await fetch(url);
+      const data = await resp.json();
+      list.innerHTML = "";
+      (data.results || []).forEach(r => {
+        const option = document.createElement("option");
+        option.value = r.name;
+        option.label = r.address;
+        list.appendChild(option);
+      });
+    } catch (e) {
+      list.innerHTML = "";
+    }
+  }, 200);
 }
 
 // ===== 결과 렌더링 (장소) =====
@@ -94,7 +144,7 @@ function renderPlaceResults(places, pagination) {
     li.className = 'list-group-item d-flex justify-content-between align-items-start';
     li.innerHTML = `
       <div class="ms-2 me-auto">
-        <div class="fw-bold">${p.place_name}</div>
+        <div class="fw-bold">${p.existing ? "⭐ " : ""}${p.place_name}</div>
         <div>${p.road_address_name || p.address_name || ""}</div>
         ${p.phone ? `<div class="text-muted">${p.phone}</div>` : ""}
       </div>
@@ -214,9 +264,11 @@ document.addEventListener("DOMContentLoaded", () => {
   initMap();
 
   const qInput = document.getElementById("place-query");
-  document.getElementById("search-btn").addEventListener("click", searchPlace);
+  document.getElementById("search-btn").addEventListener("click", () => searchPlace(1));
   document.getElementById("submit-btn").addEventListener("click", submitPlace);
 
+  qInput.addEventListener('input', autocompletePlace);
+
   // 엔터로 검색
   qInput.addEventListener('keydown', (e) => {
     if (e.key === 'Enter') document.getElementById("search-btn").click();
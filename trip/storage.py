@@ -0,0 +1,64 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 .gz만
+    brotli = None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+        collectstatic 시 내용 해시가 붙은 파일명(app.3f2a9c.js)과 함께
+        미리 압축한 .gz / .br 파일을 옆에 만든다.
+        파일명이 내용에 따라 바뀌므로 웹 서버에서 만료 없이 캐시해도 된다.
+        (nginx: gzip_static on; brotli_static on; expires max;)
+    """
+    compress_extensions = (".css", ".js", ".json", ".svg", ".txt", ".html", ".map")
+    min_compress_size = 256
+
+    def url_converter(self, name, hashed_files, template=None):
+        converter = super().url_converter(name, hashed_files, template)
+
+        def convert(matchobj):
+            # CSS가 저장소에 없는 파일을 참조하면(예: font.css의 폰트) 실패하지 않고 원래 URL을 둔다
+            try:
+                return converter(matchobj)
+            except ValueError:
+                return matchobj.group(0)
+        return convert
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        # 해시 파일명은 모든 단계가 끝난 뒤에야 확정된다
+        for hashed_name in set(self.hashed_files.values()):
+            for compressed_name in self._write_compressed(hashed_name):
+                yield compressed_name, compressed_name, True
+
+    def _write_compressed(self, name):
+        if os.path.splitext(name)[1].lower() not in self.compress_extensions:
+            return []
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < self.min_compress_size:
+            return []
+
+        variants = [(".gz", gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(content, quality=11)))
+
+        written = []
+        for suffix, data in variants:
+            # 압축해도 줄지 않으면 원본만 둔다
+            if len(data) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(data))
+            written.append(name + suffix)
+        return written
@@ -0,0 +1,241 @@
+import random
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .geo import geocell
+from .models import GroupMember, Place, Recommendation, TravelGroup, TravelGroupPlace
+from .services import group_places_changed, reconcile_counters
+
+# 생성 데이터 표시: 다시 만들거나 지울 때 이 값으로 찾는다
+USERNAME_PREFIX = "bench-user-"
+GROUP_PREFIX = "[bench] "
+PLACE_ID_BASE = 9_000_000_000  # 카카오 장소 id와 겹치지 않는 범위
+PASSWORD = "bench-password"
+
+# 규모별 기본값. big_group: 벤치마크 대상이 되는 큰 그룹 하나의 장소 수
+SCALES = {
+    "small": {"users": 100, "groups": 20, "places": 1_000, "places_per_group": 50, "members_per_group": 4, "big_group": 500},
+    "medium": {"users": 2_000, "groups": 500, "places": 100_000, "places_per_group": 100, "members_per_group": 5, "big_group": 5_000},
+    "large": {"users": 20_000, "groups": 5_000, "places": 1_000_000, "places_per_group": 150, "members_per_group": 5, "big_group": 20_000},
+}
+
+# (이름, 위도, 경도, 위도 표준편차, 경도 표준편차, 비중) — 여행지는 몇몇 도시에 몰려 있다
+CITIES = (
+    ("서울", 37.5665, 126.9780, 0.06, 0.09, 40),
+    ("부산", 35.1796, 129.0756, 0.05, 0.06, 15),
+    ("제주", 33.3846, 126.5535, 0.10, 0.25, 15),
+    ("인천", 37.4563, 126.7052, 0.05, 0.06, 7),
+    ("대구", 35.8714, 128.6014, 0.04, 0.05, 6),
+    ("경주", 35.8562, 129.2247, 0.03, 0.04, 6),
+    ("강릉", 37.7519, 128.8761, 0.03, 0.03, 6),
+    ("전주", 35.8242, 127.1480, 0.02, 0.03, 5),
+)
+HOTSPOTS_PER_CITY = 20
+HOTSPOT_SHARE = 0.7  # 장소의 70%는 번화가 주변(반경 수백 m)에 모인다
+HOTSPOT_SIGMA = 0.004
+
+PLACE_TYPE_WEIGHTS = {
+    TravelGroupPlace.PlaceType.RESTAURANT: 35,
+    TravelGroupPlace.PlaceType.CAFE: 25,
+    TravelGroupPlace.PlaceType.ATTRACTION: 12,
+    TravelGroupPlace.PlaceType.SHOPPING: 8,
+    TravelGroupPlace.PlaceType.PARK: 6,
+    TravelGroupPlace.PlaceType.MUSEUM: 5,
+    TravelGroupPlace.PlaceType.ACCOMMODATION: 4,
+    TravelGroupPlace.PlaceType.OTHER: 5,
+}
+RECOMMEND_RATE = 0.3  # 멤버가 그룹 장소 하나를 추천할 확률
+DEFAULT_BATCH_SIZE = 2_000
+
+
+def _coordinate(lat: float, lng: float):
+    # DecimalField(decimal_places=6)와 같은 자릿수
+    return Decimal(f"{lat:.6f}"), Decimal(f"{lng:.6f}")
+
+
+class _Generator:
+    def __init__(self, seed, batch_size):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        rng = self.rng
+        self.hotspots = [
+            [(rng.gauss(lat, lat_sd), rng.gauss(lng, lng_sd)) for _ in range(HOTSPOTS_PER_CITY)]
+            for _, lat, lng, lat_sd, lng_sd, _ in CITIES
+        ]
+        self.city_weights = [city[5] for city in CITIES]
+        self.types = list(PLACE_TYPE_WEIGHTS)
+        self.type_weights = list(PLACE_TYPE_WEIGHTS.values())
+
+    def _bulk_create(self, model, objs, keep=False):
+        """
+            배치 단위로 나눠 넣는다. keep이면 생성된 객체(pk 포함) 리스트, 아니면 행 수를 반환
+            (수십만 행을 메모리에 들고 있지 않도록)
+        """
+        created, count, batch = [], 0, []
+        for obj in objs:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                batch = model.objects.bulk_create(batch)
+                count += len(batch)
+                if keep:
+                    created += batch
+                batch = []
+        if batch:
+            batch = model.objects.bulk_create(batch)
+            count += len(batch)
+            if keep:
+                created += batch
+        return created if keep else count
+
+    def users(self, count):
+        password = make_password(PASSWORD)  # 해시는 한 번만 (PBKDF2가 느리다)
+        User = get_user_model()
+        users = self._bulk_create(
+            User,
+            (User(username=f"{USERNAME_PREFIX}{i}", password=password) for i in range(count)),
+            keep=True,
+        )
+        return [user.pk for user in users]
+
+    def places(self, count):
+        # bulk_create는 save()를 거치지 않으므로 geocell을 직접 채운다
+        rng = self.rng
+        by_city = [[] for _ in CITIES]
+
+        def rows():
+            for i in range(count):
+                c = rng.choices(range(len(CITIES)), self.city_weights)[0]
+                name, lat, lng, lat_sd, lng_sd, _ = CITIES[c]
+                if rng.random() < HOTSPOT_SHARE:
+                    lat, lng = rng.choice(self.hotspots[c])
+                    lat_sd = lng_sd = HOTSPOT_SIGMA
+                lat, lng = _coordinate(rng.gauss(lat, lat_sd), rng.gauss(lng, lng_sd))
+                place_id = PLACE_ID_BASE + i
+                by_city[c].append(place_id)
+                yield Place(
+                    id=place_id,
+                    name=f"{name} 장소 {i}",
+                    address=f"{name} 테스트로 {rng.randint(1, 300)}",
+                    lat=lat,
+                    lng=lng,
+                    geocell=geocell(lat, lng),
+                )
+
+        self._bulk_create(Place, rows())
+        return by_city
+
+    def groups(self, count, user_ids, by_city, places_per_group, members_per_group, big_group):
+        rng = self.rng
+        groups, memberships, plans = [], [], []
+        for g in range(count):
+            c = rng.choices(range(len(CITIES)), self.city_weights)[0]
+            pool = by_city[c] or [pid for ids in by_city for pid in ids]
+            # 첫 그룹은 벤치마크용 큰 그룹, 나머지는 평균 places_per_group 주변
+            size = big_group if g == 0 else rng.randint(places_per_group // 2, places_per_group * 3 // 2)
+            members = rng.sample(user_ids, min(len(user_ids), rng.randint(2, max(2, members_per_group * 2 - 2))))
+            groups.append(TravelGroup(
+                name=f"{GROUP_PREFIX}{CITIES[c][0]} 여행 {g}",
+                description="합성 데이터",
+                created_by_id=members[0],
+            ))
+            plans.append((rng.sample(pool, min(len(pool), size)), members))
+
+        groups = self._bulk_create(TravelGroup, groups, keep=True)
+        for group, (_, members) in zip(groups, plans):
+            memberships += [
+                GroupMember(group_id=group.pk, user_id=user_id, is_admin=i == 0)
+                for i, user_id in enumerate(members)
+            ]
+        self._bulk_create(GroupMember, memberships)
+        return groups, plans
+
+    def links(self, groups, plans):
+        rng = self.rng
+        recommended = set()
+
+        def rows():
+            for group, (place_ids, members) in zip(groups, plans):
+                for place_id in place_ids:
+                    for user_id in members:
+                        if rng.random() < RECOMMEND_RATE:
+                            recommended.add((place_id, user_id))
+                    yield TravelGroupPlace(
+                        travel_group_id=group.pk,
+                        place_id=place_id,
+                        created_by_id=rng.choice(members),
+                        place_type=rng.choices(self.types, self.type_weights)[0],
+                    )
+
+        link_count = self._bulk_create(TravelGroupPlace, rows())
+        self._bulk_create(
+            Recommendation,
+            (Recommendation(place_id=place_id, user_id=user_id) for place_id, user_id in sorted(recommended)),
+        )
+        return link_count, len(recommended)
+
+
+def synthetic_data_exists() -> bool:
+    return Place.objects.filter(pk__gte=PLACE_ID_BASE).exists()
+
+
+def delete_synthetic_data() -> None:
+    # 그룹(멤버십/링크 CASCADE) -> 장소(추천 CASCADE) -> 사용자 순
+    TravelGroup.objects.filter(name__startswith=GROUP_PREFIX).delete()
+    Place.objects.filter(pk__gte=PLACE_ID_BASE).delete()
+    get_user_model().objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+
+def generate(users: int, groups: int, places: int, places_per_group: int, members_per_group: int,
+             big_group: int, seed: int = 0, batch_size: int = DEFAULT_BATCH_SIZE, log=None) -> dict:
+    """
+        합성 사용자/그룹/멤버십/장소/그룹 장소/추천을 bulk_create로 만든다
+        좌표는 도시별 정규분포 + 번화가 밀집으로 실제 여행지 분포를 흉내낸다.
+        같은 seed면 같은 데이터(자동 증가 id 제외). 반환: 모델별 생성 행 수
+    """
+    log = log or (lambda message: None)
+    generator = _Generator(seed, batch_size)
+    with transaction.atomic():
+        log(f"users: {users}")
+        user_ids = generator.users(max(users, 2))
+        log(f"places: {places}")
+        by_city = generator.places(places)
+        log(f"groups: {groups}")
+        group_objs, plans = generator.groups(
+            groups, user_ids, by_city, places_per_group, members_per_group, big_group,
+        )
+        log("group places / recommendations")
+        link_count, recommendation_count = generator.links(group_objs, plans)
+
+        # bulk 작업은 시그널을 거치지 않으므로 카운터와 그룹 요약을 직접 맞춘다
+        log("counters / group summaries")
+        reconcile_counters()
+        for group in group_objs:
+            group_places_changed(group.pk)
+
+    return {
+        "users": len(user_ids),
+        "groups": len(group_objs),
+        "members": sum(len(members) for _, members in plans),
+        "places": places,
+        "group_places": link_count,
+        "recommendations": recommendation_count,
+    }
+
+
+def benchmark_target():
+    """
+        벤치마크 대상: 장소가 가장 많은 합성 그룹과 그 관리자 (없으면 None)
+    """
+    group = (
+        TravelGroup.objects
+        .filter(name__startswith=GROUP_PREFIX)
+        .order_by("-place_count", "pk")
+        .first()
+    )
+    if group is None:
+        return None
+    admin = GroupMember.objects.filter(group=group, is_admin=True).select_related("user").first()
+    return group, admin.user
@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from .sqlstats import repeated_shapes
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, using: str = "default", max_repeats: int = None):
+    """
+        블록 안의 쿼리가 max_queries개를 넘거나, 같은 모양의 쿼리가 max_repeats번을
+        넘게 반복되면(N+1) 실패. 실패 메시지에 실행된 쿼리를 모두 붙인다.
+
+            with assert_max_queries(4, max_repeats=1):
+                self.client.get(url)
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+
+    sqls = [query["sql"] for query in context.captured_queries]
+    listing = "\n".join(f"{i}. {sql}" for i, sql in enumerate(sqls, start=1))
+    if len(sqls) > max_queries:
+        raise AssertionError(f"{len(sqls)} queries executed, at most {max_queries} expected\n{listing}")
+    if max_repeats is not None:
+        repeated = repeated_shapes(sqls, min_count=max_repeats + 1)
+        if repeated:
+            shape, count = repeated[0]
+            raise AssertionError(
+                f"query repeated {count} times (at most {max_repeats} expected, possible N+1): {shape}\n{listing}"
+            )
@@ -1,3 +1,1555 @@
-from django.test import TestCase
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock, skipIf
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import api, kakao_maps_api, membership, middleware, nearby
+from .caching import LRUTTLCache, MISSING
+from .dayplan import balanced_kmeans
+from .geo import decode_polyline, encode_polyline, geocell
+from .models import TravelGroup, GroupMember, Place, TravelGroupPlace, Recommendation
+from .nearby import nearest_group_places
+from .permissions import IsGroupMember
+from .renderers import FastJSONRenderer, dumps
+from .routing import distance_matrix, optimize_route, tour_length, with_start
+from .sqlstats import query_shape
+from .testing import assert_max_queries
+from .utils import build_choices
+from .views import GroupPlaceListView
+
+User = get_user_model()
+
+
+class GroupPlacesTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="member", password="pw")
+        cls.group = TravelGroup.objects.create(name="Seoul", created_by=cls.user)
+        GroupMember.objects.create(group=cls.group, user=cls.user, is_admin=True)
+
+    def setUp(self):
+        # 프로세스 캐시는 테스트 간 롤백을 모르므로 매번 비운다
+        membership.clear_cache()
+
+    @classmethod
+    def add_place(cls, place_id, lat, lng, place_type=TravelGroupPlace.PlaceType.OTHER, group=None):
+        place = Place.objects.create(
+            id=place_id,
+            name=f"place-{place_id}",
+            address=f"address-{place_id}",
+            lat=Decimal(str(lat)),
+            lng=Decimal(str(lng)),
+        )
+        return TravelGroupPlace.objects.create(
+            travel_group=group or cls.group,
+            place=place,
+            place_type=place_type,
+            created_by=cls.user,
+        )
+
+
+class ViewportTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.city_hall = cls.add_place(1, 37.5665, 126.9780)
+        cls.gangnam = cls.add_place(2, 37.4979, 127.0276)
+        cls.busan = cls.add_place(3, 35.1796, 129.0756)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_geocell_is_kept_in_sync(self):
+        place = Place.objects.get(pk=1)
+        self.assertEqual(place.geocell, geocell(place.lat, place.lng))
+
+        place.lat = Decimal("35.0")
+        place.save(update_fields=["lat"])
+        place.refresh_from_db()
+        self.assertEqual(place.geocell, geocell(Decimal("35.0"), place.lng))
+
+    def test_in_viewport(self):
+        links = TravelGroupPlace.objects.in_viewport(37.4, 126.9, 37.6, 127.1)
+        self.assertCountEqual(links, [self.city_hall, self.gangnam])
+
+    def test_in_viewport_large_area(self):
+        links = TravelGroupPlace.objects.in_viewport(33.0, 124.0, 39.0, 131.0)
+        self.assertCountEqual(links, [self.city_hall, self.gangnam, self.busan])
+
+    def test_group_places_json_viewport(self):
+        url = reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk})
+
+        resp = self.client.get(url, {"sw": "37.55,126.97", "ne": "37.58,126.99"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([p["link_id"] for p in resp.json()["places"]], [self.city_hall.pk])
+
+        resp = self.client.get(url, {"sw": "37.58,126.97", "ne": "37.55,126.99"})
+        self.assertEqual(resp.status_code, 400)
+
+
+class ClusterAndSummaryTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cafe = TravelGroupPlace.PlaceType.CAFE
+        cls.add_place(1, 37.5665, 126.9780, cafe)
+        cls.add_place(2, 37.5667, 126.9782, cafe)
+        cls.add_place(3, 37.5668, 126.9781)
+        cls.add_place(4, 35.1796, 129.0756)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_members_only(self):
+        outsider = User.objects.create_user(username="outsider", password="pw")
+        for name, params in (
+            ("trip:group_place_summary_json", {}),
+            ("trip:group_place_clusters_json", {"level": 8}),
+            ("trip:group_places_nearby_json", {"lat": 37.5, "lng": 127.0}),
+            ("trip:group_place_top_json", {}),
+        ):
+            with self.subTest(name):
+                url = reverse(name, kwargs={"group_pk": self.group.pk})
+                self.client.logout()
+                self.assertEqual(self.client.get(url, params).status_code, 302)
+                # 멤버가 아니면 ETag로 재검증해도 304 대신 403
+                self.client.force_login(outsider)
+                self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH="*").status_code, 403)
+
+    def test_summary_is_maintained(self):
+        url = reverse("trip:group_place_summary_json", kwargs={"group_pk": self.group.pk})
+        data = self.client.get(url).json()
+        self.assertEqual(data["count"], 4)
+        self.assertEqual(data["bounds"]["south"], 35.1796)
+        self.assertEqual(data["bounds"]["east"], 129.0756)
+
+        # 삭제는 경계가 줄어들 수 있어 커밋 때 그룹당 한 번 다시 집계
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            TravelGroupPlace.objects.filter(place_id__in=[3, 4]).delete()
+        self.assertEqual(len(callbacks), 1)
+        data = self.client.get(url).json()
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(data["bounds"]["south"], 37.5665)
+
+    def test_add_widens_summary_without_aggregating(self):
+        group = TravelGroup.objects.create(name="incremental")
+        place = Place.objects.create(id=100, name="p", lat=Decimal("33.5"), lng=Decimal("126.5"))
+        # INSERT, 순위 점수 복사, 그룹 UPDATE — 그룹 크기와 무관
+        with self.assertNumQueries(3):
+            TravelGroupPlace.objects.create(travel_group=group, place=place)
+        for place_id in (1, 4):
+            TravelGroupPlace.objects.create(travel_group=group, place_id=place_id)
+
+        group.refresh_from_db()
+        self.assertEqual(group.place_count, 3)
+        self.assertEqual((group.bbox_south, group.bbox_north), (Decimal("33.5"), Decimal("37.5665")))
+        self.assertEqual((group.bbox_west, group.bbox_east), (Decimal("126.5"), Decimal("129.0756")))
+
+    def test_group_delete_cascade_skips_summary(self):
+        group = TravelGroup.objects.create(name="doomed")
+        for place_id in (1, 2, 3, 4):
+            TravelGroupPlace.objects.create(travel_group=group, place_id=place_id)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            group.delete()
+        self.assertEqual(callbacks, [])
+
+    def test_empty_summary(self):
+        group = TravelGroup.objects.create(name="empty")
+        GroupMember.objects.create(group=group, user=self.user)
+        url = reverse("trip:group_place_summary_json", kwargs={"group_pk": group.pk})
+        self.assertEqual(self.client.get(url).json(), {"count": 0, "bounds": None, "center": None})
+
+    def test_clusters(self):
+        url = reverse("trip:group_place_clusters_json", kwargs={"group_pk": self.group.pk})
+        clusters = self.client.get(url, {"level": 8}).json()["clusters"]
+        self.assertEqual(sorted(c["count"] for c in clusters), [1, 3])
+        seoul = max(clusters, key=lambda c: c["count"])
+        self.assertEqual(seoul["place_type"], "CAFE")
+        self.assertAlmostEqual(seoul["lat"], 37.566667, places=5)
+
+        clusters = self.client.get(
+            url, {"level": 8, "sw": "35,128", "ne": "36,130"},
+        ).json()["clusters"]
+        self.assertEqual([c["count"] for c in clusters], [1])
+
+    def test_clusters_requires_level(self):
+        url = reverse("trip:group_place_clusters_json", kwargs={"group_pk": self.group.pk})
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {"level": 20}).status_code, 400)
+
+
+class ConditionalGetTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.link = cls.add_place(1, 37.5665, 126.9780)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_version_is_bumped(self):
+        version = TravelGroup.objects.get(pk=self.group.pk).places_version
+
+        self.link.description = "changed"
+        self.link.save()
+        self.assertEqual(TravelGroup.objects.get(pk=self.group.pk).places_version, version + 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.link.delete()
+        self.assertEqual(TravelGroup.objects.get(pk=self.group.pk).places_version, version + 2)
+
+    def test_not_modified(self):
+        url = reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk})
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        etag = resp["ETag"]
+        self.assertIn("Last-Modified", resp)
+
+        # 304는 세션/유저와 그룹 행 조회 한 번으로 끝난다 (멤버십은 첫 요청에서 캐시)
+        with self.assertNumQueries(3):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        self.add_place(2, 37.4979, 127.0276)
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+        self.assertEqual(len(resp.json()["places"]), 2)
+
+    def test_members_only(self):
+        url = reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk})
+        etag = self.client.get(url)["ETag"]
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 302)
+        # 멤버가 아니면 ETag가 맞아도 304 대신 403 (그룹 버전이 드러나지 않게)
+        self.client.force_login(User.objects.create_user(username="outsider", password="pw"))
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 403)
+        self.assertNotIn("ETag", resp)
+
+
+class StreamingPlacesJsonTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(1, 6):
+            cls.add_place(i, 37.5 + i / 100, 127.0)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_stream_matches_regular_response(self):
+        url = reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk})
+        regular = self.client.get(url)
+
+        streamed = self.client.get(url, {"stream": "1"})
+        self.assertTrue(streamed.streaming)
+        body = b"".join(streamed.streaming_content)
+        self.assertEqual(json.loads(body), regular.json())
+        self.assertEqual(len(regular.json()["places"]), 5)
+
+    def test_stream_empty_group(self):
+        group = TravelGroup.objects.create(name="empty")
+        GroupMember.objects.create(group=group, user=self.user)
+        url = reverse("trip:group_places_json", kwargs={"group_pk": group.pk})
+        resp = self.client.get(url, {"stream": "1"})
+        self.assertEqual(json.loads(b"".join(resp.streaming_content)), {"places": []})
+
+
+class KeysetPaginationTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.links = [cls.add_place(i, 37.5, 127.0) for i in range(1, 8)]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_walk_forward_and_back(self):
+        url = reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk})
+        ids = [link.pk for link in self.links]
+
+        first = self.client.get(url, {"limit": 3}).json()
+        self.assertEqual([p["link_id"] for p in first["places"]], ids[:3])
+        self.assertIsNone(first["prev"])
+
+        second = self.client.get(url, {"limit": 3, "cursor": first["next"]}).json()
+        self.assertEqual([p["link_id"] for p in second["places"]], ids[3:6])
+
+        last = self.client.get(url, {"limit": 3, "cursor": second["next"]}).json()
+        self.assertEqual([p["link_id"] for p in last["places"]], ids[6:])
+        self.assertIsNone(last["next"])
+
+        back = self.client.get(url, {"limit": 3, "cursor": last["prev"]}).json()
+        self.assertEqual([p["link_id"] for p in back["places"]], ids[3:6])
+        self.assertIsNotNone(back["prev"])
+
+        back = self.client.get(url, {"limit": 3, "cursor": back["prev"]}).json()
+        self.assertEqual([p["link_id"] for p in back["places"]], ids[:3])
+        self.assertIsNone(back["prev"])
+
+    def test_invalid_cursor(self):
+        url = reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk})
+        self.assertEqual(self.client.get(url, {"cursor": "garbage"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"limit": 0}).status_code, 400)
+
+    @mock.patch.object(GroupPlaceListView, "place_page_size", 5)
+    def test_place_list_view_pages(self):
+        self.client.force_login(self.user)
+        url = reverse("trip:group_place_list", kwargs={"pk": self.group.pk})
+
+        resp = self.client.get(url)
+        self.assertEqual(len(resp.context["place_links"]), 5)
+
+        resp = self.client.get(url, {"cursor": resp.context["page"].next_cursor})
+        self.assertEqual(
+            [link.pk for link in resp.context["place_links"]],
+            [link.pk for link in self.links[5:]],
+        )
+
+    def test_group_view_seeds_membership(self):
+        self.client.force_login(self.user)
+        url = reverse("trip:group_place_list", kwargs={"pk": self.group.pk})
+        with mock.patch.object(membership, "remember", wraps=membership.remember) as remember:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        remember.assert_called_once_with(mock.ANY, self.group.pk, membership.ADMIN, mock.ANY)
+        # 함께 읽은 역할은 요청 메모에만 넣는다 (프로세스 캐시는 get_role이 직접 채운다)
+        request = RequestFactory().get("/")
+        membership.remember(self.user, self.group.pk, membership.ADMIN, request)
+        with self.assertNumQueries(0):
+            self.assertEqual(membership.get_role(self.user, self.group.pk, request), membership.ADMIN)
+        with self.assertNumQueries(1):
+            self.assertEqual(membership.get_role(self.user, self.group.pk), membership.ADMIN)
+
+        self.client.force_login(User.objects.create_user(username="outsider", password="pw"))
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class CounterTests(GroupPlacesTestMixin, TestCase):
+    def test_member_count(self):
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.member_count, 1)
+
+        other = User.objects.create_user(username="other", password="pw")
+        membership = GroupMember.objects.create(group=self.group, user=other)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.member_count, 2)
+
+        membership.delete()
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.member_count, 1)
+
+    def test_recommendations_count(self):
+        place = self.add_place(1, 37.5, 127.0).place
+        recommendation = Recommendation.objects.create(place=place, user=self.user)
+        place.refresh_from_db()
+        self.assertEqual(place.recommendations_count, 1)
+
+        recommendation.delete()
+        place.refresh_from_db()
+        self.assertEqual(place.recommendations_count, 0)
+
+    def test_cascaded_recommendations_skip_counters(self):
+        users = [User.objects.create_user(username=f"u{i}", password="pw") for i in range(3)]
+        for place_id in range(1, 6):
+            place = self.add_place(place_id, 37.5, 127.0).place
+            for user in users:
+                Recommendation.objects.create(place=place, user=user)
+
+        # 장소와 함께 지워지는 추천은 행마다 카운터를 고치지 않는다
+        with CaptureQueriesContext(connection) as queries:
+            Place.objects.filter(pk__in=[1, 2]).delete()
+        self.assertFalse([q for q in queries.captured_queries if q["sql"].startswith("UPDATE")])
+
+        # 사용자 삭제는 남은 장소를 커밋 때 한 번에 다시 센다
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            users[0].delete()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(set(Place.objects.values_list("recommendations_count", flat=True)), {2})
+        self.assertEqual(set(TravelGroupPlace.objects.values_list("recommendations_count", flat=True)), {2})
+
+    def test_reconcile_counters(self):
+        place = self.add_place(1, 37.5, 127.0).place
+        Recommendation.objects.create(place=place, user=self.user)
+        TravelGroup.objects.update(member_count=7)
+        Place.objects.update(recommendations_count=0)
+
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        self.assertIn("TravelGroup: 1 row(s) fixed", out.getvalue())
+
+        self.group.refresh_from_db()
+        place.refresh_from_db()
+        self.assertEqual(self.group.member_count, 1)
+        self.assertEqual(place.recommendations_count, 1)
+
+    def test_profile_is_single_query_per_list(self):
+        for i in range(3):
+            group = TravelGroup.objects.create(name=f"g{i}")
+            GroupMember.objects.create(group=group, user=self.user)
+        self.client.force_login(self.user)
+
+        # 세션, 유저, 그룹 목록
+        with self.assertNumQueries(3):
+            resp = self.client.get(reverse("trip:profile"))
+        self.assertContains(resp, "(1 members)", count=4)
+
+
+class MembershipTests(GroupPlacesTestMixin, TestCase):
+    def test_role_is_cached(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(membership.get_role(self.user, self.group.pk), membership.ADMIN)
+        with self.assertNumQueries(0):
+            self.assertTrue(membership.is_member(self.user, self.group.pk))
+
+    def test_request_memo(self):
+        request = RequestFactory().get("/")
+        membership.is_member(self.user, self.group.pk, request)
+        membership.clear_cache()
+        with self.assertNumQueries(0):
+            self.assertTrue(membership.is_member(self.user, self.group.pk, request))
+
+    def test_invalidated_by_signals(self):
+        other = User.objects.create_user(username="other", password="pw")
+        self.assertFalse(membership.is_member(other, self.group.pk))
+
+        link = GroupMember.objects.create(group=self.group, user=other)
+        self.assertEqual(membership.get_role(other, self.group.pk), membership.MEMBER)
+
+        link.is_admin = True
+        link.save()
+        self.assertEqual(membership.get_role(other, self.group.pk), membership.ADMIN)
+
+        link.delete()
+        self.assertIsNone(membership.get_role(other, self.group.pk))
+
+    def test_invalidated_again_after_commit(self):
+        other = User.objects.create_user(username="other", password="pw")
+        link = GroupMember.objects.create(group=self.group, user=other)
+        self.assertTrue(membership.is_member(other, self.group.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            link.delete()
+            # 커밋 전에 다른 요청이 옛 행을 읽어 다시 캐시한 상황
+            membership._role_cache.set((other.pk, self.group.pk), membership.MEMBER)
+        self.assertIs(membership._role_cache.get((other.pk, self.group.pk)), MISSING)
+        self.assertFalse(membership.is_member(other, self.group.pk))
+
+    def test_lookup_racing_invalidation_is_not_cached(self):
+        key = (self.user.pk, self.group.pk)
+        real_first = QuerySet.first
+
+        def first_then_invalidate(queryset):
+            # 조회와 캐시 저장 사이에 다른 스레드가 무효화
+            row = real_first(queryset)
+            membership.invalidate(*key)
+            return row
+
+        with mock.patch.object(QuerySet, "first", first_then_invalidate):
+            self.assertEqual(membership.get_role(self.user, self.group.pk), membership.ADMIN)
+        self.assertIs(membership._role_cache.get(key), MISSING)
+
+    def test_anonymous(self):
+        with self.assertNumQueries(0):
+            self.assertFalse(membership.is_member(AnonymousUser(), self.group.pk))
+
+    def test_drf_permission(self):
+        link = self.add_place(1, 37.5, 127.0)
+        request = RequestFactory().get("/")
+        request.user = User.objects.create_user(username="other", password="pw")
+        permission = IsGroupMember()
+
+        self.assertFalse(permission.has_object_permission(request, None, link))
+        request.user = self.user
+        self.assertTrue(permission.has_object_permission(request, None, link))
+        self.assertTrue(permission.has_object_permission(request, None, self.group))
+
+
+class GroupDetailQueryTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(1, 11):
+            cls.add_place(i, 37.5 + i / 100, 127.0)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_place_list_queries(self):
+        url = reverse("trip:group_place_list", kwargs={"pk": self.group.pk})
+        # 세션, 유저, 그룹(+멤버십), 장소 페이지
+        with self.assertNumQueries(4):
+            resp = self.client.get(url)
+        self.assertEqual(len(resp.context["place_links"]), 10)
+
+    def test_map_queries(self):
+        url = reverse("trip:group_map", kwargs={"pk": self.group.pk})
+        # 세션, 유저, 그룹(+멤버십) — 장소는 JSON API에서 따로 읽는다
+        with self.assertNumQueries(3):
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_non_member(self):
+        other = User.objects.create_user(username="other", password="pw")
+        self.client.force_login(other)
+        url = reverse("trip:group_place_list", kwargs={"pk": self.group.pk})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_anonymous_is_redirected_to_login(self):
+        self.client.logout()
+        url = reverse("trip:group_place_list", kwargs={"pk": self.group.pk})
+        resp = self.client.get(url)
+        self.assertRedirects(resp, f"{reverse('accounts:login')}?next={url}", fetch_redirect_response=False)
+
+
+class PlaceImportTests(GroupPlacesTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.url = reverse("trip:place_import_api", kwargs={"group_pk": self.group.pk})
+
+    @staticmethod
+    def place(place_id, **extra):
+        return {"id": place_id, "name": f"p{place_id}", "address": "addr", "lat": 37.5, "lng": 127.0, **extra}
+
+    def test_json_array(self):
+        self.add_place(1, 37.5, 127.0)
+        Place.objects.create(id=2, name="known", address="addr", lat=Decimal("35.1"), lng=Decimal("129.0"))
+        items = [
+            {"place": self.place(1)},
+            {"place": {"id": 2}, "place_type": "cafe", "description": "known place"},
+            self.place(3, lat=33.5),
+            self.place(3),
+            {"place": {"id": 4, "name": "no coords"}},
+            {"place": self.place(5), "place_type": "nope"},
+        ]
+
+        # 항목 수와 상관없이 일정: 세션/유저/savepoint 2/그룹/멤버십/조회 2/insert 2/
+        # 기존 장소 순위 점수 복사/요약 2
+        with self.assertNumQueries(13):
+            resp = self.client.post(self.url, json.dumps(items), content_type="application/json")
+        data = resp.json()
+
+        self.assertEqual(data["created"], 2)
+        self.assertEqual(
+            [r["status"] for r in data["results"]],
+            ["already_saved", "created", "created", "duplicate", "error", "error"],
+        )
+        link = TravelGroupPlace.objects.get(travel_group=self.group, place_id=2)
+        self.assertEqual(link.place_type, "CAFE")
+        new_place = Place.objects.get(pk=3)
+        self.assertEqual(new_place.geocell, geocell(new_place.lat, new_place.lng))
+
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.place_count, 3)
+
+    def test_ndjson(self):
+        body = "\n".join(json.dumps(self.place(i)) for i in range(1, 4)) + "\n"
+        resp = self.client.post(self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(resp.json()["created"], 3)
+        self.assertEqual(TravelGroupPlace.objects.filter(travel_group=self.group).count(), 3)
+
+    def test_non_string_place_type_is_item_error(self):
+        items = [self.place(1), {"place": self.place(2), "place_type": 7}]
+        resp = self.client.post(self.url, json.dumps(items), content_type="application/json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([r["status"] for r in resp.json()["results"]], ["created", "error"])
+
+    def test_ndjson_stops_reading_over_limit(self):
+        lines = iter([json.dumps(self.place(i)).encode() + b"\n" for i in range(1, 6)])
+        read = []
+        request = mock.Mock(content_type="application/x-ndjson")
+        request.__iter__ = mock.Mock(return_value=(read.append(line) or line for line in lines))
+        with mock.patch.object(api, "MAX_IMPORT_ITEMS", 2):
+            items = api._read_import_items(request)
+        # 한도 + 1개까지만 읽고 나머지 줄은 건드리지 않는다
+        self.assertEqual(len(items), 3)
+        self.assertEqual(len(read), 3)
+
+        body = "\n".join(json.dumps(self.place(i)) for i in range(1, 6))
+        with mock.patch.object(api, "MAX_IMPORT_ITEMS", 2):
+            resp = self.client.post(self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_bad_body(self):
+        resp = self.client.post(self.url, "{nope", content_type="application/json")
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.post(self.url, json.dumps({"place": 1}), content_type="application/json")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_members_only(self):
+        self.client.force_login(User.objects.create_user(username="other", password="pw"))
+        resp = self.client.post(self.url, json.dumps([self.place(1)]), content_type="application/json")
+        self.assertEqual(resp.status_code, 403)
+
+
+class PlaceCreateApiTests(GroupPlacesTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.url = reverse("trip:place_create_api", kwargs={"group_pk": self.group.pk})
+
+    def post(self, place, **extra):
+        payload = {"place": place, "place_type": "cafe", "description": "", **extra}
+        return self.client.post(self.url, json.dumps(payload), content_type="application/json")
+
+    def test_create_then_already_saved(self):
+        place = {"id": 10, "name": "cafe", "address": "addr", "lat": 37.5, "lng": 127.0, "phone": "", "url": ""}
+        resp = self.post(place)
+        self.assertTrue(resp.json()["success"])
+        link = TravelGroupPlace.objects.get(travel_group=self.group, place_id=10)
+        self.assertEqual(link.place_type, "CAFE")
+        self.assertEqual(Place.objects.get(pk=10).geocell, geocell(37.5, 127.0))
+
+        # 조회 없이 INSERT 두 번으로 충돌을 확인한다
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.post(place)
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("이미", resp.json()["error"])
+        self.assertFalse([q for q in ctx.captured_queries if "trip_place" in q["sql"] and q["sql"].startswith("SELECT")])
+
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.place_count, 1)
+
+    def test_existing_place_without_details(self):
+        Place.objects.create(id=11, name="known", address="addr", lat=Decimal("37.5"), lng=Decimal("127.0"))
+        resp = self.post({"id": 11, "name": "known"})
+        self.assertTrue(resp.json()["success"])
+
+        resp = self.post({"id": 12, "name": "unknown"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(Place.objects.filter(pk=12).exists())
+
+    def test_existing_place_keeps_stored_coordinates_in_summary(self):
+        Place.objects.create(id=13, name="known", address="addr", lat=Decimal("37.5"), lng=Decimal("127.0"))
+        resp = self.post({"id": 13, "name": "known", "address": "addr", "lat": 10, "lng": 10})
+        self.assertTrue(resp.json()["success"])
+
+        summary = self.client.get(reverse("trip:group_place_summary_json", kwargs={"group_pk": self.group.pk})).json()
+        self.assertEqual(summary["count"], 1)
+        self.assertEqual(summary["bounds"], {"south": 37.5, "west": 127.0, "north": 37.5, "east": 127.0})
+        self.assertEqual(Place.objects.get(pk=13).lat, Decimal("37.5"))
+
+    def test_non_string_place_type(self):
+        place = {"id": 14, "name": "cafe", "address": "addr", "lat": 37.5, "lng": 127.0}
+        resp = self.post(place, place_type=7)
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(TravelGroupPlace.objects.filter(place_id=14).exists())
+
+    def test_members_only(self):
+        link = self.add_place(15, 37.5, 127.0)
+        self.client.force_login(User.objects.create_user(username="outsider", password="pw"))
+        resp = self.post({"id": 16, "name": "cafe", "address": "addr", "lat": 37.5, "lng": 127.0})
+        self.assertEqual(resp.status_code, 403)
+        self.assertFalse(TravelGroupPlace.objects.filter(place_id=16).exists())
+
+        url = reverse("trip:place_link_update_api", kwargs={"place_link_pk": link.pk})
+        payload = {"nickname": "hijacked", "place_type": "CAFE", "description": ""}
+        resp = self.client.post(url, json.dumps(payload), content_type="application/json")
+        self.assertEqual(resp.status_code, 403)
+        link.refresh_from_db()
+        self.assertNotEqual(link.nickname, "hijacked")
+
+
+@skipIf(connection.vendor == "sqlite", "SQLite는 동시 쓰기를 직렬화하지 못한다")
+class PlaceCreateApiConcurrencyTests(TransactionTestCase):
+    def test_parallel_duplicate_requests(self):
+        user = User.objects.create_user(username="member", password="pw")
+        group = TravelGroup.objects.create(name="Seoul", created_by=user)
+        GroupMember.objects.create(group=group, user=user)
+        url = reverse("trip:place_create_api", kwargs={"group_pk": group.pk})
+        body = json.dumps({
+            "place": {"id": 99, "name": "cafe", "address": "addr", "lat": 37.5, "lng": 127.0},
+            "place_type": "CAFE",
+        })
+
+        barrier = threading.Barrier(8)
+
+        def post():
+            client = Client()
+            client.force_login(user)
+            barrier.wait()
+            try:
+                return client.post(url, body, content_type="application/json").status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(lambda _: post(), range(8)))
+
+        self.assertEqual(sorted(statuses), [200] + [400] * 7)
+        self.assertEqual(TravelGroupPlace.objects.filter(travel_group=group, place_id=99).count(), 1)
+
+
+class KakaoStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+
+    def do_GET(self):
+        type(self).requests_seen.append((self.path, self.headers.get("Authorization")))
+        query = parse_qs(urlsplit(self.path).query)["query"][0]
+        if query == "boom":
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({
+            "documents": [{"id": "1", "place_name": query, "x": "127.0", "y": "37.5"}],
+            "meta": {"pageable_count": 1, "is_end": True},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PlaceSearchApiTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), KakaoStubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.enterClassContext(override_settings(
+            KAKAO_LOCAL_API_URL=f"http://127.0.0.1:{cls.server.server_port}",
+            KAKAO_REST_API_KEY="test-key",
+        ))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        kakao_maps_api.clear_search_cache()
+        KakaoStubHandler.requests_seen = []
+        self.client.force_login(self.user)
+
+    def test_search_is_cached_by_normalized_query(self):
+        url = reverse("trip:place_search_api")
+        data = self.client.get(url, {"q": "Seoul  Station Cafe"}).json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["documents"][0]["place_name"], "seoul station cafe")
+
+        self.client.get(url, {"q": " seoul station CAFE "})
+        self.assertEqual(len(KakaoStubHandler.requests_seen), 1)
+        self.assertEqual(KakaoStubHandler.requests_seen[0][1], "KakaoAK test-key")
+
+        self.client.get(url, {"q": "seoul station cafe", "page": 2})
+        self.assertEqual(len(KakaoStubHandler.requests_seen), 2)
+
+    def test_upstream_error(self):
+        resp = self.client.get(reverse("trip:place_search_api"), {"q": "boom"})
+        self.assertEqual(resp.status_code, 502)
+        self.assertFalse(resp.json()["success"])
+
+    def test_empty_query(self):
+        self.assertEqual(self.client.get(reverse("trip:place_search_api")).status_code, 400)
+
+
+class AutocompleteTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for place_id, name, address in [
+            (1, "Seoul Station Cafe", "Yongsan-gu"),
+            (2, "Station Burger", "Seoul Jung-gu"),
+            (3, "Busan Tower", "Jung-gu Busan"),
+            (4, "서울숲 카페", "성동구"),
+        ]:
+            Place.objects.create(id=place_id, name=name, address=address, lat=Decimal("37.5"), lng=Decimal("127.0"))
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def search(self, q):
+        resp = self.client.get(reverse("trip:place_autocomplete_api"), {"q": q})
+        return [r["id"] for r in resp.json()["results"]]
+
+    def test_ranked_name_before_address(self):
+        self.assertCountEqual(self.search("station"), [1, 2])
+        self.assertEqual(self.search("seoul"), [1, 2])
+        self.assertEqual(self.search("tower"), [3])
+        self.assertEqual(self.search("서울숲"), [4])
+
+    def test_index_follows_updates(self):
+        Place.objects.filter(pk=3).update(name="Busan Lighthouse")
+        self.assertEqual(self.search("tower"), [])
+        self.assertEqual(self.search("lighthouse"), [3])
+        Place.objects.filter(pk=3).delete()
+        self.assertEqual(self.search("lighthouse"), [])
+
+    def test_short_query(self):
+        self.assertEqual(self.search("bu")[0], 3)
+        self.assertEqual(self.search(" "), [])
+
+    def test_build_choices_marks_existing(self):
+        results = self.client.get(reverse("trip:place_autocomplete_api"), {"q": "tower"}).json()["results"]
+        results.append({"id": "999", "name": "new", "address": "", "existing": False})
+        self.assertEqual([value for value, _ in build_choices(results)], ["existing:3", "new"])
+
+
+class NearbyTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.city_hall = cls.add_place(1, 37.5665, 126.9780)
+        cls.deoksugung = cls.add_place(2, 37.5658, 126.9751)
+        cls.gangnam = cls.add_place(3, 37.4979, 127.0276)
+        cls.busan = cls.add_place(4, 35.1796, 129.0756)
+        other = TravelGroup.objects.create(name="other")
+        cls.add_place(5, 37.5660, 126.9770, group=other)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def get(self, **params):
+        url = reverse("trip:group_places_nearby_json", kwargs={"group_pk": self.group.pk})
+        return self.client.get(url, params)
+
+    def test_nearest_to_coordinate(self):
+        data = self.get(lat=37.5665, lng=126.9780, k=3).json()
+        self.assertEqual(
+            [p["link_id"] for p in data["places"]],
+            [self.city_hall.pk, self.deoksugung.pk, self.gangnam.pk],
+        )
+        self.assertEqual(data["places"][0]["distance_m"], 0)
+        self.assertAlmostEqual(data["places"][1]["distance_m"], 270, delta=10)
+
+    def test_nearest_to_link_expands_radius(self):
+        data = self.get(link=self.busan.pk, k=2).json()
+        self.assertEqual([p["link_id"] for p in data["places"]], [self.gangnam.pk, self.city_hall.pk])
+        self.assertAlmostEqual(data["places"][0]["distance_m"] / 1000, 316, delta=2)
+
+    def test_k_larger_than_group(self):
+        self.assertEqual(len(self.get(lat=0, lng=0, k=50).json()["places"]), 4)
+
+        # 그룹 전체가 필요하면 반경을 넓히지 않고 요약 + 거리순 쿼리 한 번
+        with self.assertNumQueries(2):
+            nearest = nearest_group_places(self.group.pk, 37.5665, 126.9780, 50, exclude_link_id=self.busan.pk)
+        self.assertEqual([row[0] for _, row in nearest], [self.city_hall.pk, self.deoksugung.pk, self.gangnam.pk])
+
+    def test_radius_steps_are_capped(self):
+        # 요약 + 반경 두 번 (요약의 bbox로 첫 반경을 잡으므로 1km부터 넓히지 않는다)
+        with self.assertNumQueries(3):
+            expanded = nearest_group_places(self.group.pk, 35.1796, 129.0756, 2, exclude_link_id=self.busan.pk)
+        # 반경으로 못 찾으면 경계 없는 거리순 쿼리로: 결과는 같다
+        with mock.patch.object(nearby, "MAX_RADIUS_STEPS", 0), self.assertNumQueries(2):
+            ordered = nearest_group_places(self.group.pk, 35.1796, 129.0756, 2, exclude_link_id=self.busan.pk)
+        self.assertEqual([row[0] for _, row in ordered], [row[0] for _, row in expanded])
+        self.assertEqual([row[0] for _, row in ordered], [self.gangnam.pk, self.city_hall.pk])
+
+    def test_bad_params(self):
+        self.assertEqual(self.get(lat="x", lng=1).status_code, 400)
+        self.assertEqual(self.get(lat=100, lng=1).status_code, 400)
+        self.assertEqual(self.get(link=999999).status_code, 404)
+
+
+class RouteTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # 경도 방향으로 한 줄, 생성 순서는 뒤섞어 둔다
+        cls.stops = {}
+        for place_id, step in ((1, 3), (2, 0), (3, 4), (4, 1), (5, 2)):
+            cls.stops[step] = cls.add_place(place_id, 37.5, 127.0 + step * 0.01)
+        cls.cafe = cls.add_place(6, 37.6, 127.0, place_type=TravelGroupPlace.PlaceType.CAFE)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def get(self, **params):
+        url = reverse("trip:group_place_route_json", kwargs={"group_pk": self.group.pk})
+        return self.client.get(url, params)
+
+    def test_members_only(self):
+        self.client.logout()
+        self.assertEqual(self.get().status_code, 302)
+        self.client.force_login(User.objects.create_user(username="outsider", password="pw"))
+        self.assertEqual(self.get().status_code, 403)
+
+    def test_links_in_line_order(self):
+        links = ",".join(str(self.stops[step].pk) for step in (2, 4, 0, 3, 1))
+        data = self.get(links=links, start="37.5,126.99").json()
+        self.assertEqual([s["link_id"] for s in data["stops"]], [self.stops[step].pk for step in range(5)])
+        # 출발점에서 첫 장소까지 + 0.01°씩 4구간 ≈ 5 * 0.88km
+        self.assertAlmostEqual(data["total_distance_m"], 5 * 884, delta=10)
+        self.assertAlmostEqual(sum(s["leg_m"] for s in data["stops"]), data["total_distance_m"], delta=len(data["stops"]))
+
+    def test_place_type_filter(self):
+        data = self.get(place_type="cafe").json()
+        self.assertEqual([s["link_id"] for s in data["stops"]], [self.cafe.pk])
+        self.assertEqual(data["total_distance_m"], 0)
+
+    def test_bad_params(self):
+        self.assertEqual(self.get(links="1,x").status_code, 400)
+        self.assertEqual(self.get(start="100,0").status_code, 400)
+        self.assertEqual(self.get(place_type="nope").status_code, 400)
+
+    def test_optimize_500_stops(self):
+        import random
+        rng = random.Random(0)
+        coords = [(37.4 + rng.random() * 0.3, 126.8 + rng.random() * 0.4) for _ in range(500)]
+        dist = with_start(distance_matrix(coords))
+        tour, total = optimize_route(dist, time_budget=0.3)
+        self.assertEqual(sorted(tour), list(range(501)))
+        self.assertEqual(tour[0], 0)
+        self.assertAlmostEqual(total, tour_length(tour, dist))
+        self.assertLess(total, tour_length(list(range(501)), dist))
+
+    def test_cache_bounded_by_bytes(self):
+        matrix = distance_matrix([(37.5, 127.0), (37.5, 127.01), (37.5, 127.02)])
+        self.assertEqual(len(matrix), 9)
+        cache = LRUTTLCache(maxsize=100, ttl=60, maxweight=2 * len(matrix) * 8, weigh=lambda m: len(m) * m.itemsize)
+        for key in range(3):
+            cache.set(key, matrix)
+        # 항목 수는 여유가 있어도 바이트 상한을 넘으면 오래된 것부터 버린다
+        self.assertIs(cache.get(0), MISSING)
+        self.assertIs(cache.get(2), matrix)
+        self.assertEqual(cache.weight, 2 * len(matrix) * 8)
+        # 상한보다 큰 행렬은 저장하지 않는다
+        cache.set("big", distance_matrix([(37.5, 127.0 + i * 0.01) for i in range(6)]))
+        self.assertIs(cache.get("big"), MISSING)
+        self.assertIs(cache.get(1), matrix)
+
+
+class DayPlanTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # 서울 도심 4곳 + 부산 4곳, 부산 숙소 하나
+        cls.seoul = [cls.add_place(i, 37.56 + i * 0.001, 126.97) for i in range(1, 5)]
+        cls.busan = [cls.add_place(i, 35.15 + i * 0.001, 129.05) for i in range(5, 8)]
+        cls.busan.append(cls.add_place(8, 35.16, 129.06, place_type=TravelGroupPlace.PlaceType.ACCOMMODATION))
+
+    def post(self, **data):
+        url = reverse("trip:place_day_plan_api", kwargs={"group_pk": self.group.pk})
+        return self.client.post(url, json.dumps(data), content_type="application/json")
+
+    def test_balanced_sizes(self):
+        coords = [(37.5, 127.0 + i * 0.0001) for i in range(6)] + [(35.1, 129.0), (35.1, 129.001)]
+        labels = balanced_kmeans(coords, 2)
+        self.assertEqual(sorted(labels.count(c) for c in set(labels)), [4, 4])
+        self.assertEqual(labels, balanced_kmeans(coords, 2))
+
+    def test_anchors_pinned_to_separate_days(self):
+        coords = [(37.5, 127.0), (37.5001, 127.0), (37.5002, 127.0), (37.5003, 127.0)]
+        labels = balanced_kmeans(coords, 2, anchors=[0, 1])
+        self.assertNotEqual(labels[0], labels[1])
+
+    def test_plan_is_persisted_and_idempotent(self):
+        self.client.force_login(self.user)
+        data = self.post(days=2).json()
+        self.assertEqual(data["changed"], 8)
+        self.assertEqual(
+            [sorted(d["link_ids"]) for d in data["days"]],
+            [sorted(l.pk for l in self.seoul), sorted(l.pk for l in self.busan)],
+        )
+
+        places = self.client.get(reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk})).json()
+        self.assertEqual({p["link_id"]: p["day"] for p in places["places"]}[self.busan[0].pk], 2)
+
+        version = TravelGroup.objects.get(pk=self.group.pk).places_version
+        self.assertEqual(self.post(days=2).json()["changed"], 0)
+        self.assertEqual(TravelGroup.objects.get(pk=self.group.pk).places_version, version)
+
+    def test_requires_membership_and_valid_days(self):
+        outsider = User.objects.create_user(username="outsider", password="pw")
+        self.client.force_login(outsider)
+        self.assertEqual(self.post(days=2).status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.post(days=0).status_code, 400)
+        self.assertEqual(self.post().status_code, 400)
+
+
+class LeaderboardTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.users = [User.objects.create_user(username=f"fan{i}", password="pw") for i in range(3)]
+        cls.a = cls.add_place(1, 37.5, 127.0)
+        cls.b = cls.add_place(2, 37.5, 127.1)
+        cls.c = cls.add_place(3, 37.5, 127.2)
+        cls.other = TravelGroup.objects.create(name="other")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def top(self, group=None, **params):
+        url = reverse("trip:group_place_top_json", kwargs={"group_pk": (group or self.group).pk})
+        return [p["link_id"] for p in self.client.get(url, params).json()["places"]]
+
+    def recommend(self, link, *users):
+        for user in users:
+            Recommendation.objects.create(place_id=link.place_id, user=user)
+
+    def test_incremental_updates(self):
+        self.recommend(self.b, *self.users)
+        self.recommend(self.c, self.users[0])
+        self.assertEqual(self.top(), [self.b.pk, self.c.pk, self.a.pk])
+        self.assertEqual(self.top(k=1), [self.b.pk])
+
+        Recommendation.objects.filter(place_id=self.b.place_id).delete()
+        self.assertEqual(self.top(), [self.c.pk, self.a.pk, self.b.pk])
+
+    def test_new_link_copies_existing_count(self):
+        self.recommend(self.c, *self.users[:2])
+        link = TravelGroupPlace.objects.create(travel_group=self.other, place_id=self.c.place_id)
+        self.assertEqual(TravelGroupPlace.objects.get(pk=link.pk).recommendations_count, 2)
+
+        # 카운터는 장소 단위라 다른 그룹의 사본도 함께 움직인다
+        self.recommend(self.c, self.users[2])
+        self.assertEqual(TravelGroupPlace.objects.get(pk=link.pk).recommendations_count, 3)
+
+    def test_reads_constant_queries(self):
+        # 세션/유저/멤버십/순위
+        with self.assertNumQueries(4):
+            self.top(k=50)
+
+    def test_reconcile_rebuilds_scores(self):
+        self.recommend(self.a, self.users[0])
+        TravelGroupPlace.objects.update(recommendations_count=7)
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        self.assertIn("TravelGroupPlace: 3 row(s) fixed", out.getvalue())
+        self.assertEqual(self.top(), [self.a.pk, self.b.pk, self.c.pk])
+
+
+class RecommendApiTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.link = cls.add_place(1, 37.5, 127.0)
+        cls.add_place(2, 37.5, 127.1)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def recommend(self, place_id, recommended):
+        url = reverse("trip:place_recommend_api", kwargs={"place_pk": place_id})
+        return self.client.post(url, json.dumps({"recommended": recommended}), content_type="application/json")
+
+    def sync(self, items):
+        url = reverse("trip:recommendation_sync_api")
+        return self.client.post(url, json.dumps(items), content_type="application/json")
+
+    def test_double_click_is_idempotent(self):
+        first, second = self.recommend(1, True).json(), self.recommend(1, True).json()
+        self.assertEqual((first["changed"], first["count"]), (True, 1))
+        self.assertEqual((second["changed"], second["count"]), (False, 1))
+
+        self.assertEqual(self.recommend(1, False).json()["count"], 0)
+        self.assertEqual(self.recommend(1, False).json()["changed"], False)
+
+        self.assertFalse(Recommendation.objects.exists())
+        self.assertEqual(TravelGroupPlace.objects.get(pk=self.link.pk).recommendations_count, 0)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.recommend(1, "yes").status_code, 400)
+        self.assertEqual(self.recommend(999, True).status_code, 404)
+        self.assertEqual(self.sync({"place_id": 1}).status_code, 400)
+
+    def test_sync(self):
+        self.recommend(2, True)
+        data = self.sync([
+            {"place_id": 1, "recommended": False},
+            {"place_id": 1, "recommended": True},
+            {"place_id": 2, "recommended": True},
+            {"place_id": 999, "recommended": True},
+        ]).json()
+        self.assertEqual(data["results"], [
+            {"place_id": 1, "status": "changed", "count": 1},
+            {"place_id": 2, "status": "unchanged", "count": 1},
+            {"place_id": 999, "status": "not_found"},
+        ])
+
+
+@skipIf(connection.vendor == "sqlite", "SQLite는 동시 쓰기를 직렬화하지 못한다")
+class RecommendApiConcurrencyTests(TransactionTestCase):
+    def test_parallel_toggles_keep_count(self):
+        user = User.objects.create_user(username="member", password="pw")
+        place = Place.objects.create(id=1, name="cafe", address="addr", lat=37.5, lng=127.0)
+        url = reverse("trip:place_recommend_api", kwargs={"place_pk": place.pk})
+
+        barrier = threading.Barrier(8)
+
+        def post(recommended):
+            client = Client()
+            client.force_login(user)
+            barrier.wait()
+            try:
+                body = json.dumps({"recommended": recommended})
+                return client.post(url, body, content_type="application/json").status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(post, [True, False] * 4))
+
+        self.assertEqual(statuses, [200] * 8)
+        place.refresh_from_db()
+        self.assertEqual(place.recommendations_count, Recommendation.objects.filter(place=place).count())
+
+
+class DrfApiTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.cafe = cls.add_place(1, 37.5, 127.0, place_type=TravelGroupPlace.PlaceType.CAFE)
+        cls.park = cls.add_place(2, 37.6, 127.1, place_type=TravelGroupPlace.PlaceType.PARK)
+        Recommendation.objects.create(place=cls.cafe.place, user=cls.user)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def places_url(self, group=None):
+        return reverse("trip:api-group-place-list", kwargs={"group_pk": (group or self.group).pk})
+
+    def test_lean_list_matches_detail(self):
+        for list_url, detail_url in (
+            (reverse("trip:api-group-list"), reverse("trip:api-group-detail", kwargs={"pk": self.group.pk})),
+            (self.places_url(), reverse(
+                "trip:api-group-place-detail", kwargs={"group_pk": self.group.pk, "pk": self.cafe.pk},
+            )),
+            (reverse("trip:api-recommendation-list"), reverse(
+                "trip:api-recommendation-detail", kwargs={"pk": Recommendation.objects.get().pk},
+            )),
+        ):
+            with self.subTest(list_url):
+                listed = self.client.get(list_url).json()["results"][0]
+                self.assertEqual(listed, self.client.get(detail_url).json())
+
+        place = self.client.get(self.places_url()).json()["results"][0]
+        self.assertEqual(place["recommendations_count"], 1)
+        self.assertEqual(place["place"]["lat"], "37.500000")
+
+    def test_list_queries_do_not_grow_with_page(self):
+        # 세션/유저/멤버십/COUNT/페이지
+        with self.assertNumQueries(5):
+            self.client.get(self.places_url())
+        for i in range(3, 15):
+            self.add_place(i, 37.5, 127.0 + i * 0.01)
+        membership.clear_cache()
+        with self.assertNumQueries(5):
+            self.assertEqual(len(self.client.get(self.places_url()).json()["results"]), 10)
+
+    def test_filter_and_membership(self):
+        data = self.client.get(self.places_url(), {"place_type": "PARK"}).json()
+        self.assertEqual([p["id"] for p in data["results"]], [self.park.pk])
+
+        other = TravelGroup.objects.create(name="other")
+        self.assertEqual(self.client.get(self.places_url(other)).status_code, 403)
+        self.assertEqual(
+            self.client.get(reverse("trip:api-group-detail", kwargs={"pk": other.pk})).status_code, 404,
+        )
+
+    def test_recommendations_scoped_to_my_groups(self):
+        # 같은 장소가 내 그룹 두 곳에 담겨 있어도 추천은 한 번만
+        second = TravelGroup.objects.create(name="second", created_by=self.user)
+        GroupMember.objects.create(group=second, user=self.user)
+        TravelGroupPlace.objects.create(travel_group=second, place=self.cafe.place, created_by=self.user)
+        # 내가 속하지 않은 그룹에만 담긴 장소의 추천은 보이지 않는다
+        outsider = User.objects.create_user(username="outsider", password="pw")
+        hidden = TravelGroup.objects.create(name="hidden", created_by=outsider)
+        hidden_place = self.add_place(99, 35.1, 129.0, group=hidden)
+        hidden_rec = Recommendation.objects.create(place=hidden_place.place, user=outsider)
+
+        data = self.client.get(reverse("trip:api-recommendation-list")).json()
+        self.assertEqual([r["place"] for r in data["results"]], [self.cafe.place_id])
+        detail = reverse("trip:api-recommendation-detail", kwargs={"pk": hidden_rec.pk})
+        self.assertEqual(self.client.get(detail).status_code, 404)
+
+        # 그룹 밖 사용자에게는 내 그룹 장소의 추천도 보이지 않는다
+        self.client.force_login(outsider)
+        data = self.client.get(reverse("trip:api-recommendation-list")).json()
+        self.assertEqual([r["place"] for r in data["results"]], [])
+
+
+class RendererTests(TestCase):
+    def test_dumps_decimal_as_number(self):
+        data = {"lat": Decimal("37.566500"), "name": "시청", 1: None}
+        self.assertEqual(json.loads(dumps(data)), {"lat": 37.5665, "name": "시청", "1": None})
+
+    def test_stdlib_fallback_matches(self):
+        import importlib
+        import sys
+        from . import renderers
+
+        data = {"lat": Decimal("1.5"), "items": [1, "가"]}
+        try:
+            with mock.patch.dict(sys.modules, {"orjson": None}):
+                importlib.reload(renderers)
+            self.assertIsNone(renderers.orjson)
+            fallback = renderers.dumps(data)
+        finally:
+            importlib.reload(renderers)
+        self.assertEqual(json.loads(fallback), json.loads(dumps(data)))
+
+    def test_drf_renderer(self):
+        self.assertEqual(FastJSONRenderer().render({"lat": Decimal("1.5")}), b'{"lat":1.5}')
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+
+class ColumnarFormatTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cafe = TravelGroupPlace.PlaceType.CAFE
+        for i in range(1, 201):
+            cls.add_place(i, 37.4 + i * 0.000731, 126.8 + i * 0.001237, cafe if i % 3 else TravelGroupPlace.PlaceType.PARK)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def url(self):
+        return reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk})
+
+    def decode(self, data):
+        coords = decode_polyline(data["coords"])
+        types = data["place_type"]
+        return [
+            {
+                "link_id": data["link_id"][i], "place_id": data["place_id"][i], "name": data["name"][i],
+                "address": data["address"][i], "lat": coords[i][0], "lng": coords[i][1],
+                "place_type": types["values"][types["codes"][i]],
+                "description": data["description"][i], "day": data["day"][i],
+            }
+            for i in range(data["count"])
+        ]
+
+    def test_polyline_reference(self):
+        # Google 문서의 예시 (precision 5)
+        coords = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+        self.assertEqual(encode_polyline(coords, precision=5), "_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+        self.assertEqual(decode_polyline(encode_polyline(coords, precision=5), precision=5), coords)
+
+    def test_same_places_in_smaller_body(self):
+        rows = self.client.get(self.url())
+        columnar = self.client.get(self.url(), {"format": "columnar"})
+        self.assertEqual(columnar["Content-Type"], "application/vnd.plantogether.columnar+json")
+        self.assertEqual(self.decode(columnar.json()), rows.json()["places"])
+        self.assertLess(len(columnar.content) * 2, len(rows.content))
+
+    def test_accept_negotiation_and_etag(self):
+        rows = self.client.get(self.url())
+        columnar = self.client.get(self.url(), HTTP_ACCEPT="application/vnd.plantogether.columnar+json")
+        self.assertEqual(columnar.json()["format"], "columnar")
+        self.assertIn("Accept", rows["Vary"])
+        self.assertNotEqual(rows["ETag"], columnar["ETag"])
+
+        resp = self.client.get(self.url(), {"format": "columnar"}, HTTP_IF_NONE_MATCH=columnar["ETag"])
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(self.client.get(self.url(), HTTP_IF_NONE_MATCH=columnar["ETag"]).status_code, 200)
+
+    def test_cursor_page(self):
+        data = self.client.get(self.url(), {"format": "columnar", "limit": 50}).json()
+        self.assertEqual(data["count"], 50)
+        self.assertIsNotNone(data["next"])
+
+
+class CompressionTests(GroupPlacesTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(1, 101):
+            cls.add_place(i, 37.5 + i * 0.001, 127.0)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def url(self):
+        return reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk})
+
+    def test_large_json_is_gzipped(self):
+        import gzip
+
+        resp = self.client.get(self.url(), HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", resp["Vary"])
+        self.assertEqual(len(json.loads(gzip.decompress(resp.content))["places"]), 100)
+
+        # 약한 ETag로 바뀌어도 재검증은 그대로 된다
+        self.assertTrue(resp["ETag"].startswith("W/"))
+        resp = self.client.get(self.url(), HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, 304)
+
+    def test_small_or_unaccepted_responses_untouched(self):
+        summary = reverse("trip:group_place_summary_json", kwargs={"group_pk": self.group.pk})
+        self.assertFalse(self.client.get(summary, HTTP_ACCEPT_ENCODING="gzip").has_header("Content-Encoding"))
+        self.assertFalse(self.client.get(self.url()).has_header("Content-Encoding"))
+
+    @skipIf(middleware.brotli is None, "brotli 미설치")
+    def test_brotli_preferred(self):
+        resp = self.client.get(self.url(), HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(resp["Content-Encoding"], "br")
+
+    def test_brotli_only_for_json(self):
+        import importlib
+        import sys
+        import types
+        import zlib
+
+        # brotli가 없어도 분기를 검사할 수 있도록 sys.modules에 가짜 모듈을 넣는다
+        fake = types.ModuleType("brotli")
+        fake.compress = lambda data, quality: zlib.compress(data)
+        try:
+            with mock.patch.dict(sys.modules, {"brotli": fake}):
+                importlib.reload(middleware)
+            resp = self.client.get(self.url(), HTTP_ACCEPT_ENCODING="gzip, br")
+            self.assertEqual(resp["Content-Encoding"], "br")
+            self.assertEqual(len(json.loads(zlib.decompress(resp.content))["places"]), 100)
+
+            # HTML(CSRF 토큰)은 BREACH 패딩이 들어가는 gzip으로
+            self.client.force_login(self.user)
+            page = reverse("trip:group_place_list", kwargs={"pk": self.group.pk})
+            resp = self.client.get(page, HTTP_ACCEPT_ENCODING="gzip, br")
+            self.assertEqual(resp["Content-Encoding"], "gzip")
+        finally:
+            importlib.reload(middleware)
+
+
+class CompressedStaticStorageTests(TestCase):
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        import gzip
+        import tempfile
+        from pathlib import Path
+
+        with tempfile.TemporaryDirectory() as root, override_settings(
+            STATIC_ROOT=root,
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {"BACKEND": "trip.storage.CompressedManifestStaticFilesStorage"},
+            },
+        ):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            manifest = json.loads((Path(root) / "staticfiles.json").read_text())["paths"]
+
+            hashed = Path(root) / manifest["trip/group_map.js"]
+            self.assertRegex(hashed.name, r"^group_map\.[0-9a-f]{12}\.js$")
+            self.assertEqual(gzip.decompress(Path(f"{hashed}.gz").read_bytes()), hashed.read_bytes())
+            # 작은 파일(font.css)은 압축본을 만들지 않는다
+            self.assertFalse(Path(root, manifest["css/font.css"] + ".gz").exists())
+
+
+class DbPoolTests(TestCase):
+    def setUp(self):
+        self.url = reverse("trip:db_pool_stats_api")
+        self.staff = User.objects.create_user(username="staff", password="pw", is_staff=True)
+
+    def test_staff_only(self):
+        self.client.force_login(User.objects.create_user(username="member", password="pw"))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_persistent_connection_stats(self):
+        self.client.force_login(self.staff)
+        with mock.patch.dict(connection.settings_dict, {"CONN_MAX_AGE": 60}):
+            stats = self.client.get(self.url).json()["databases"][0]
+        self.assertEqual((stats["alias"], stats["mode"], stats["conn_max_age"]), ("default", "persistent", 60))
+        self.assertIn("connections_opened", stats)
+
+    def test_psycopg_pool_stats(self):
+        class FakePool:
+            def get_stats(self):
+                return {
+                    "pool_min": 2, "pool_max": 10, "pool_size": 4, "pool_available": 1,
+                    "requests_waiting": 0, "requests_num": 120, "requests_wait_ms": 35, "requests_errors": 2,
+                }
+
+        self.client.force_login(self.staff)
+        with mock.patch.object(connection, "pool", FakePool(), create=True):
+            stats = self.client.get(self.url).json()["databases"][0]
+        self.assertEqual(stats["mode"], "pool")
+        self.assertEqual((stats["in_use"], stats["idle"]), (3, 1))
+        self.assertEqual((stats["wait_ms"], stats["checkout_failures"]), (35, 2))
+
+
+class BenchDbCommandTests(TransactionTestCase):
+    # 명령이 실제로 연결을 닫았다 다시 열므로 트랜잭션으로 감싸지 않는다
+    def test_compares_with_per_request_connections(self):
+        out = StringIO()
+        with mock.patch.dict(connection.settings_dict, {"CONN_MAX_AGE": 60}):
+            call_command("bench_db", requests=5, stdout=out)
+        self.assertIn("persistent", out.getvalue())
+        self.assertIn("per_request", out.getvalue())
+
+
+class QueryStatsTests(GroupPlacesTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_query_shape(self):
+        self.assertEqual(
+            query_shape('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND name = \'a\''),
+            query_shape('SELECT * FROM "t"  WHERE "id" IN (1, 2) AND name = \'bb\''),
+        )
+
+    def test_assert_max_queries_reports_n_plus_one(self):
+        for i in range(1, 4):
+            self.add_place(i, 37.5, 127.0)
+        with self.assertRaisesMessage(AssertionError, "possible N+1"):
+            with assert_max_queries(10, max_repeats=1):
+                for link in TravelGroupPlace.objects.all():
+                    link.place.name
+        with self.assertRaisesMessage(AssertionError, "at most 1 expected"):
+            with assert_max_queries(1):
+                list(Place.objects.all())
+                list(Place.objects.all())
+
+    def test_group_pages_do_not_grow_with_places(self):
+        urls = [
+            reverse("trip:group_place_list", kwargs={"pk": self.group.pk}),
+            reverse("trip:group_map", kwargs={"pk": self.group.pk}),
+            reverse("trip:group_places_json", kwargs={"group_pk": self.group.pk}),
+        ]
+        for count in (1, 30):
+            for i in range(TravelGroupPlace.objects.count() + 1, count + 1):
+                self.add_place(i, 37.5 + i / 1000, 127.0)
+            for url in urls:
+                membership.clear_cache()
+                with self.subTest(url=url, places=count), assert_max_queries(5, max_repeats=1):
+                    self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(DEBUG=True)
+    def test_debug_headers(self):
+        url = reverse("trip:group_place_summary_json", kwargs={"group_pk": self.group.pk})
+        resp = self.client.get(url)
+        self.assertGreater(int(resp["X-SQL-Queries"]), 0)
+        self.assertIn("X-SQL-Time-Ms", resp)
+        self.assertFalse(resp.has_header("X-SQL-Repeated"))
+
+    @override_settings(SQL_N_PLUS_ONE_THRESHOLD=3)
+    def test_logs_n_plus_one(self):
+        def view(request):
+            for pk in (1, 2, 3):
+                Place.objects.filter(pk=pk).first()
+            return HttpResponse("ok")
+
+        request = RequestFactory().get("/n-plus-one/")
+        with self.assertLogs("trip.sql", "INFO") as logs:
+            middleware.QueryStatsMiddleware(view)(request)
+        record = logs.records[0]
+        self.assertEqual(record.levelname, "WARNING")
+        self.assertEqual(record.sql_stats["queries"], 3)
+        self.assertEqual(record.sql_stats["repeated"][0]["count"], 3)
+
+
+class SyntheticBenchmarkTests(TestCase):
+    def generate(self, **options):
+        options = {"users": 10, "groups": 3, "places": 200, "places_per_group": 10, "big_group": 40, **options}
+        call_command("generate_data", stdout=StringIO(), **options)
+
+    def test_generate_data(self):
+        self.generate()
+        self.assertEqual(Place.objects.count(), 200)
+        self.assertEqual(TravelGroup.objects.count(), 3)
+
+        # bulk로 넣었어도 카운터/요약/geocell은 맞아야 한다
+        from .services import reconcile_counters
+
+        self.assertEqual(set(reconcile_counters().values()), {0})
+        for group in TravelGroup.objects.all():
+            self.assertEqual(group.place_count, group.place_links.count())
+            self.assertIsNotNone(group.bbox_south)
+        place = Place.objects.first()
+        self.assertEqual(place.geocell, geocell(place.lat, place.lng))
+
+        with self.assertRaises(CommandError):
+            self.generate()
+        self.generate(flush=True, places=100)
+        self.assertEqual(Place.objects.count(), 100)
+
+    def test_bench_views_writes_results(self):
+        import tempfile
+
+        self.generate()
+        with tempfile.NamedTemporaryFile(suffix=".json") as f:
+            call_command("bench_views", repeat=1, warmup=0, output=f.name, stdout=StringIO())
+            with open(f.name, encoding="utf-8") as result_file:
+                report = json.load(result_file)
+
+        self.assertEqual(report["dataset"]["places"], 200)
+        self.assertIn("commit", report["environment"])
+        self.assertEqual({r["status"] for r in report["results"].values()}, {200})
+        self.assertEqual(report["results"]["group_places_json"]["count"], 1)
+        self.assertGreater(report["results"]["group_place_list"]["queries"], 0)
+
+
+class LoadGenTests(TransactionTestCase):
+    # 세션마다 스레드에서 따로 DB 연결을 여므로 트랜잭션으로 감싸지 않는다
+    def setUp(self):
+        call_command(
+            "generate_data", users=4, groups=1, places=50, places_per_group=10, members_per_group=3,
+            big_group=10, stdout=StringIO(),
+        )
+
+    def test_classify(self):
+        from .loadgen import DUPLICATE_MESSAGE, classify
+
+        self.assertEqual(classify(304, b""), "ok")
+        self.assertEqual(classify(400, json.dumps({"error": DUPLICATE_MESSAGE}, ensure_ascii=False).encode()), "duplicate")
+        self.assertEqual(classify(500, b"<title>IntegrityError\n    at /api/groups/1/places_create/</title>"), "IntegrityError")
+        self.assertEqual(classify(500, b"Server Error (500)"), "http_500")
+
+    def test_in_process_sessions(self):
+        from .loadgen import run_load
+
+        # 중복 추가 400 등 예상된 응답 로그는 숨긴다
+        # 테스트 DB(SQLite 메모리 공유 캐시)는 동시 쓰기에서 테이블 잠금 오류를 내므로 세션을 차례로 돌리고
+        # 집계만 확인한다 (동시 실행은 실제 DB에서 loadtest 명령으로 잰다)
+        with mock.patch.object(logging.getLogger("django.request"), "disabled", True):
+            report = run_load(users=2, duration=30, iterations=12, seed=1, workers=1)
+        endpoints = report["endpoints"]
+
+        self.assertEqual(report["sessions"], 2)
+        self.assertEqual(endpoints["login"]["outcomes"], {"ok": 2})
+        self.assertEqual(endpoints["group_map"]["count"], 2)
+        actions = sum(
+            endpoints[name]["count"] for name in ("group_places_json", "place_create_api", "place_link_update_api")
+            if name in endpoints
+        )
+        self.assertEqual(actions, 2 + 2 * 12)  # 첫 폴링 + 세션당 12번
+        for stats in endpoints.values():
+            self.assertLessEqual(stats["p50"], stats["p99"])
+            self.assertIn("throughput", stats)
+
+    @override_settings(ALLOWED_HOSTS=["127.0.0.1"])
+    def test_loopback_server(self):
+        out = StringIO()
+        call_command("loadtest", users=1, iterations=3, think_ms=0, serve=True, stdout=out)
+        self.assertIn("http://127.0.0.1:", out.getvalue())
+        self.assertIn("group_places_json", out.getvalue())
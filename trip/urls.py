@@ -1,10 +1,19 @@
 # urls.py
-from django.urls import path
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
 from . import views
 from . import api
+from . import viewsets
 
 app_name = 'trip'
 
+# DRF 읽기 API (/api/v1/)
+router = DefaultRouter()
+router.register('groups', viewsets.TravelGroupViewSet, basename='api-group')
+router.register(r'groups/(?P<group_pk>\d+)/places', viewsets.TravelGroupPlaceViewSet, basename='api-group-place')
+router.register('recommendations', viewsets.RecommendationViewSet, basename='api-recommendation')
+
 urlpatterns = [
     # 홈 페이지
     path("", views.index, name="index"),
@@ -25,10 +34,37 @@ urlpatterns = [
 
     # 장소 리스트 API
     path('groups/<int:group_pk>/places/json/', api.group_places_json, name='group_places_json'),
+    path('groups/<int:group_pk>/places/clusters/', api.group_place_clusters_json, name='group_place_clusters_json'),
+    path('groups/<int:group_pk>/places/summary/', api.group_place_summary_json, name='group_place_summary_json'),
+    path('groups/<int:group_pk>/places/nearby/', api.group_places_nearby_json, name='group_places_nearby_json'),
+    path('groups/<int:group_pk>/places/top/', api.group_place_top_json, name='group_place_top_json'),
+    path('groups/<int:group_pk>/places/route/', api.group_place_route_json, name='group_place_route_json'),
 
     # 장소 생성 API
     path('api/groups/<int:group_pk>/places_create/', api.group_place_create_api, name="place_create_api"),
 
+    # 장소 일괄 가져오기 API (JSON 배열 / NDJSON)
+    path('api/groups/<int:group_pk>/places_import/', api.group_place_import_api, name='place_import_api'),
+
+    # 장소 검색 API (카카오 로컬 API 프록시)
+    path('api/places/search/', api.place_search_api, name='place_search_api'),
+
+    # 저장된 장소 자동완성 API (DB 텍스트 인덱스)
+    path('api/places/autocomplete/', api.place_autocomplete_api, name='place_autocomplete_api'),
+
+    # 일정(일차) 자동 분배 API
+    path('api/groups/<int:group_pk>/day_plan/', api.group_place_day_plan_api, name='place_day_plan_api'),
+
+    # 추천 API (단건 / 일괄 동기화)
+    path('api/places/<int:place_pk>/recommend/', api.place_recommend_api, name='place_recommend_api'),
+    path('api/recommendations/sync/', api.recommendation_sync_api, name='recommendation_sync_api'),
+
     # 장소 수정 API
     path('api/edit_place_link/<int:place_link_pk>/', api.group_place_update_api, name='place_link_update_api'),
+
+    # DB 연결/풀 통계 (스태프)
+    path('api/db/pool/', api.db_pool_stats_api, name='db_pool_stats_api'),
+
+    # DRF 읽기 API
+    path('api/v1/', include(router.urls)),
 ]
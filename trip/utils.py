@@ -1,17 +1,19 @@
-from .models import GroupMember, TravelGroup
+from . import membership
+from .models import TravelGroup
 
 
-def is_group_member(user, group: TravelGroup) -> bool:
+def is_group_member(user, group: TravelGroup, request=None) -> bool:
     """
-        해당 유저가 그룹에 속해 있는지 확인
+        해당 유저가 그룹에 속해 있는지 확인 (trip.membership 캐시 사용)
     """
-    return GroupMember.objects.filter(group=group, user=user).exists()
+    return membership.is_member(user, group.pk, request)
 
 
 def build_choices(results):
     choices = []
     for r in results:
-        if "id" in r and r["id"]:  # 기존 DB Place
+        # 자동완성/검색 API가 "existing"을 표시해 주면 그 값을, 없으면 id 유무로 판단
+        if r.get("existing", bool(r.get("id"))):  # 기존 DB Place
             label = f"⭐ {r['name']} ({r.get('address', '')})"
             choices.append((f"existing:{r['id']}", label))
         else:  # 새로 생성할 후보 (Kakao API 결과 등)
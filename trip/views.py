@@ -1,16 +1,18 @@
 # views.py
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.db.models import Count, OuterRef, Subquery
 from django.http import Http404, HttpResponseNotAllowed
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 
 import config.settings as settings
+from . import membership
 from .models import TravelGroup, GroupMember, Place, TravelGroupPlace, Recommendation
 from .forms import GroupForm, PlaceNameQueryForm, PlaceAddressQueryForm, PlaceSearchResultForm, TravelGroupPlaceForm
 from .mixins import GroupMemberRequiredMixin
+from .pagination import keyset_paginate
 from .kakao_maps_api import search_places
 from .utils import build_choices
 
@@ -55,17 +57,34 @@ class GroupDetailView(LoginRequiredMixin, DetailView):
     context_object_name = 'group'
 
     def get_queryset(self):
-        return (
-            TravelGroup.objects
-            .prefetch_related(
-                "members",
-                "place_links__place",    # TravelGroupPlace + Place까지 한 번에
-            )
+        # 그룹과 내 멤버십(is_admin, 멤버가 아니면 None)을 한 쿼리로
+        return TravelGroup.objects.annotate(
+            member_is_admin=Subquery(
+                GroupMember.objects
+                .filter(group=OuterRef("pk"), user_id=self.request.user.pk)
+                .values("is_admin")[:1]
+            ),
         )
 
+    def get_object(self, queryset=None):
+        # dispatch에서 읽은 그룹을 get()에서도 그대로 사용
+        if getattr(self, "object", None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
+
+    def get_place_links(self):
+        # 요청 하나에서 같은 장소 queryset을 재사용
+        if not hasattr(self, "_place_links"):
+            self._place_links = self.object.place_links.select_related("place")
+        return self._place_links
+
     def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
         group = self.get_object()
-        if not group.members.filter(id=request.user.id).exists():
+        # 함께 읽은 역할을 요청 메모에 넣어 같은 요청의 템플릿/하위 뷰 멤버십 확인도 쿼리 없이
+        membership.remember(request.user, group.pk, membership.role_from_is_admin(group.member_is_admin), request)
+        if not membership.is_member(request.user, group.pk, request):
             raise Http404("그룹 멤버만 볼 수 있습니다.")
         return super().dispatch(request, *args, **kwargs)
 
@@ -73,13 +92,20 @@ class GroupDetailView(LoginRequiredMixin, DetailView):
 # 장소 리스트로 보기
 class GroupPlaceListView(GroupDetailView):
     template_name = 'trip/group_place_list.html'
+    place_page_size = 50
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        group = self.object
 
-        # 이 그룹에 속한 장소들
-        context["place_links"] = group.place_links.select_related("place")
+        # 이 그룹에 속한 장소들 (?cursor= 키셋 페이지네이션, 잘못된 커서는 첫 페이지)
+        place_links = self.get_place_links()
+        try:
+            page = keyset_paginate(place_links, self.request.GET.get("cursor"), self.place_page_size)
+        except ValueError:
+            page = keyset_paginate(place_links, None, self.place_page_size)
+
+        context["place_links"] = page.object_list
+        context["page"] = page
         return context
 
 
@@ -98,9 +124,21 @@ class GroupMapView(GroupDetailView):
             "trip:group_places_json",
             kwargs={"group_pk": group.pk},
         )
+        context["clusters_json_url"] = reverse(
+            "trip:group_place_clusters_json",
+            kwargs={"group_pk": group.pk},
+        )
+        context["summary_json_url"] = reverse(
+            "trip:group_place_summary_json",
+            kwargs={"group_pk": group.pk},
+        )
+        context["day_plan_url"] = reverse(
+            "trip:place_day_plan_api",
+            kwargs={"group_pk": group.pk},
+        )
 
         # 필요하다면 places도 템플릿에서 직접 쓸 수 있게
-        context["places"] = group.place_links.select_related("place")
+        context["places"] = self.get_place_links()
 
         return context
 
@@ -0,0 +1,144 @@
+from django.db.models import Exists, OuterRef
+from rest_framework import serializers, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .models import GroupMember, TravelGroup, TravelGroupPlace, Recommendation
+from .permissions import IsGroupMember
+from .serializers import RecommendationSerializer, TravelGroupPlaceSerializer, TravelGroupSerializer
+
+# list 응답도 상세(ModelSerializer)와 같은 문자열 형식을 쓰도록 필드 변환만 빌려 쓴다
+_datetime = serializers.DateTimeField().to_representation
+_decimal = serializers.DecimalField(max_digits=9, decimal_places=6).to_representation
+
+
+class LeanListMixin:
+    """
+        list는 values()로 필요한 컬럼만 읽어 dict로 바로 응답 (모델/시리얼라이저 생성 생략)
+        페이지 크기와 상관없이 COUNT + 페이지 조회 두 번이면 끝난다.
+        list_values: values()에 넘길 컬럼, list_item: 한 행을 상세 응답과 같은 모양으로
+    """
+    list_values = ()
+
+    def list_item(self, row):
+        return row
+
+    def list(self, request, *args, **kwargs):
+        rows = self.filter_queryset(self.get_queryset()).values(*self.list_values)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response([self.list_item(row) for row in rows])
+        return self.get_paginated_response([self.list_item(row) for row in page])
+
+
+def _user(user_id, username):
+    # UserMiniSerializer와 같은 모양 (nullable FK)
+    return {"id": user_id, "username": username} if user_id is not None else None
+
+
+class TravelGroupViewSet(LeanListMixin, viewsets.ReadOnlyModelViewSet):
+    # 내가 속한 그룹. member_count는 저장된 카운터를 그대로 읽는다
+    serializer_class = TravelGroupSerializer
+    permission_classes = [IsAuthenticated, IsGroupMember]
+    list_values = (
+        "id", "name", "description", "created_by_id", "created_by__username",
+        "member_count", "created_at", "updated_at",
+    )
+
+    def get_queryset(self):
+        is_member = GroupMember.objects.filter(group=OuterRef("pk"), user=self.request.user)
+        return (
+            TravelGroup.objects
+            .filter(Exists(is_member))
+            .select_related("created_by")
+            .only(
+                "id", "name", "description", "member_count", "created_at", "updated_at",
+                "created_by__id", "created_by__username",
+            )
+            .order_by("-created_at", "-id")
+        )
+
+    def list_item(self, row):
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "created_by": _user(row["created_by_id"], row["created_by__username"]),
+            "member_count": row["member_count"],
+            "created_at": _datetime(row["created_at"]),
+            "updated_at": _datetime(row["updated_at"]),
+        }
+
+
+class TravelGroupPlaceViewSet(LeanListMixin, viewsets.ReadOnlyModelViewSet):
+    # /api/v1/groups/<group_pk>/places/ (?place_type=, ?day= 필터)
+    serializer_class = TravelGroupPlaceSerializer
+    permission_classes = [IsAuthenticated, IsGroupMember]
+    filterset_fields = ["place_type", "day"]
+    list_values = (
+        "id", "travel_group_id", "nickname", "place_type", "description", "day", "recommendations_count",
+        "created_by_id", "created_by__username",
+        "place_id", "place__name", "place__address", "place__lat", "place__lng",
+        "place__phone", "place__url", "place__recommendations_count",
+    )
+
+    def get_queryset(self):
+        return (
+            TravelGroupPlace.objects
+            .filter(travel_group_id=self.kwargs["group_pk"])
+            .select_related("place", "created_by")
+            .only(
+                "id", "travel_group_id", "nickname", "place_type", "description", "day",
+                "recommendations_count", "place", "created_by__id", "created_by__username",
+            )
+            .order_by("id")
+        )
+
+    def list_item(self, row):
+        return {
+            "id": row["id"],
+            "travel_group": row["travel_group_id"],
+            "place": {
+                "id": row["place_id"],
+                "name": row["place__name"],
+                "address": row["place__address"],
+                "lat": _decimal(row["place__lat"]),
+                "lng": _decimal(row["place__lng"]),
+                "phone": row["place__phone"],
+                "url": row["place__url"],
+                "recommendations_count": row["place__recommendations_count"],
+            },
+            "created_by": _user(row["created_by_id"], row["created_by__username"]),
+            "nickname": row["nickname"],
+            "place_type": row["place_type"],
+            "description": row["description"],
+            "day": row["day"],
+            "recommendations_count": row["recommendations_count"],
+        }
+
+
+class RecommendationViewSet(LeanListMixin, viewsets.ReadOnlyModelViewSet):
+    # 내가 속한 그룹에 담긴 장소의 추천 목록 (?place=, ?user= 필터). 쓰기는 place_recommend_api / recommendation_sync_api
+    serializer_class = RecommendationSerializer
+    permission_classes = [IsAuthenticated, IsGroupMember]
+    filterset_fields = ["place", "user"]
+    list_values = ("id", "place_id", "user_id", "user__username", "created_at")
+
+    def get_queryset(self):
+        # 장소가 여러 내 그룹에 담겨 있으면 조인 행이 늘어나므로 distinct
+        return (
+            Recommendation.objects
+            .filter(place__travel_group_links__travel_group__member_links__user=self.request.user)
+            .distinct()
+            .select_related("user")
+            .only("id", "place_id", "created_at", "user__id", "user__username")
+            .order_by("place_id", "user_id")
+        )
+
+    def list_item(self, row):
+        return {
+            "id": row["id"],
+            "place": row["place_id"],
+            "user": _user(row["user_id"], row["user__username"]),
+            "created_at": _datetime(row["created_at"]),
+        }